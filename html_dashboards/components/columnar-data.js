@@ -0,0 +1,86 @@
+// Columnar Data Decoder Component
+// Expands the opt-in columnar rawData layout written by
+// SimpleThaiTruckAnalyzer.export_json_for_dashboard(raw_data_format='columnar')
+// back into the row-object array the dashboard code expects, and fetches the
+// separate raw rows file (rawDataUrl) that the dashboard JSON points to.
+
+function decodeColumn(column) {
+    // Plain array: one value per record
+    if (Array.isArray(column)) {
+        return column;
+    }
+
+    // Dictionary-encoded: codes index into dict
+    if (column.dict && column.codes) {
+        const dict = column.dict;
+        const codes = column.codes;
+        const values = new Array(codes.length);
+        for (let i = 0; i < codes.length; i++) {
+            values[i] = dict[codes[i]];
+        }
+        return values;
+    }
+
+    // Split string: dictionary-encoded prefix + per-record suffix
+    if (column.prefix && column.suffix) {
+        const prefixes = decodeColumn(column.prefix);
+        const suffixes = column.suffix;
+        const values = new Array(suffixes.length);
+        for (let i = 0; i < suffixes.length; i++) {
+            values[i] = prefixes[i] + suffixes[i];
+        }
+        return values;
+    }
+
+    throw new Error('Unknown columnar encoding');
+}
+
+function decodeColumnarRawData(rawData) {
+    // Row-object layout is passed through unchanged
+    if (!rawData || Array.isArray(rawData) || rawData.format !== 'columnar') {
+        return rawData;
+    }
+
+    const fields = Object.keys(rawData.columns);
+    const columns = fields.map(field => decodeColumn(rawData.columns[field]));
+    const rows = new Array(rawData.length);
+
+    for (let i = 0; i < rawData.length; i++) {
+        const row = {};
+        for (let f = 0; f < fields.length; f++) {
+            row[fields[f]] = columns[f][i];
+        }
+        rows[i] = row;
+    }
+
+    return rows;
+}
+
+function decodeDashboardData(data) {
+    if (data && data.rawData) {
+        data.rawData = decodeColumnarRawData(data.rawData);
+    }
+    return data;
+}
+
+// Raw rows of a dashboard JSON loaded from baseUrl: embedded rawData (older exports)
+// or the rawDataUrl file, resolved relative to baseUrl
+async function fetchDashboardRawData(data, baseUrl) {
+    if (data.rawData) {
+        return decodeColumnarRawData(data.rawData);
+    }
+    if (!data.rawDataUrl) {
+        return [];
+    }
+
+    const response = await fetch(new URL(data.rawDataUrl, baseUrl));
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return decodeColumnarRawData((await response.json()).rawData);
+}
+
+// Export for use in other modules
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { decodeColumn, decodeColumnarRawData, decodeDashboardData, fetchDashboardRawData };
+}
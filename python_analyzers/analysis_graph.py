@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Small memoized computation graph for analyzer results.
+Each analysis is a named node with declared inputs; results are cached per data version.
+With a profiler attached (see profiling), each node computation is recorded as a span.
+"""
+
+import time
+
+
+class AnalysisGraph:
+    """Evaluate named analysis nodes once per data version."""
+
+    def __init__(self, version_fn, profiler=None, rows_fn=None):
+        """version_fn returns a value that changes whenever the underlying data changes.
+
+        rows_fn gives the row count recorded on profiler spans.
+        """
+        self._version_fn = version_fn
+        self.profiler = profiler
+        self._rows_fn = rows_fn
+        self._nodes = {}
+        self._cache = {}
+        self._evaluating = set()
+        self.timings = {}
+        self.evaluations = {}
+        # Calls answered from the cache, i.e. recomputations avoided
+        self.hits = {}
+
+    def add_node(self, name, func, inputs=()):
+        """Register a node; func is called with the results of its inputs, in order."""
+        self._nodes[name] = (func, tuple(inputs))
+
+    def evaluate(self, name):
+        """Return the node result, computing it (and its inputs) only if stale."""
+        if name not in self._nodes:
+            raise KeyError(f"Unknown analysis node: {name}")
+
+        version = self._version_fn()
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == version:
+            self.hits[name] = self.hits.get(name, 0) + 1
+            return cached[1]
+
+        if name in self._evaluating:
+            raise ValueError(f"Cycle detected at analysis node: {name}")
+
+        func, inputs = self._nodes[name]
+        self._evaluating.add(name)
+        try:
+            args = [self.evaluate(dep) for dep in inputs]
+            start = time.perf_counter()
+            if self.profiler is None:
+                result = func(*args)
+            else:
+                with self.profiler.span(name, self._rows_fn() if self._rows_fn else None):
+                    result = func(*args)
+            # Timings are exclusive of input nodes
+            self.timings[name] = time.perf_counter() - start
+        finally:
+            self._evaluating.discard(name)
+
+        self.evaluations[name] = self.evaluations.get(name, 0) + 1
+        self._cache[name] = (version, result)
+        return result
+
+    def invalidate(self, name=None):
+        """Drop one cached result, or all of them."""
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    def reuse_report(self):
+        """Per node {'evaluations', 'hits'} counts, most reused first."""
+        names = sorted(set(self.evaluations) | set(self.hits), key=lambda n: self.hits.get(n, 0), reverse=True)
+        return {name: {'evaluations': self.evaluations.get(name, 0), 'hits': self.hits.get(name, 0)}
+                for name in names}
+
+    def timing_report(self):
+        """Node timings in seconds, slowest first."""
+        return dict(sorted(self.timings.items(), key=lambda x: x[1], reverse=True))
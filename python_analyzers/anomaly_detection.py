@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Streaming anomaly detection for revenue, purchase and weigh-station series.
+Each value is judged only against the values seen before it: a Welford running
+mean/variance over the whole history and a median/MAD over a recent window. A value is
+an anomaly when it falls outside both bands, so one past outlier cannot hide the next
+one by inflating the variance, and a level shift is not flagged forever. Events are
+therefore stable as history grows. update() folds in one new value in constant time;
+backfill() scores a full history vectorized and leaves the same running state behind.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Scales the MAD to a standard deviation for normally distributed values
+MAD_SCALE = 1.4826
+
+
+class StreamingAnomalyDetector:
+    """Online outlier detector for one numeric series."""
+
+    def __init__(self, window=30, threshold=2.0, high_threshold=3.0, min_periods=5):
+        self.window = window
+        self.threshold = threshold
+        self.high_threshold = high_threshold
+        self.min_periods = min_periods
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.recent = deque(maxlen=window)
+        # Stream position of the next value; missing values take a position too
+        self.position = 0
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def bounds(self):
+        """(lower, upper) running mean ± threshold standard deviations."""
+        spread = self.threshold * self.std
+        return self.mean - spread, self.mean + spread
+
+    def _event(self, position, value, mean, std, median, mad):
+        spread = self.threshold * std
+        robust_spread = self.threshold * MAD_SCALE * mad
+        return {
+            'index': int(position),
+            'value': float(value),
+            'expected_range': [float(mean - spread), float(mean + spread)],
+            'robust_range': [float(median - robust_spread), float(median + robust_spread)],
+            'severity': 'high' if abs(value - mean) > self.high_threshold * std else 'medium'
+        }
+
+    def update(self, value):
+        """Score one new value against the history so far, then fold it in.
+
+        Returns an anomaly event dict, or None. Missing values are skipped.
+        """
+        position = self.position
+        self.position += 1
+        if value is None or math.isnan(value):
+            return None
+
+        event = None
+        if self.count >= self.min_periods:
+            lower, upper = self.bounds()
+            if not lower <= value <= upper:
+                recent = np.fromiter(self.recent, dtype=float, count=len(self.recent))
+                median = np.median(recent)
+                mad = np.median(np.abs(recent - median))
+                if abs(value - median) > self.threshold * MAD_SCALE * mad:
+                    event = self._event(position, value, self.mean, self.std, median, mad)
+
+        # Welford's update
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.recent.append(value)
+        return event
+
+    def backfill(self, values):
+        """Score a whole history at once; equivalent to calling update() on each value.
+
+        Only a fresh detector can be backfilled. Returns the anomaly events in order.
+        """
+        if self.count or self.position:
+            raise ValueError("backfill needs a fresh detector; use update() for new values")
+
+        x = np.asarray(values, dtype=float)
+        valid = ~np.isnan(x)
+        positions = np.flatnonzero(valid)
+        v = x[valid]
+        self.position = len(x)
+        if len(v) == 0:
+            return []
+
+        # Running statistics of the values strictly before each one
+        series = pd.Series(v)
+        mean = series.expanding().mean().shift(1).to_numpy()
+        std = np.sqrt(series.expanding().var(ddof=0).shift(1).to_numpy())
+        spread = self.threshold * std
+        history = np.arange(len(v))
+        candidates = np.flatnonzero((history >= self.min_periods) & ((v < mean - spread) | (v > mean + spread)))
+
+        events = []
+        if len(candidates):
+            # Median/MAD of the window preceding each candidate; NaN pads short windows
+            padded = np.concatenate([np.full(self.window, np.nan), v])
+            windows = np.lib.stride_tricks.sliding_window_view(padded, self.window)[candidates]
+            median = np.nanmedian(windows, axis=1)
+            mad = np.nanmedian(np.abs(windows - median[:, None]), axis=1)
+            robust = np.abs(v[candidates] - median) > self.threshold * MAD_SCALE * mad
+            for i, j in enumerate(candidates):
+                if robust[i]:
+                    events.append(self._event(positions[j], v[j], mean[j], std[j], median[i], mad[i]))
+
+        self.count = len(v)
+        self.mean = float(v.mean())
+        self.m2 = float(((v - self.mean) ** 2).sum())
+        self.recent.extend(v[-self.window:].tolist())
+        return events
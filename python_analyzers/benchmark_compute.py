@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the headless compute path of both analyzers against computing and rendering
+the console report. The compute-only rows are what an embedding service pays: typed
+results, no printing. Rendering writes to os.devnull, so terminal speed is not measured.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from benchmark_suite import best_of
+from console_report import render, render_recycled_summary
+from recycled_items_analyzer import RecycledItemsAnalyzer
+from simple_thai_analyzer import SimpleThaiTruckAnalyzer
+
+SAMPLE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thai_truck_weigh_logs_real_2568.xlsx')
+
+
+def main():
+    """Run the compute benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description="Headless compute vs console report benchmark")
+    parser.add_argument('--rows-repeat', type=int, default=20, help="sample weigh log rows repeated")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per variant (best is kept)")
+    args = parser.parse_args()
+
+    df = pd.concat([pd.read_excel(SAMPLE_WORKBOOK)] * args.rows_repeat, ignore_index=True)
+    thai = SimpleThaiTruckAnalyzer(df=df, progress=None)
+    recycled = RecycledItemsAnalyzer(progress=None)
+    recycled.load_sample_data()
+
+    def thai_compute():
+        thai.invalidate_results()
+        return thai.analyze()
+
+    def recycled_compute():
+        recycled.invalidate_frames()
+        return recycled.generate_dashboard_data()
+
+    def rendered(compute, renderer):
+        def run():
+            results = compute()
+            with open(os.devnull, 'w', encoding='utf-8') as sink:
+                renderer(results, lambda line: print(line, file=sink))
+        return run
+
+    variants = [
+        ('Thai compute only', thai_compute),
+        ('Thai compute + report', rendered(thai_compute, render)),
+        ('Recycled compute only', recycled_compute),
+        ('Recycled compute + report', rendered(recycled_compute, render_recycled_summary))
+    ]
+
+    print(f"🧮 Analyzer Compute Benchmark ({len(thai.df_clean):,} weigh records, best of {args.repeat})")
+    print("=" * 72)
+    print(f"{'Path':<30} {'Time (s)':>10}")
+
+    results = {}
+    for name, func in variants:
+        results[name] = best_of(func, args.repeat)
+        print(f"{name:<30} {results[name]:>10.3f}")
+
+    print("=" * 72)
+    overhead = results['Thai compute + report'] - results['Thai compute only']
+    print(f"Thai console report overhead: {overhead:.3f}s "
+          f"({overhead / results['Thai compute + report'] * 100:.0f}% of the reporting run)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark customer/supplier analyses as the number of counterparties grows.
+Both analyses run on a single grouped aggregation, so time per counterparty
+should stay roughly flat from 100 to 100k customers.
+"""
+
+import numpy as np
+
+from benchmark_suite import best_of, ledgers
+from recycled_items_analyzer import RecycledItemsAnalyzer
+
+ROWS_PER_COUNTERPARTY = 3
+
+
+def main():
+    """Run the scaling benchmark and print a summary table."""
+    print("📏 Counterparty Scaling Benchmark")
+    print("=" * 72)
+    print(f"{'Counterparties':>14} {'Rows':>9} {'Customers (s)':>14} {'Suppliers (s)':>14} {'us/customer':>12}")
+
+    results = []
+    for n in [100, 1_000, 10_000, 100_000]:
+        analyzer = RecycledItemsAnalyzer()
+        analyzer.sales_data, analyzer.purchase_data = ledgers(analyzer.items.items, n * ROWS_PER_COUNTERPARTY,
+                                                              seed=42, counterparties=n)
+        # Build the cached frames up front so only the analyses are timed
+        analyzer._sales_df()
+        analyzer._purchase_df()
+
+        customer_time = best_of(analyzer.analyze_customer_behavior, 3)
+        supplier_time = best_of(analyzer.analyze_supplier_performance, 3)
+        per_customer = customer_time / n * 1e6
+        results.append((n, customer_time, supplier_time))
+        print(f"{n:>14,} {n * ROWS_PER_COUNTERPARTY:>9,} {customer_time:>14.4f} {supplier_time:>14.4f} {per_customer:>12.2f}")
+
+    # Scaling exponent from the two largest sizes: ~1.0 means linear
+    (n1, t1, _), (n2, t2, _) = results[-2], results[-1]
+    exponent = np.log(t2 / t1) / np.log(n2 / n1)
+    print("=" * 72)
+    print(f"Scaling exponent ({n1:,} -> {n2:,} customers): {exponent:.2f} (1.0 = linear)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark the recursive multi-step forecaster across many series.
+All series advance together with one batched predict per day, so a 90-day forecast
+for 500 series should cost about 90 predict calls, not 45,000.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+
+from benchmark_suite import best_of
+from forecasting import RecursiveForecaster, calendar_features
+
+FEATURE_COLUMNS = ['day_of_week', 'month', 'day', 'quarter', 'day_of_year',
+                   'week_of_year', 'revenue_lag1', 'revenue_lag2', 'revenue_lag3',
+                   'revenue_ma3', 'revenue_ma7', 'revenue_squared', 'revenue_cubed']
+HORIZON = 90
+LOOP_SAMPLE = 10
+
+warnings.filterwarnings('ignore')
+
+
+def make_training_frame(n_days=365, seed=42):
+    """One synthetic daily revenue series with the analyzer's feature columns."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=n_days, freq='D')
+    revenue = 8000 + 1500 * np.sin(np.arange(n_days) / 7) + rng.normal(0, 500, n_days)
+
+    df = pd.DataFrame(calendar_features(dates, FEATURE_COLUMNS[:6]), columns=FEATURE_COLUMNS[:6])
+    series = pd.Series(revenue)
+    for lag in [1, 2, 3]:
+        df[f'revenue_lag{lag}'] = series.shift(lag)
+    df['revenue_ma3'] = series.rolling(3).mean()
+    df['revenue_ma7'] = series.rolling(7).mean()
+    df['revenue_squared'] = series ** 2
+    df['revenue_cubed'] = series ** 3
+    df['totalRevenue'] = series
+    return df.dropna(), dates[-1]
+
+
+def main():
+    """Run the forecasting benchmark and print a summary table."""
+    df, last_date = make_training_frame()
+    X, y = df[FEATURE_COLUMNS].to_numpy(), df['totalRevenue'].to_numpy()
+    models = {
+        'Ridge Regression': Ridge(alpha=1.0).fit(X, y),
+        'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42).fit(X, y)
+    }
+    rng = np.random.default_rng(0)
+
+    print(f"📈 Recursive Forecast Benchmark ({HORIZON}-day horizon)")
+    print("=" * 72)
+    print(f"{'Model':<20} {'Series':>8} {'Sweep (s)':>12} {'Per-series loop (s)':>20} {'Speedup':>9}")
+
+    results = []
+    for name, model in models.items():
+        forecaster = RecursiveForecaster(model, FEATURE_COLUMNS)
+        for n_series in [1, 50, 500]:
+            histories = y[-30:] * rng.uniform(0.5, 1.5, size=(n_series, 1))
+            sweep = best_of(lambda: forecaster.forecast(histories, last_date, HORIZON), 3)
+            # The per-series loop is what a forecast-per-customer/item approach would cost
+            # (timed on LOOP_SAMPLE series and scaled up)
+            looped = best_of(lambda: [forecaster.forecast(h, last_date, HORIZON) for h in histories[:LOOP_SAMPLE]], 1)
+            looped *= n_series / min(n_series, LOOP_SAMPLE)
+            results.append((name, n_series, sweep, looped))
+            print(f"{name:<20} {n_series:>8,} {sweep:>12.4f} {looped:>20.4f} {looped / sweep:>8.1f}x")
+
+    print("=" * 72)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark multi-workbook ingestion: a year of monthly workbooks for several stations.
+Compares parsing the files one after another with parsing them on a process pool; the
+pool's wall time should approach the slowest single file given enough cores. The
+sidecar cache is bypassed so every run parses the workbooks.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from workbook_ingest import ingest_workbooks
+
+SAMPLE_WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thai_truck_weigh_logs_real_2568.xlsx')
+
+
+def make_workbooks(directory, stations, months, repeat=1):
+    """stations x months copies of the sample workbook as <station>/<month>.xlsx."""
+    source = SAMPLE_WORKBOOK
+    if repeat > 1:
+        source = os.path.join(directory, 'sample.xlsx')
+        pd.concat([pd.read_excel(SAMPLE_WORKBOOK)] * repeat, ignore_index=True).to_excel(source, index=False)
+    for station in range(1, stations + 1):
+        folder = os.path.join(directory, 'stations', f"station-{station:02d}")
+        os.makedirs(folder, exist_ok=True)
+        for month in range(1, months + 1):
+            shutil.copy(source, os.path.join(folder, f"2568-{month:02d}.xlsx"))
+    return os.path.join(directory, 'stations')
+
+
+def main():
+    """Run the ingestion benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description="Multi-workbook ingestion benchmark")
+    parser.add_argument('--stations', type=int, default=10)
+    parser.add_argument('--months', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=1, help="sample rows repeated per workbook")
+    parser.add_argument('--workers', type=int, default=None, help="pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    print(f"📥 Workbook Ingestion Benchmark ({args.stations} stations x {args.months} months, "
+          f"{os.cpu_count()} CPUs)")
+    print("=" * 72)
+    print(f"{'Mode':<22} {'Files':>6} {'Rows':>9} {'Wall (s)':>10} {'Slowest file (s)':>17} {'Sum (s)':>9}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_workbooks(tmp, args.stations, args.months, args.repeat)
+        for mode, workers in [('serial', 1), ('process pool', args.workers)]:
+            start = time.perf_counter()
+            frame, timings = ingest_workbooks(source, workers=workers, use_cache=False, progress=None)
+            wall = time.perf_counter() - start
+            seconds = [timing['seconds'] for timing in timings.values()]
+            results[mode] = {'wall': wall, 'slowest': max(seconds), 'sum': sum(seconds)}
+            print(f"{mode:<22} {len(timings):>6} {len(frame):>9,} {wall:>10.2f} {max(seconds):>17.2f} {sum(seconds):>9.2f}")
+
+    print("=" * 72)
+    print(f"Speedup: {results['serial']['wall'] / results['process pool']['wall']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    main()
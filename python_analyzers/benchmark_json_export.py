@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark dashboard JSON export time and peak memory with a large rawData section.
+Compares the previous export path (convert the whole tree, then json.dump it once per
+destination) with write_json, which encodes once while streaming rawData from the
+DataFrame to both destinations, in the indented and compact layouts.
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from json_export import write_json
+
+
+def make_dashboard_data(n_rows, seed=42):
+    """A Thai-dashboard-shaped document with n_rows weigh records as a DataFrame."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-07-01', periods=90, freq='D')
+    plates = np.array([f"82-{n:04d}" for n in rng.integers(1000, 9999, 60)])
+    garbage = rng.uniform(3, 9, n_rows).round(2)
+    price = rng.choice([1060.0, 1200.0, 1350.0, 1500.0, 1650.0], n_rows)
+
+    raw = pd.DataFrame({
+        "date": dates[rng.integers(0, len(dates), n_rows)].strftime('%Y-%m-%d %H:%M:%S'),
+        "logNumber": (np.arange(n_rows) % 40 + 1).astype(str),
+        "license": plates[rng.integers(0, len(plates), n_rows)],
+        "timeIn": "08.15.00",
+        "timeOut": "08.42.00",
+        "totalWeight": (garbage + 7).round(2),
+        "maxRedemption": 15.0,
+        "emptyWeight": 7.0,
+        "garbageWeight": garbage,
+        "redeemable": (garbage * 0.9).round(2),
+        "pricePerTon": price,
+        "totalRedemptionValue": (garbage * 0.9 * price).round(2),
+        "additionalData": "CLIENT-A - ขยะทั่วไป - 1,234.56 THB"
+    })
+    daily = pd.Series(rng.uniform(5000, 9000, len(dates)), index=dates)
+
+    return {
+        "metadata": {"totalRecords": n_rows, "analysisDate": "2025-10-01 06:00:00"},
+        "rawData": raw,
+        "dailyRevenue": daily.to_dict(),
+        "hourlyDistribution": {hour: np.int64(count) for hour, count in enumerate(rng.integers(0, 500, 24))},
+        "summary": {"mean": np.float64(garbage.mean()), "max": np.float64(garbage.max())}
+    }
+
+
+def legacy_export(data, paths):
+    """The previous path: materialize rawData records, convert the tree, dump per destination."""
+    def convert_datetime(obj):
+        if isinstance(obj, dict):
+            return {str(k): convert_datetime(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [convert_datetime(item) for item in obj]
+        elif isinstance(obj, pd.Timestamp):
+            return obj.isoformat()
+        elif isinstance(obj, (np.integer, np.floating)):
+            return float(obj)
+        return obj
+
+    data = dict(data, rawData=data['rawData'].to_dict('records'))
+    data = convert_datetime(data)
+    for path in paths:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+
+
+def measure(func, trace_memory):
+    """(wall seconds, peak traced MB); memory is traced in a separate run from timing."""
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak_mb = float('nan')
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return seconds, peak_mb
+
+
+def main():
+    """Run the export benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description="Dashboard JSON export benchmark")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="rawData records")
+    parser.add_argument('--skip-legacy', action='store_true', help="skip the previous export path")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc runs")
+    args = parser.parse_args()
+
+    data = make_dashboard_data(args.rows)
+    variants = [
+        ('write_json indent=2', lambda paths: write_json(data, paths)),
+        ('write_json compact', lambda paths: write_json(data, paths, compact=True))
+    ]
+    if not args.skip_legacy:
+        variants.insert(0, ('convert + json.dump x2', lambda paths: legacy_export(data, paths)))
+
+    print(f"📦 Dashboard JSON Export Benchmark ({args.rows:,} rawData rows, 2 destinations)")
+    print("=" * 72)
+    print(f"{'Exporter':<26} {'Time (s)':>10} {'Peak traced (MB)':>18} {'File (MB)':>12}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, 'dashboard_data.json'), os.path.join(tmp, 'copy.json')]
+        for name, export in variants:
+            seconds, peak_mb = measure(lambda: export(paths), not args.no_memory)
+            size_mb = os.path.getsize(paths[0]) / 1024 / 1024
+            results[name] = {'seconds': seconds, 'peak_mb': peak_mb, 'size_mb': size_mb}
+            print(f"{name:<26} {seconds:>10.2f} {peak_mb:>18.1f} {size_mb:>12.1f}")
+
+    print("=" * 72)
+    return results
+
+
+if __name__ == "__main__":
+    main()
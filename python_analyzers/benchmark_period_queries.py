@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark period queries on a date index against boolean masks as the ledger grows.
+Locating "one customer, last 30 days" is a binary search in a DateIndex, so its time
+should stay flat from 100k to 10M rows while a mask over every row grows linearly.
+"""
+
+import time
+import numpy as np
+
+from benchmark_suite import best_of, ledger
+from date_index import DateIndex
+from ledger_store import ledger_frame
+
+CUSTOMERS = 1_000
+
+
+def make_ledger(n_rows, seed=42):
+    """Synthetic sales ledger of n_rows records over one year, in arrival (not date) order."""
+    return ledger_frame(ledger(np.random.default_rng(seed), n_rows, 'customer', CUSTOMERS, 'totalRevenue'),
+                        ['customer'])
+
+
+def main():
+    """Run the period query benchmark and print a summary table."""
+    print("📅 Period Query Benchmark")
+    print("=" * 72)
+    print(f"{'Rows':>11} {'Build (s)':>10} {'Locate (us)':>12} {'Take (ms)':>10} {'Mask (ms)':>10} {'Rows hit':>9}")
+
+    start, end, customer = '2024-12-02', '2024-12-31', 'Customer 7'
+    results = []
+    for n in [100_000, 1_000_000, 10_000_000]:
+        sales = make_ledger(n)
+        build_start = time.perf_counter()
+        index = DateIndex(sales['date'], [sales['customer']])
+        build_time = time.perf_counter() - build_start
+
+        locate_time = best_of(lambda: index.locate(start, end, [customer]), 5)
+        take_time = best_of(lambda: index.take(sales, start, end, [customer]), 5)
+        mask_time = best_of(lambda: sales[(sales['date'] >= start) & (sales['date'] <= end)
+                                         & (sales['customer'] == customer)], 5)
+        hits = len(index.take(sales, start, end, [customer]))
+        results.append((n, locate_time, mask_time))
+        print(f"{n:>11,} {build_time:>10.2f} {locate_time * 1e6:>12.1f} {take_time * 1e3:>10.3f} "
+              f"{mask_time * 1e3:>10.2f} {hits:>9,}")
+        del sales, index
+
+    (n1, locate1, mask1), (n2, locate2, mask2) = results[0], results[-1]
+    print("=" * 72)
+    print(f"{n1:,} -> {n2:,} rows: locate {locate2 / locate1:.1f}x, mask {mask2 / mask1:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    main()
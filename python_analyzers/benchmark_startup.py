@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start import latency of the analyzer modules.
+Each module is imported in a fresh interpreter under `python -X importtime`, so the
+numbers reflect what a cron-driven export pays before any analysis runs. scikit-learn
+is expected to stay out of the startup path until a forecast needs it.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = ['recycled_items_analyzer', 'simple_thai_analyzer']
+HEAVY_PACKAGES = ['sklearn', 'scipy']
+
+
+def import_profile(module):
+    """(cumulative import ms by package, wall ms, imported package set) for one cold import."""
+    code = f"import time, sys; start = time.perf_counter(); import {module}; print((time.perf_counter() - start) * 1000)"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+
+    # Lines look like "import time:   self_us | cumulative_us | <indent>name"; a package's
+    # own line (e.g. "pandas", not "pandas.core") carries its total cost
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        if '.' not in name:
+            cumulative[name] = max(cumulative.get(name, 0), int(cumulative_us) / 1000)
+
+    return cumulative, float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Run the startup benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument('--repeat', type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help="exit non-zero if a module's median import time exceeds this")
+    args = parser.parse_args()
+
+    print("🚀 Startup Import Benchmark")
+    print("=" * 72)
+    print(f"{'Module':<26} {'Median (ms)':>12} {'Min (ms)':>10} {'Heavy packages loaded':>22}")
+
+    failed = False
+    results = {}
+    for module in MODULES:
+        walls, packages = [], {}
+        for _ in range(args.repeat):
+            cumulative, wall_ms = import_profile(module)
+            walls.append(wall_ms)
+            packages = cumulative
+        median = statistics.median(walls)
+        heavy = [name for name in HEAVY_PACKAGES if name in packages]
+        results[module] = {'median_ms': median, 'min_ms': min(walls), 'heavy': heavy, 'packages': packages}
+        print(f"{module:<26} {median:>12.1f} {min(walls):>10.1f} {', '.join(heavy) or 'none':>22}")
+        if args.max_ms is not None and median > args.max_ms:
+            failed = True
+
+    print("=" * 72)
+    for module, result in results.items():
+        packages = {name: ms for name, ms in result['packages'].items() if name != module}
+        slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:5]
+        print(f"{module} top imports: " + ", ".join(f"{name} {ms:.0f}ms" for name, ms in slowest))
+
+    if failed:
+        print(f"❌ Median import time above {args.max_ms:.0f} ms")
+        sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Benchmark every public method of both analyzers at several data scales.
+Synthetic sales/purchase ledgers and weigh logs are generated at each scale (1k, 100k
+and 10M rows), and each method is timed (best of N) and then traced for peak memory in
+a separate tracemalloc run. Memoized analyses are timed with their inputs already
+computed, so each row is that method's own cost.
+
+Results are written as JSON and compared with the stored baseline
+(benchmark_baseline.json): a stage slower or bigger than its baseline by more than
+--threshold is a regression and the run exits non-zero. Baselines are machine specific;
+refresh them with --update-baseline on the machine that runs the comparison. The 10m
+scale needs tens of GB of RAM, so it only runs when asked for with --scales. Excel
+stages are skipped above one sheet's rows, and stages that train the predictive model
+zoo above MODEL_ZOO_MAX_ROWS. The timer (best_of) and the synthetic ledgers (ledger,
+ledgers) are shared with the single-topic benchmark scripts.
+"""
+
+import argparse
+import gc
+import inspect
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from create_real_data import EXCEL_MAX_ROWS, generate_weigh_logs, write_weigh_logs
+from ledger_store import LedgerRecords, ledger_frame
+from recycled_items_analyzer import RecycledItemsAnalyzer
+from simple_thai_analyzer import SimpleThaiTruckAnalyzer
+from weigh_results import WeighReport
+from workbook_cache import sidecar_path
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Scale name: (rows per ledger or weigh log, timed runs per stage; the best is kept)
+SCALES = {'1k': (1_000, 5), '100k': (100_000, 3), '10m': (10_000_000, 1)}
+
+# The predictive model zoo fits forests, SVR and an MLP on every sales row; one fit
+# at 10k rows takes about a minute, so stages that train it are skipped above this
+MODEL_ZOO_MAX_ROWS = 10_000
+
+# Changes smaller than these are never regressions, whatever the ratio
+MIN_SECONDS_DELTA = 0.02
+MIN_MB_DELTA = 1.0
+
+# Public methods left out: accessors, invalidation, demo data and scalar helpers
+UNTIMED_METHODS = {
+    'recycled': {'get_item_price', 'get_item_cost', 'calculate_profitability_score',
+                 'calculate_seasonality_score', 'invalidate_frames', 'invalidate_model_cache',
+                 'load_sample_data'},
+    'thai': {'analysis', 'invalidate_results', 'reuse_report'}
+}
+
+# Memoized recycled analyses: public method -> graph node
+RECYCLED_NODES = {
+    'analyze_sales_data': 'sales_analysis',
+    'analyze_purchase_data': 'purchase_analysis',
+    'calculate_profit_margin': 'financial_analysis',
+    'generate_item_insights': 'item_insights',
+    'generate_predictive_analytics': 'predictive_analytics',
+    'calculate_advanced_metrics': 'advanced_metrics',
+    'generate_environmental_impact': 'environmental_impact',
+    'generate_market_analysis': 'market_analysis'
+}
+
+
+def stage(name, run, reset=None, max_rows=None):
+    """A timed call; reset runs untimed before every call, max_rows skips bigger scales."""
+    return {'name': name, 'run': run, 'reset': reset or (lambda: None), 'max_rows': max_rows}
+
+
+def public_methods(cls):
+    """Names of the public methods (and classmethods) a class defines."""
+    return {name for name, value in vars(cls).items()
+            if not name.startswith('_') and (inspect.isfunction(value) or isinstance(value, classmethod))}
+
+
+def best_of(run, repeat, reset=None):
+    """Fastest wall time in seconds over repeat calls; reset runs untimed before each."""
+    best = float('inf')
+    for _ in range(repeat):
+        if reset:
+            reset()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def ledger(rng, rows, counterparty, counterparties, value_col, items=()):
+    """Synthetic ledger frame of rows records over 2024 (arrival, not date, order).
+
+    Each record has item quantities, a date, one of counterparties names in the
+    counterparty column ("Customer 7" for 'customer') and a value in value_col.
+    """
+    names = np.array([f"{counterparty.title()} {n}" for n in range(counterparties)], dtype=object)
+    frame = pd.DataFrame(rng.integers(0, 200, size=(rows, len(items))).astype(float), columns=list(items))
+    frame['date'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    frame[counterparty] = names[rng.integers(0, counterparties, rows)]
+    frame[value_col] = rng.uniform(1000, 15000, rows).round(2)
+    return frame
+
+
+def ledgers(items, rows, seed, counterparties=None):
+    """Synthetic sales and purchase ledgers of rows records each over one year."""
+    rng = np.random.default_rng(seed)
+    counterparties = counterparties or min(10_000, max(10, rows // 100))
+    sales = ledger(rng, rows, 'customer', counterparties, 'totalRevenue', items)
+    purchases = ledger(rng, rows, 'supplier', counterparties, 'amount', items)
+    purchases['registration'] = np.array([f"{n:04d}" for n in range(1000, 10000)], dtype=object)[
+        rng.integers(0, 9000, rows)]
+    return (LedgerRecords(ledger_frame(sales, ['customer'])),
+            LedgerRecords(ledger_frame(purchases, ['supplier'])))
+
+
+def period_caches(analyzer, indexes=False):
+    """Drop an analyzer's cached period views, and its date indexes with indexes=True."""
+    analyzer.periods.views.clear()
+    if indexes:
+        analyzer.periods.indexes.clear()
+
+
+def recycled_stages(rows, seed, workdir):
+    """Stages for RecycledItemsAnalyzer on rows-record ledgers."""
+    analyzer = RecycledItemsAnalyzer(progress=None)
+    analyzer.sales_data, analyzer.purchase_data = ledgers(analyzer.items.items, rows, seed)
+    scratch = RecycledItemsAnalyzer(progress=None)
+    sales_path = os.path.join(workdir, 'sales.parquet')
+    purchases_path = os.path.join(workdir, 'purchases.parquet')
+
+    def warm():
+        for node in RECYCLED_NODES.values():
+            if rows <= MODEL_ZOO_MAX_ROWS or node != 'predictive_analytics':
+                analyzer.graph.evaluate(node)
+
+    def memoized(method, node):
+        def reset():
+            warm()
+            analyzer.graph.invalidate(node)
+        max_rows = MODEL_ZOO_MAX_ROWS if node == 'predictive_analytics' else None
+        return stage(method, getattr(analyzer, method), reset, max_rows)
+
+    def last_30_days():
+        end = analyzer._sales_df()['date'].max()
+        analyzer.period(end - pd.Timedelta(days=29), end)
+
+    # compact_ledger converts in place, so each run gets a fresh copy
+    uncompacted = {}
+
+    dashboard_data = {}
+
+    def compute_dashboard_data():
+        analyzer.graph.invalidate()
+        dashboard_data.update(analyzer.generate_dashboard_data())
+
+    stages = [
+        stage('save_sales', lambda: analyzer.save_sales(sales_path)),
+        stage('save_purchases', lambda: analyzer.save_purchases(purchases_path)),
+        stage('load_sales', lambda: scratch.load_sales(sales_path)),
+        stage('load_purchases', lambda: scratch.load_purchases(purchases_path)),
+        *[memoized(method, node) for method, node in RECYCLED_NODES.items()],
+        stage('period[build index]', last_30_days, lambda: period_caches(analyzer, indexes=True)),
+        stage('period[30 days]', last_30_days, lambda: period_caches(analyzer)),
+        stage('compact_ledger', lambda: analyzer.compact_ledger(uncompacted['frame'], 'sales'),
+              lambda: uncompacted.update(frame=analyzer._sales_df().copy()))
+    ]
+    for method in ['generate_advanced_analytics', 'calculate_item_profitability', 'generate_sales_forecast',
+                   'analyze_seasonal_patterns', 'analyze_customer_behavior', 'analyze_supplier_performance',
+                   'optimize_inventory_levels', 'calculate_performance_metrics', 'generate_profit_margin_data',
+                   'generate_growth_rate_data', 'generate_inventory_turnover_data', 'generate_cash_flow_data',
+                   'generate_daily_heatmap_data']:
+        stages.append(stage(method, getattr(analyzer, method), warm))
+    # The dashboard data includes the predictive analytics
+    stages += [
+        stage('generate_dashboard_data', compute_dashboard_data, max_rows=MODEL_ZOO_MAX_ROWS),
+        stage('export_json_for_dashboard[indent]',
+              lambda: analyzer.export_json_for_dashboard(dashboard_data=dashboard_data),
+              max_rows=MODEL_ZOO_MAX_ROWS),
+        stage('export_json_for_dashboard[compact]',
+              lambda: analyzer.export_json_for_dashboard(compact=True, dashboard_data=dashboard_data),
+              max_rows=MODEL_ZOO_MAX_ROWS)
+    ]
+    return stages
+
+
+def thai_stages(rows, seed, workdir):
+    """Stages for SimpleThaiTruckAnalyzer on a weigh log of about rows records."""
+    days = min(365, max(1, rows // 30))
+    settings = dict(trucks=min(2000, max(8, rows // 5000)), clients=5, rows_per_day=max(1, rows // days))
+    df = generate_weigh_logs(days=days, seed=seed, **settings)
+    # One more day of rows, as logged the night after
+    next_day = (pd.Timestamp('2025-07-01') + pd.Timedelta(days=days)).strftime('%Y-%m-%d')
+    new_rows = generate_weigh_logs(days=1, seed=seed + 1, start_date=next_day, **settings)
+
+    analyzer = SimpleThaiTruckAnalyzer(df=df, progress=None)
+    log_path = os.path.join(workdir, 'weigh_log.parquet')
+    state_path = os.path.join(workdir, 'state.pkl')
+    write_weigh_logs(df, log_path)
+    analyzer.save_incremental_state(state_path)
+    appended = {}
+
+    def warm():
+        analyzer.analyze()
+
+    def memoized(name):
+        def reset():
+            warm()
+            analyzer.graph.invalidate(name)
+        return stage(name, getattr(analyzer, name), reset)
+
+    def last_30_days():
+        end = analyzer.df_clean[analyzer.thai_columns['date']].max()
+        analyzer.period(end - pd.Timedelta(days=29), end)
+
+    # compact_rows converts in place, so each run gets a fresh copy
+    uncompacted = {}
+
+    def restore():
+        appended['analyzer'] = SimpleThaiTruckAnalyzer.from_incremental_state(state_path, progress=None)
+
+    # Saves alternate between two paths, so each writes every row chunk afresh
+    save_paths = [os.path.join(workdir, f'saved_state_{n}.pkl') for n in range(2)]
+
+    def next_save_path():
+        save_paths.reverse()
+        shutil.rmtree(SimpleThaiTruckAnalyzer.rows_directory(save_paths[0]), ignore_errors=True)
+
+    stages = [
+        stage('load_data', lambda: analyzer.load_data(log_path)),
+        stage('setup_data', analyzer.setup_data),
+        stage('clean_rows', lambda: analyzer.clean_rows(analyzer.df)),
+        stage('parse_additional_data', lambda: analyzer.parse_additional_data(analyzer.df_clean.copy(deep=False))),
+        stage('parse_times', lambda: analyzer.parse_times(analyzer.df_clean.copy(deep=False))),
+        stage('build_anomaly_detectors', analyzer.build_anomaly_detectors),
+        stage('compact_rows', lambda: analyzer.compact_rows(uncompacted['df']),
+              lambda: uncompacted.update(df=analyzer.df_clean.copy())),
+        *[memoized(name) for name in WeighReport.analyses()],
+        stage('analyze', analyzer.analyze, analyzer.graph.invalidate),
+        stage('period[build index]', last_30_days, lambda: period_caches(analyzer, indexes=True)),
+        stage('period[30 days]', last_30_days, lambda: period_caches(analyzer)),
+        stage('dashboard_aggregates', analyzer.dashboard_aggregates, warm),
+        stage('raw_data_frame', analyzer.raw_data_frame),
+        stage('encode_raw_data_columnar', lambda: analyzer.encode_raw_data_columnar(analyzer.raw_data_frame())),
+        # Materializes one dict per record
+        stage('prepare_raw_data_for_dashboard', analyzer.prepare_raw_data_for_dashboard, max_rows=1_000_000),
+        stage('export_json_for_dashboard[rows]', analyzer.export_json_for_dashboard, warm),
+        stage('export_json_for_dashboard[columnar]',
+              lambda: analyzer.export_json_for_dashboard(raw_data_format='columnar'), warm),
+        stage('save_incremental_state', lambda: analyzer.save_incremental_state(save_paths[0]), next_save_path),
+        stage('from_incremental_state', lambda: SimpleThaiTruckAnalyzer.from_incremental_state(state_path, None)),
+        stage('append_rows', lambda: appended['analyzer'].append_rows(new_rows), restore)
+    ]
+
+    # The workbook paths read and write .xlsx files
+    if len(df) + len(new_rows) > EXCEL_MAX_ROWS:
+        names = ['export_analysis', 'generate_report', 'from_workbooks', 'update_from_workbook']
+        return stages + [stage(name, None, max_rows=EXCEL_MAX_ROWS) for name in names]
+
+    workbooks = os.path.join(workdir, 'workbooks')
+    os.makedirs(workbooks)
+    prefix_workbook = os.path.join(workdir, 'weigh_log_prefix.xlsx')
+    workbook = os.path.join(workbooks, 'weigh_log.xlsx')
+    write_weigh_logs(df, prefix_workbook)
+    write_weigh_logs(pd.concat([df, new_rows], ignore_index=True), workbook)
+    # Nightly state saved before the new day was logged
+    nightly_state = os.path.join(workdir, 'nightly_state.pkl')
+    SimpleThaiTruckAnalyzer.update_from_workbook(prefix_workbook, nightly_state, progress=None)
+
+    def changed_workbook():
+        # The workbook was appended to since its sidecar was written
+        if os.path.exists(sidecar_path(workbook)):
+            os.remove(sidecar_path(workbook))
+
+    def nightly_update():
+        changed_workbook()
+        rows_directory = SimpleThaiTruckAnalyzer.rows_directory
+        shutil.rmtree(rows_directory(state_path), ignore_errors=True)
+        shutil.copytree(rows_directory(nightly_state), rows_directory(state_path))
+        shutil.copyfile(nightly_state, state_path)
+
+    return stages + [
+        stage('export_analysis', lambda: analyzer.export_analysis('analysis.xlsx'), warm),
+        stage('generate_report', analyzer.generate_report, analyzer.graph.invalidate),
+        stage('from_workbooks', lambda: SimpleThaiTruckAnalyzer.from_workbooks(workbooks, progress=None),
+              changed_workbook),
+        stage('update_from_workbook',
+              lambda: SimpleThaiTruckAnalyzer.update_from_workbook(workbook, state_path, progress=None),
+              nightly_update)
+    ]
+
+
+ANALYZERS = {
+    'recycled': (RecycledItemsAnalyzer, recycled_stages),
+    'thai': (SimpleThaiTruckAnalyzer, thai_stages)
+}
+
+
+def measure(run, reset, repeat, trace_memory):
+    """(best wall seconds, peak traced MB or None); memory is traced in a separate run."""
+    gc.collect()
+    best = best_of(run, repeat, reset)
+    peak_mb = None
+    if trace_memory:
+        reset()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
+    return best, peak_mb
+
+
+def run_scale(scale, analyzers, trace_memory=True, seed=42, report=print):
+    """Result records for every stage of the given analyzers at one scale."""
+    rows, repeat = SCALES[scale]
+    results = []
+    for name in analyzers:
+        cls, build = ANALYZERS[name]
+        missing = public_methods(cls) - UNTIMED_METHODS[name]
+        with tempfile.TemporaryDirectory() as tmp:
+            # Exports write to ../html_dashboards, as from python_analyzers
+            workdir = os.path.join(tmp, 'python_analyzers')
+            os.makedirs(workdir)
+            os.makedirs(os.path.join(tmp, 'html_dashboards'))
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                start = time.perf_counter()
+                stages = build(rows, seed, workdir)
+                report(f"{name + ' data':<44} {time.perf_counter() - start:>10.3f} {'(setup)':>12}")
+                for spec in stages:
+                    missing.discard(spec['name'].split('[')[0])
+                    result = {'scale': scale, 'rows': rows, 'analyzer': name, 'stage': spec['name']}
+                    if spec['max_rows'] is not None and rows > spec['max_rows']:
+                        result.update(status='skipped', reason=f"over {spec['max_rows']:,} rows")
+                        report(f"{name + '.' + spec['name']:<44} {'skipped':>10}")
+                    else:
+                        seconds, peak_mb = measure(spec['run'], spec['reset'], repeat, trace_memory)
+                        result.update(status='ok', seconds=seconds, peak_mb=peak_mb)
+                        peak = f"{peak_mb:>12.1f}" if peak_mb is not None else f"{'-':>12}"
+                        report(f"{name + '.' + spec['name']:<44} {seconds:>10.3f} {peak}")
+                    results.append(result)
+                del stages
+            finally:
+                os.chdir(cwd)
+                gc.collect()
+        if missing:
+            report(f"⚠️ {name} public methods without a stage: {', '.join(sorted(missing))}")
+    return results
+
+
+def result_key(result):
+    return result['scale'], result['analyzer'], result['stage']
+
+
+def compare(results, baseline, threshold):
+    """Regressions: stages slower or bigger than the baseline by more than threshold."""
+    before = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        base = before.get(result_key(result))
+        if base is None or result['status'] != 'ok' or base['status'] != 'ok':
+            continue
+        for metric, min_delta in (('seconds', MIN_SECONDS_DELTA), ('peak_mb', MIN_MB_DELTA)):
+            old, new = base.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append({**dict(zip(('scale', 'analyzer', 'stage'), result_key(result))),
+                                    'metric': metric, 'baseline': old, 'current': new,
+                                    'ratio': new / old if old else float('inf')})
+    return regressions
+
+
+def load_results(path):
+    """Result records of a results or baseline file; none if it does not exist."""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def write_results(path, results, regressions=None, threshold=None):
+    """Write result records with the machine they were measured on."""
+    document = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'processor': platform.processor(), 'cpus': os.cpu_count(),
+                    'pandas': pd.__version__, 'numpy': np.__version__},
+        'results': results
+    }
+    if threshold is not None:
+        document.update(threshold=threshold, regressions=regressions)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    """Run the benchmark suite, write the results and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description="Analyzer benchmark suite")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['1k', '100k'],
+                        help="data scales to run (default: 1k 100k; 10m is opt-in)")
+    parser.add_argument('--analyzers', nargs='+', choices=list(ANALYZERS), default=list(ANALYZERS))
+    parser.add_argument('--output', default='benchmark_results.json', help="results file (JSON)")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline results file to compare with")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="fraction slower or bigger than the baseline that counts as a regression")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store these results as the baseline for the stages that were run")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc runs")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    results = []
+    for scale in args.scales:
+        print(f"\n📐 Analyzer Benchmark Suite: {scale} ({SCALES[scale][0]:,} rows, best of {SCALES[scale][1]})")
+        print("=" * 72)
+        print(f"{'Stage':<44} {'Time (s)':>10} {'Peak (MB)':>12}")
+        results += run_scale(scale, args.analyzers, not args.no_memory, args.seed)
+
+    baseline = load_results(args.baseline)
+    regressions = compare(results, baseline, args.threshold)
+    write_results(output, results, regressions, args.threshold)
+
+    print("=" * 72)
+    print(f"Results written to {output}")
+    if args.update_baseline:
+        ran = {result_key(result) for result in results}
+        kept = [result for result in baseline if result_key(result) not in ran]
+        write_results(args.baseline, kept + results)
+        print(f"✅ Baseline updated: {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to store one")
+    elif regressions:
+        print(f"❌ {len(regressions)} regressions over {args.threshold:.0%} of the baseline:")
+        for regression in regressions:
+            print(f"   {regression['scale']} {regression['analyzer']}.{regression['stage']} {regression['metric']}: "
+                  f"{regression['baseline']:.3f} -> {regression['current']:.3f} ({regression['ratio']:.2f}x)")
+        sys.exit(1)
+    else:
+        print(f"✅ No regressions over {args.threshold:.0%} of the baseline")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Console report rendering for the analyzers.
+Renders the typed weigh log results (weigh_results) and the recycled items dashboard
+results as the text reports the analyzers have always printed. Nothing here computes
+statistics beyond picking values out of the results. Output goes line by line to a
+write callable (print by default).
+"""
+
+from functools import singledispatch
+
+from weigh_results import (
+    AnomalyAnalysis, BasicStatistics, CapacityUtilization, ClientPricing, ColumnStructure,
+    DailyAnalysis, FleetOptimization, OperationalEfficiency, PricingStrategy,
+    StrategicInsights, TimePattern, TruckAnalysis, WasteManagement, WeighReport
+)
+
+
+def _section(write, title):
+    write("\n" + "=" * 60)
+    write(title)
+    write("=" * 60)
+
+
+@singledispatch
+def render(result, write=print):
+    """Write the console section for one analysis result."""
+    raise TypeError(f"No console renderer for {type(result).__name__}")
+
+
+@render.register
+def _(result: WeighReport, write=print):
+    write("\n" + "=" * 60)
+    write("COMPREHENSIVE ANALYSIS REPORT")
+    write("=" * 60)
+    write("Thai Truck Weigh Station Log Data - 13 Columns (A-M)")
+    write("Thai Buddhist Calendar Year 2568")
+    write("=" * 60)
+    for section in result.sections():
+        render(section, write)
+
+
+@render.register
+def _(result: ColumnStructure, write=print):
+    _section(write, "COLUMN STRUCTURE ANALYSIS")
+    write("Column Structure (A-M):")
+    for column in result.columns:
+        write(f"  Column {column.letter}: {column.name}")
+        write(f"    Data Type: {column.dtype}")
+        write(f"    Non-null Count: {column.non_null}")
+        write(f"    Unique Values: {column.unique}")
+        if column.samples is not None:
+            write(f"    Sample Values: {column.samples}")
+        write("")
+
+
+@render.register
+def _(result: BasicStatistics, write=print):
+    write("=" * 60)
+    write("BASIC STATISTICS")
+    write("=" * 60)
+
+    write(f"Total Records: {result.total_records}")
+    write(f"Date Range: {result.date_min} to {result.date_max}")
+    write(f"Unique Trucks: {result.unique_trucks}")
+    write(f"License Plates: {', '.join(result.license_plates)}...")
+
+    write(f"\nWeight Statistics:")
+    write(f"  Average Total Weight: {result.avg_total_weight:.2f} kg")
+    write(f"  Average Garbage Weight: {result.avg_garbage_weight:.2f} kg")
+    write(f"  Average Redeemable Weight: {result.avg_redeemable_weight:.2f} kg")
+
+    write(f"\nRedemption Statistics:")
+    source = "Column L" if result.redemption_from_column_l else "Calculated"
+    write(f"  Total Redemption Value ({source}): {result.total_redemption_value:,.2f} THB")
+    write(f"  Average Redemption per Record: {result.avg_redemption_value:,.2f} THB")
+    write(f"  Average Price per Ton: {result.avg_price_per_ton:,.2f} THB")
+
+    if result.unique_clients is not None:
+        write(f"\nClient Analysis:")
+        write(f"  Unique Clients: {result.unique_clients}")
+        write(f"  Waste Types: {result.waste_types}")
+
+
+@render.register
+def _(result: DailyAnalysis, write=print):
+    _section(write, "DAILY ANALYSIS")
+    write("Daily Summary (first 10 days):")
+    write(str(result.daily_stats.head(10)))
+
+
+@render.register
+def _(result: TruckAnalysis, write=print):
+    _section(write, "TRUCK ANALYSIS")
+    write("Truck Performance Summary:")
+    write(str(result.truck_stats.head(15)))
+
+
+@render.register
+def _(result: TimePattern, write=print):
+    _section(write, "TIME PATTERN ANALYSIS")
+    write("Operations by Hour of Day:")
+    for hour, count in result.hour_distribution.items():
+        write(f"  {hour:02d}:00 - {hour:02d}:59: {count} operations")
+
+
+@render.register
+def _(result: FleetOptimization, write=print):
+    _section(write, "FLEET OPTIMIZATION ANALYSIS")
+    top_revenue, top_operations, top_weight = result.top_revenue, result.top_operations, result.top_weight
+
+    write("🏆 TOP PERFORMERS:")
+    write(f"  Highest Revenue: {top_revenue.name} - {top_revenue['Total_Revenue']:,.0f} THB")
+    write(f"  Most Operations: {top_operations.name} - {top_operations['Records']} operations")
+    write(f"  Highest Weight: {top_weight.name} - {top_weight['Total_Weight_Sum']:,.0f} kg")
+
+    write(f"\n📊 PERFORMANCE TIERS:")
+    write(f"  🏆 Elite Trucks (>80th percentile): {result.tiers['elite']} trucks")
+    write(f"  ⭐ High Performers (60-80th percentile): {result.tiers['high']} trucks")
+    write(f"  📈 Good Performers (40-60th percentile): {result.tiers['good']} trucks")
+    write(f"  ⚠️ Needs Attention (<40th percentile): {result.tiers['needs_attention']} trucks")
+
+    write(f"\n🛣️ ROUTE OPTIMIZATION INSIGHTS:")
+    write(f"  Top route to replicate: {top_operations.name} ({top_operations['Records']} operations)")
+    write(f"  Most efficient weight handling: {top_weight.name} ({top_weight['Avg_Weight']:,.0f} kg avg)")
+    write(f"  Best revenue per operation: {top_revenue.name} ({top_revenue['Total_Revenue']/top_revenue['Records']:,.0f} THB/op)")
+
+
+@render.register
+def _(result: CapacityUtilization, write=print):
+    _section(write, "WEIGHT CAPACITY UTILIZATION ANALYSIS")
+    if result.average_weight is None:
+        write("Total weight column not found")
+        return
+
+    write(f"⚖️ CAPACITY METRICS:")
+    write(f"  Average Total Weight: {result.average_weight:.1f} tons")
+    write(f"  Max Capacity Hits (15 tons): {result.max_capacity_hits} operations")
+    write(f"  Capacity Utilization: {result.utilization_percent:.1f}%")
+    write(f"  Underutilized Operations (<12 tons): {result.underutilized}")
+
+    write(f"\n🚛 CAPACITY BY TRUCK:")
+    write(str(result.capacity_by_truck.sort_values('Capacity_Utilization_%', ascending=False).head(10)))
+
+    write(f"\n💡 CAPACITY OPTIMIZATION RECOMMENDATIONS:")
+    write(f"  • Standardize truck sizes for optimal {result.max_capacity}-ton capacity utilization")
+    write(f"  • Optimize routes to maximize weight per trip (current avg: {result.average_weight:.1f} tons)")
+    write(f"  • Focus on {result.underutilized} underutilized operations for improvement")
+    write(f"  • Balance load distribution across {len(result.capacity_by_truck)} trucks")
+
+
+@render.register
+def _(result: PricingStrategy, write=print):
+    _section(write, "PRICING STRATEGY ANALYSIS")
+    if result.prices is None:
+        write("Price per ton column not found")
+        return
+
+    avg_price, price_std, price_quartiles = result.prices['mean'], result.prices['std'], result.prices['quantiles']
+    write(f"💰 PRICING INSIGHTS:")
+    write(f"  Average Price per Ton: {avg_price:,.0f} THB")
+    write(f"  Price Range: {result.prices['range']:,.0f} THB")
+    write(f"  Price Standard Deviation: {price_std:,.0f} THB")
+    write(f"  Price Quartiles: Q1={price_quartiles[0.25]:,.0f}, Q2={price_quartiles[0.5]:,.0f}, Q3={price_quartiles[0.75]:,.0f} THB")
+
+    if result.revenue_by_price is not None:
+        write(f"\n📊 REVENUE BY PRICE TIER:")
+        write(str(result.revenue_by_price.sort_index()))
+
+    write(f"\n💡 PRICING OPTIMIZATION RECOMMENDATIONS:")
+    if price_std > avg_price * 0.1:  # If standard deviation > 10% of average
+        write(f"  • Consider standardizing pricing (current variation: {price_std/avg_price*100:.1f}%)")
+    else:
+        write(f"  • Pricing is relatively consistent (variation: {price_std/avg_price*100:.1f}%)")
+    write(f"  • Focus on high-value operations above {price_quartiles[0.75]:,.0f} THB/ton")
+    write(f"  • Analyze low-price operations below {price_quartiles[0.25]:,.0f} THB/ton for improvement")
+
+
+@render.register
+def _(result: ClientPricing, write=print):
+    _section(write, "CLIENT PRICING STRATEGY ANALYSIS")
+    if result.client_pricing.empty:
+        write("No client data found in additional data column")
+        return
+
+    client_pricing = result.client_pricing
+    write("💰 CLIENT PRICING STRATEGY:")
+    write(f"  Price variation: {result.min_price:.0f} THB/ton to {result.max_price:.0f} THB/ton")
+    write(f"  Price spread: {result.spread_percent:.1f}%")
+    write(f"  Top Payer: {result.top_payer} gets {client_pricing.loc[result.top_payer, 'Avg_Price_Per_Ton']:.0f} THB/ton")
+    write(f"  Lowest Payer: {result.lowest_payer} gets {client_pricing.loc[result.lowest_payer, 'Avg_Price_Per_Ton']:.0f} THB/ton")
+    write(f"  Action: Negotiate higher rates with low-paying clients or offer premium services")
+
+
+@render.register
+def _(result: OperationalEfficiency, write=print):
+    _section(write, "OPERATIONAL EFFICIENCY ANALYSIS")
+    if result.processing_range is not None:
+        write(f"⏰ PROCESSING TIME OPTIMIZATION:")
+        write(f"  Average processing time: {result.avg_processing_time:.1f} minutes per truck")
+        write(f"  Range: {result.processing_range[0]:.0f} to {result.processing_range[1]:.0f} minutes")
+
+    if result.peak_hour is not None:
+        write(f"  Peak Hours: {result.peak_hour} ({result.peak_count} ops)")
+        write(f"  Low Activity: {result.low_hour} ({result.low_count} ops) - Maintenance Window Opportunity")
+        write(f"  24/7 OPERATIONS PATTERN:")
+        write(f"  Operations span: {result.active_hours} hours per day")
+        write(f"  Night Shift Efficiency: 00:00-06:00 has lower volume but consistent operations")
+        write(f"  Action: Optimize night shift staffing and pricing")
+
+
+@render.register
+def _(result: WasteManagement, write=print):
+    _section(write, "WASTE MANAGEMENT & QUALITY ANALYSIS")
+    avg_garbage_weight, avg_redeemable_weight = result.avg_garbage_weight, result.avg_redeemable_weight
+    write(f"🗑️ REDEMPTION RATE OPTIMIZATION:")
+    write(f"  Average garbage weight: {avg_garbage_weight:.1f} tons")
+    write(f"  Average redeemable: {avg_redeemable_weight:.1f} tons ({result.redemption_rate:.0f}% of garbage weight)")
+    write(f"  {result.loss_rate:.0f}% Loss: {avg_garbage_weight - avg_redeemable_weight:.1f} tons per truck is non-redeemable waste")
+    write(f"  Action: Improve sorting processes to increase redeemable percentage")
+
+    write(f"  WEIGHT VS. VALUE CORRELATION:")
+    write(f"  Correlation coefficient: {result.weight_value_correlation:.3f}")
+    if abs(result.weight_value_correlation) < 0.3:
+        write(f"  Higher weight doesn't always mean higher value")
+        write(f"  Quality over Quantity: Focus on waste type quality, not just weight")
+    else:
+        write(f"  Strong correlation between weight and value")
+
+    if result.waste_types:
+        write(f"  WASTE TYPE ANALYSIS:")
+        for waste_type, data in result.waste_types.items():
+            write(f"    {waste_type}: {data['count']} operations, {data['total_value'] / data['count']:.0f} THB avg value")
+
+
+@render.register
+def _(result: StrategicInsights, write=print):
+    _section(write, "STRATEGIC BUSINESS INTELLIGENCE")
+    if result.unique_clients is not None:
+        write(f"📊 CLIENT PORTFOLIO ANALYSIS:")
+        write(f"  {result.unique_clients} active clients with different waste preferences")
+        write(f"  {result.unique_waste_types} different waste types processed")
+        write(f"  Client Segmentation: Some clients consistently provide higher-value waste")
+        write(f"  Action: Develop targeted services for high-value waste streams")
+
+    write(f"  SEASONAL & DAILY PATTERNS:")
+    write(f"  Consistent daily operations ({result.total_records} records across {result.unique_dates} days)")
+    write(f"  Average daily operations: {result.avg_daily_operations:.1f}")
+    write(f"  Predictability: Enables better resource planning and staffing")
+    write(f"  Action: Implement predictive scheduling based on historical patterns")
+
+    write(f"  COST-BENEFIT ANALYSIS:")
+    write(f"  Total redemption value: {result.total_revenue:,.0f} THB")
+    write(f"  Per Truck Revenue: Average {result.avg_revenue_per_truck:,.0f} THB per truck")
+    write(f"  ROI Calculation: Compare truck costs vs. revenue generation")
+
+    if result.highest_revenue_truck is not None:
+        write(f"  REVENUE PER TRUCK ANALYSIS:")
+        write(f"  Highest revenue truck: {result.highest_revenue_truck} ({result.highest_revenue:,.0f} THB)")
+        write(f"  ROI Opportunity: Invest in more trucks like {result.highest_revenue_truck} or replicate their operational model")
+
+
+@render.register
+def _(result: AnomalyAnalysis, write=print):
+    _section(write, "ANOMALY DETECTION")
+    for col, summary in result.series.items():
+        lower_bound, upper_bound = result.bounds[col]
+        high = sum(anomaly['severity'] == 'high' for anomaly in summary['anomalies'])
+        write(f"🚨 {col}: {summary['anomalyCount']} anomalies ({high} high severity)")
+        write(f"  Current Expected Range: {lower_bound:,.1f} - {upper_bound:,.1f}")
+        for anomaly in summary['anomalies'][-5:]:
+            write(f"  • {anomaly['date']} {anomaly['licensePlate']}: {anomaly['value']:,.1f} ({anomaly['severity']})")
+
+
+def render_recycled_summary(results, write=print):
+    """Summary lines for RecycledItemsAnalyzer.generate_dashboard_data results."""
+    sales = results['sales_analysis']
+    write("📊 Analyzing sales data...")
+    write(f"   - Total Revenue: ฿{sales['total_revenue']:,.2f}")
+    write(f"   - Total Transactions: {sales['total_transactions']}")
+    write(f"   - Unique Customers: {sales['unique_customers']}")
+
+    purchases = results['purchase_analysis']
+    write("📥 Analyzing purchase data...")
+    write(f"   - Total Cost: ฿{purchases['total_cost']:,.2f}")
+    write(f"   - Total Purchases: {purchases['total_purchases']}")
+    write(f"   - Unique Suppliers: {purchases['unique_suppliers']}")
+
+    financial = results['financial_analysis']
+    write("💰 Calculating financial metrics...")
+    write(f"   - Gross Profit: ฿{financial['gross_profit']:,.2f}")
+    write(f"   - Profit Margin: {financial['profit_margin']:.1f}%")
+    write(f"   - ROI: {financial['roi']:.1f}%")
+
+    write("📈 Generating item insights...")
+    write(f"   - Items Analyzed: {len(results['item_insights'])}")
+
+    predictive = results['predictive_analytics']
+    write("🔮 Generating predictive analytics...")
+    write(f"   - Sales Trend: {predictive.get('sales_forecast', {}).get('trend', 'Unknown')}")
+    write(f"   - Best Model: {predictive.get('sales_forecast', {}).get('best_model', 'Unknown')}")
+    write(f"   - Confidence: {predictive.get('sales_forecast', {}).get('confidence', 0):.2f}")
+    write(f"   - Anomalies Detected: {predictive.get('anomaly_detection', {}).get('anomaly_count', 0)}")
+    write(f"   - Risk Level: {predictive.get('risk_assessment', {}).get('risk_level', 'Unknown')}")
+
+    write("📊 Calculating advanced metrics...")
+    write(f"   - Inventory Turnover: {results['advanced_metrics'].get('inventory_turnover_rate', 0):.2f}")
+
+    write("🌱 Calculating environmental impact...")
+    write(f"   - Carbon Saved: {results['environmental_impact'].get('carbon_footprint_reduction', 0):.0f} kg CO2")
+
+    write("🏭 Generating market analysis...")
+    write(f"   - Market Share: {results['market_analysis'].get('market_share_percentage', 0):.2f}%")
@@ -1,204 +1,385 @@
 #!/usr/bin/env python3
 """
-Create real Thai truck weigh station data based on the image structure
+Create real Thai truck weigh station data based on the image structure.
+Logs are generated column by column with numpy from a seedable generator, with knobs for
+days, trucks, stations, clients and rows per day, so multi-million-row logs for load
+tests take seconds. They are written to Excel (streamed, with green daily summary rows),
+CSV, or Parquet/Arrow (see ledger_store).
 """
 
-import pandas as pd
+import argparse
+import os
+import time
+
 import numpy as np
-from datetime import datetime, timedelta
-import openpyxl
-from openpyxl.styles import PatternFill
+import pandas as pd
 
-def create_real_thai_data():
-    """Create real Thai truck weigh station data based on the image."""
-    
-    # Data structure from the image
-    data = []
-    
-    # Sample data from the image (first few entries)
-    sample_data = [
-        # Day 1 Jul 68
-        {"date": "1 Jul 68", "log": "1", "license": "82-4347", "time_in": "00.01.24", "time_out": "00.11.31", 
-         "total_weight": 15.3, "max_redemption": 15, "empty_weight": 9.6, "garbage_weight": 5.7, 
-         "redeemable": 5.4, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - พลาสติก - 5,724.00 THB", "log_count": 1},
-        
-        {"date": "1 Jul 68", "log": "3", "license": "82-4346", "time_in": "00.03.04", "time_out": "00.14.00", 
-         "total_weight": 17.2, "max_redemption": 15, "empty_weight": 9.6, "garbage_weight": 7.6, 
-         "redeemable": 5.4, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - กระดาษ - 5,724.00 THB", "log_count": 1},
-        
-        {"date": "1 Jul 68", "log": "9", "license": "82-4346", "time_in": "01.42.25", "time_out": "01.49.00", 
-         "total_weight": 15.56, "max_redemption": 15, "empty_weight": 9.6, "garbage_weight": 5.96, 
-         "redeemable": 5.4, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - โลหะ - 5,724.00 THB", "log_count": 1},
-        
-        {"date": "1 Jul 68", "log": "13", "license": "82-4347", "time_in": "02.12.49", "time_out": "02.21.39", 
-         "total_weight": 15.59, "max_redemption": 15, "empty_weight": 9.61, "garbage_weight": 5.98, 
-         "redeemable": 5.39, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - กระดาษ - 5,713.40 THB", "log_count": 1},
-        
-        {"date": "1 Jul 68", "log": "18", "license": "82-4347", "time_in": "03.30.19", "time_out": "03.36.02", 
-         "total_weight": 15.39, "max_redemption": 15, "empty_weight": 9.62, "garbage_weight": 5.77, 
-         "redeemable": 5.38, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - พลาสติก - 5,702.80 THB", "log_count": 1},
-        
-        {"date": "1 Jul 68", "log": "27", "license": "82-4347", "time_in": "05.17.57", "time_out": "05.24.12", 
-         "total_weight": 14.82, "max_redemption": 14.82, "empty_weight": 9.58, "garbage_weight": 5.24, 
-         "redeemable": 5.24, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - แก้ว - 5,554.40 THB", "log_count": 1},
-        
-        {"date": "1 Jul 68", "log": "55", "license": "82-4509", "time_in": "10.48.29", "time_out": "10.53.17", 
-         "total_weight": 11.34, "max_redemption": 11.34, "empty_weight": 6.72, "garbage_weight": 4.62, 
-         "redeemable": 4.62, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - ผ้า - 4,897.20 THB", "log_count": 1},
-        
-        # Day 2 Jul 68
-        {"date": "2 Jul 68", "log": "1", "license": "82-4906", "time_in": "00.49.00", "time_out": "00.56.31", 
-         "total_weight": 15.04, "max_redemption": 15, "empty_weight": 9.59, "garbage_weight": 5.8, 
-         "redeemable": 5.37, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - พลาสติก - 5,692.20 THB", "log_count": 1},
-        
-        {"date": "2 Jul 68", "log": "3", "license": "82-4347", "time_in": "01.15.30", "time_out": "01.22.15", 
-         "total_weight": 16.8, "max_redemption": 15, "empty_weight": 9.6, "garbage_weight": 7.2, 
-         "redeemable": 5.4, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - กระดาษ - 5,724.00 THB", "log_count": 1},
-        
-        {"date": "2 Jul 68", "log": "9", "license": "82-4509", "time_in": "02.30.45", "time_out": "02.37.20", 
-         "total_weight": 12.5, "max_redemption": 12.5, "empty_weight": 7.0, "garbage_weight": 5.5, 
-         "redeemable": 5.5, "price_per_ton": 1060.00, "additional_data": "Client A - โคกขามเก็บขน - โลหะ - 5,830.00 THB", "log_count": 1},
-    ]
-    
-    # Add sample data
-    data.extend(sample_data)
-    
-    # Generate more realistic data for the full month
-    license_plates = ["82-4347", "82-4346", "82-4509", "82-4906", "82-5123", "82-5678", "82-6789", "82-7890"]
-    clients = ["Client A - โคกขามเก็บขน"]
-    waste_types = ["พลาสติก", "กระดาษ", "โลหะ", "แก้ว", "ผ้า", "ผสม"]
-    
-    # Generate data for each day (1-31 Jul 68)
-    for day in range(1, 32):
-        date_str = f"{day} Jul 68"
-        
-        # Generate 5-15 entries per day
-        num_entries = np.random.randint(5, 16)
-        
-        for entry in range(num_entries):
-            # Random license plate
-            license_plate = np.random.choice(license_plates)
-            
-            # Random times (24-hour format)
-            hour_in = np.random.randint(0, 24)
-            minute_in = np.random.randint(0, 60)
-            second_in = np.random.randint(0, 60)
-            
-            # Time out is 5-15 minutes later
-            duration = np.random.randint(5, 16)
-            time_in = f"{hour_in:02d}.{minute_in:02d}.{second_in:02d}"
-            
-            # Calculate time out
-            total_seconds = hour_in * 3600 + minute_in * 60 + second_in + duration * 60
-            hour_out = total_seconds // 3600
-            minute_out = (total_seconds % 3600) // 60
-            second_out = total_seconds % 60
-            time_out = f"{hour_out:02d}.{minute_out:02d}.{second_out:02d}"
-            
-            # Weights
-            empty_weight = np.random.uniform(6.5, 10.5)
-            garbage_weight = np.random.uniform(4.0, 8.0)
-            total_weight = empty_weight + garbage_weight
-            max_redemption = min(15.0, total_weight)
-            redeemable = min(garbage_weight, max_redemption)
-            
-            # Price per ton (THB)
-            price_per_ton = np.random.choice([1060, 1200, 1350, 1500, 1650])
-            
-            # Calculate redemption value
-            redemption_value = redeemable * price_per_ton / 1000
-            
-            # Additional data
-            client = np.random.choice(clients)
-            waste_type = np.random.choice(waste_types)
-            additional_data = f"{client} - {waste_type} - {redemption_value:,.2f} THB"
-            
-            # Log number (sequential within day)
-            log_number = entry + 1
-            
-            data.append({
-                "date": date_str,
-                "log": str(log_number),
-                "license": license_plate,
-                "time_in": time_in,
-                "time_out": time_out,
-                "total_weight": round(total_weight, 2),
-                "max_redemption": round(max_redemption, 2),
-                "empty_weight": round(empty_weight, 2),
-                "garbage_weight": round(garbage_weight, 2),
-                "redeemable": round(redeemable, 2),
-                "price_per_ton": price_per_ton,
-                "additional_data": additional_data,
-                "log_count": 1
-            })
-        
-        # Add summary row for each day
-        day_data = [d for d in data if d["date"] == date_str]
-        total_weight = sum(d["total_weight"] for d in day_data)
-        total_redemption = sum(float(d["additional_data"].split(" - ")[-1].replace(" THB", "").replace(",", "")) for d in day_data)
-        total_logs = len(day_data)
-        
-        data.append({
-            "date": date_str,
-            "log": "รวม",
-            "license": "",
-            "time_in": "",
-            "time_out": "",
-            "total_weight": round(total_weight, 2),
-            "max_redemption": "",
-            "empty_weight": "",
-            "garbage_weight": "",
-            "redeemable": "",
-            "price_per_ton": "",
-            "additional_data": f"{total_redemption:,.2f} THB",
-            "log_count": total_logs
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Rename columns to match the image structure
-    df.columns = [
-        "วนดอปไปช",  # Date
-        "เลขที่บันทึก",  # Log Number
-        "เลขทะเบียนรถ",  # License Plate
-        "เวลาเข้า",  # Time In
-        "เวลาออก",  # Time Out
-        "น้ำหนักรวมรถ",  # Total Weight
-        "น้ำหนักสูงสุดที่ไถ่ได้",  # Max Redemption
-        "น้ำหนักรถเปล่า",  # Empty Weight
-        "น้ำหนักขยะเต็ม",  # Garbage Weight
-        "น้ำหนักขยะที่ไถ่ได้",  # Redeemable
-        "ราคาไถ่ต่อตัน",  # Price per Ton
-        "ข้อมูลเพิ่มเติม",  # Additional Data
-        "จำนวนรายการ"  # Log Count
+from ledger_store import storage_format, write_table
+
+# Raw log headers, columns A-M
+COLUMNS = [
+    "วนดอปไปช",  # Date
+    "เลขที่บันทึก",  # Log Number
+    "เลขทะเบียนรถ",  # License Plate
+    "เวลาเข้า",  # Time In
+    "เวลาออก",  # Time Out
+    "น้ำหนักรวมรถ",  # Total Weight
+    "น้ำหนักสูงสุดที่ไถ่ได้",  # Max Redemption
+    "น้ำหนักรถเปล่า",  # Empty Weight
+    "น้ำหนักขยะเต็ม",  # Garbage Weight
+    "น้ำหนักขยะที่ไถ่ได้",  # Redeemable
+    "ราคาไถ่ต่อตัน",  # Price per Ton
+    "ข้อมูลเพิ่มเติม",  # Additional Data
+    "จำนวนรายการ"  # Log Count
+]
+SUMMARY_LABEL = "รวม"
+
+# Sample data from the image (first few entries), in A-M order
+IMAGE_ROWS = [
+    # Day 1 Jul 68
+    ["1 Jul 68", "1", "82-4347", "00.01.24", "00.11.31", 15.3, 15, 9.6, 5.7, 5.4, 1060.00, "Client A - โคกขามเก็บขน - พลาสติก - 5,724.00 THB", 1],
+    ["1 Jul 68", "3", "82-4346", "00.03.04", "00.14.00", 17.2, 15, 9.6, 7.6, 5.4, 1060.00, "Client A - โคกขามเก็บขน - กระดาษ - 5,724.00 THB", 1],
+    ["1 Jul 68", "9", "82-4346", "01.42.25", "01.49.00", 15.56, 15, 9.6, 5.96, 5.4, 1060.00, "Client A - โคกขามเก็บขน - โลหะ - 5,724.00 THB", 1],
+    ["1 Jul 68", "13", "82-4347", "02.12.49", "02.21.39", 15.59, 15, 9.61, 5.98, 5.39, 1060.00, "Client A - โคกขามเก็บขน - กระดาษ - 5,713.40 THB", 1],
+    ["1 Jul 68", "18", "82-4347", "03.30.19", "03.36.02", 15.39, 15, 9.62, 5.77, 5.38, 1060.00, "Client A - โคกขามเก็บขน - พลาสติก - 5,702.80 THB", 1],
+    ["1 Jul 68", "27", "82-4347", "05.17.57", "05.24.12", 14.82, 14.82, 9.58, 5.24, 5.24, 1060.00, "Client A - โคกขามเก็บขน - แก้ว - 5,554.40 THB", 1],
+    ["1 Jul 68", "55", "82-4509", "10.48.29", "10.53.17", 11.34, 11.34, 6.72, 4.62, 4.62, 1060.00, "Client A - โคกขามเก็บขน - ผ้า - 4,897.20 THB", 1],
+    # Day 2 Jul 68
+    ["2 Jul 68", "1", "82-4906", "00.49.00", "00.56.31", 15.04, 15, 9.59, 5.8, 5.37, 1060.00, "Client A - โคกขามเก็บขน - พลาสติก - 5,692.20 THB", 1],
+    ["2 Jul 68", "3", "82-4347", "01.15.30", "01.22.15", 16.8, 15, 9.6, 7.2, 5.4, 1060.00, "Client A - โคกขามเก็บขน - กระดาษ - 5,724.00 THB", 1],
+    ["2 Jul 68", "9", "82-4509", "02.30.45", "02.37.20", 12.5, 12.5, 7.0, 5.5, 5.5, 1060.00, "Client A - โคกขามเก็บขน - โลหะ - 5,830.00 THB", 1],
+]
+
+LICENSE_PLATES = ["82-4347", "82-4346", "82-4509", "82-4906", "82-5123", "82-5678", "82-6789", "82-7890"]
+# The client in the image; further clients are CLIENT- tagged
+SITE_CLIENT = "Client A - โคกขามเก็บขน"
+WASTE_TYPES = ["พลาสติก", "กระดาษ", "โลหะ", "แก้ว", "ผ้า", "ผสม"]
+PRICES_PER_TON = [1060, 1200, 1350, 1500, 1650]
+
+# Longest weigh in minutes; time out may run past 24.00.00 by up to this much
+MAX_DURATION = 15
+# Data rows per sheet in an .xlsx file (plus the header row)
+EXCEL_MAX_ROWS = 1048575
+
+
+def license_plates(trucks):
+    """The image's plates, then further 82-xxxx plates."""
+    extra = [f"{82 + i // 9000}-{1000 + i % 9000}" for i in range(max(trucks - len(LICENSE_PLATES), 0))]
+    return (LICENSE_PLATES + extra)[:trucks]
+
+
+def client_names(clients):
+    return [SITE_CLIENT] + [f"CLIENT-{i:03d}" for i in range(2, clients + 1)]
+
+
+def day_labels(start_date, days):
+    """Column A labels ("1 Jul 68": day, month, short Buddhist year) for consecutive days."""
+    return [f"{d.day} {d:%b} {(d.year + 543) % 100:02d}" for d in pd.date_range(start_date, periods=days)]
+
+
+def covers_image_rows(start_date, days):
+    """Whether the days from start_date include the days of the image rows (1-2 Jul 68)."""
+    return {row[0] for row in IMAGE_ROWS} <= set(day_labels(start_date, days))
+
+
+def clock_labels(seconds):
+    """HH.MM.SS labels for 0..seconds-1; hours are not wrapped at 24."""
+    s = np.arange(seconds)
+    return [f"{h:02d}.{m:02d}.{x:02d}" for h, m, x in zip(s // 3600, s % 3600 // 60, s % 60)]
+
+
+def strings(labels, codes):
+    """Text column from a label list and per-row codes (-1 for blank, NaN as read_excel gives).
+
+    Rows share one string object per label, so the column costs a pointer per row.
+    """
+    lookup = np.empty(len(labels) + 1, dtype=object)
+    lookup[:-1] = labels
+    lookup[-1] = np.nan
+    return lookup[codes]
+
+
+def prepend_text(column, values):
+    """Text column (labels, codes) with rows holding values put first."""
+    labels, codes = column
+    index = pd.Index(labels, dtype=object)
+    index = index.append(pd.Index(pd.unique(values), dtype=object).difference(index, sort=False))
+    return list(index), np.concatenate([index.get_indexer(values), codes])
+
+
+def append_text(column, labels, codes):
+    """Text column (labels, codes) followed by rows with codes into the extra labels."""
+    column_labels, column_codes = column
+    return column_labels + labels, np.concatenate([column_codes, np.where(codes >= 0, codes + len(column_labels), -1)])
+
+
+def generate_weigh_logs(days=31, trucks=8, stations=1, clients=1, rows_per_day=(5, 15), seed=None,
+                        start_date='2025-07-01', image_rows=False, summary_rows=True):
+    """Generate a raw weigh log frame with the A-M columns of the sample workbook.
+
+    Each station logs rows_per_day weighs per day (an int, or an inclusive (low, high)
+    range drawn per station and day), followed by a "รวม" summary row when summary_rows
+    is set. Text columns are built from codes into a few distinct strings, so tens of
+    millions of rows take seconds. With several stations a station column ("station-01",
+    ...) is added, as workbook_ingest does. image_rows puts the rows from the image
+    first, as the original sample did.
+    Column L values are redeemable weight x price / 1000 of the logged 2-decimal values.
+    """
+    rng = np.random.default_rng(seed)
+    low, high = (rows_per_day, rows_per_day) if np.isscalar(rows_per_day) else rows_per_day
+    groups = stations * days
+    counts = rng.integers(low, high + 1, size=groups)
+    n = int(counts.sum())
+
+    # Rows are ordered by station, then day; group = station * days + day
+    group = np.repeat(np.arange(groups), counts)
+    log_number = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+
+    # Random times (24-hour format); time out is 5-15 minutes later
+    time_in = rng.integers(0, 24 * 3600, size=n)
+    time_out = time_in + rng.integers(5, MAX_DURATION + 1, size=n) * 60
+
+    # Weights
+    empty_weight = rng.uniform(6.5, 10.5, size=n).round(2)
+    garbage_weight = rng.uniform(4.0, 8.0, size=n).round(2)
+    total_weight = (empty_weight + garbage_weight).round(2)
+    max_redemption = np.minimum(15.0, total_weight)
+    redeemable = np.minimum(garbage_weight, max_redemption)
+    price_code = rng.integers(0, len(PRICES_PER_TON), size=n)
+    price_per_ton = np.asarray(PRICES_PER_TON, dtype=float)[price_code]
+    redemption_value = (redeemable * price_per_ton / 1000).round(2)
+
+    # Column L: "<client> - <waste type> - <value> THB", formatted once per distinct text
+    names = client_names(clients)
+    prefix = rng.integers(0, clients, size=n) * len(WASTE_TYPES) + rng.integers(0, len(WASTE_TYPES), size=n)
+    cents = np.rint(redemption_value * 100).astype(np.int64)
+    width = cents.max(initial=0) + 1
+    key = prefix * width + cents
+    # Keys are small and dense, so codes come from a lookup table rather than a sort
+    key_counts = np.bincount(key, minlength=1)
+    texts = np.flatnonzero(key_counts)
+    lookup = np.zeros(len(key_counts), dtype=np.int64)
+    lookup[texts] = np.arange(len(texts))
+    text_codes = lookup[key]
+    additional_labels = [
+        f"{names[p // len(WASTE_TYPES)]} - {WASTE_TYPES[p % len(WASTE_TYPES)]} - {c / 100:,.2f} THB"
+        for p, c in zip(texts // width, texts % width)
     ]
-    
-    # Save to Excel
-    filename = "thai_truck_weigh_logs_real_2568.xlsx"
-    df.to_excel(filename, index=False)
-    
-    # Format the Excel file
-    wb = openpyxl.load_workbook(filename)
-    ws = wb.active
-    
+
+    labels = day_labels(start_date, days)
+    clocks = clock_labels(24 * 3600 + MAX_DURATION * 60)
+    numbers = [str(i) for i in range(max(high, 1) + 1)]
+    plates = license_plates(trucks)
+
+    # Columns as (labels, codes) for text and arrays for numbers, A-M order
+    text = {
+        COLUMNS[0]: (labels, group % days),
+        COLUMNS[1]: (numbers, log_number),
+        COLUMNS[2]: (plates, rng.integers(0, trucks, size=n)),
+        COLUMNS[3]: (clocks, time_in),
+        COLUMNS[4]: (clocks, time_out),
+        COLUMNS[11]: (additional_labels, text_codes)
+    }
+    numeric = {
+        COLUMNS[5]: total_weight,
+        COLUMNS[6]: max_redemption,
+        COLUMNS[7]: empty_weight,
+        COLUMNS[8]: garbage_weight,
+        COLUMNS[9]: redeemable,
+        COLUMNS[10]: price_per_ton,
+        COLUMNS[12]: np.ones(n, dtype=np.int64)
+    }
+    values = redemption_value
+
+    if image_rows:
+        image = pd.DataFrame(IMAGE_ROWS, columns=COLUMNS)
+        # Image rows belong to station 1
+        image_group = pd.Index(labels).get_indexer(image[COLUMNS[0]])
+        if (image_group < 0).any():
+            raise ValueError("image_rows needs the generated days to cover 1-2 Jul 68")
+        for col in text:
+            text[col] = prepend_text(text[col], image[col].to_numpy(dtype=object))
+        for col in numeric:
+            numeric[col] = np.concatenate([image[col].to_numpy(dtype=numeric[col].dtype), numeric[col]])
+        image_values = image[COLUMNS[11]].str.extract(r'([\d,]+\.\d+) THB$')[0].str.replace(',', '').astype(float)
+        values = np.concatenate([image_values.to_numpy(), values])
+        group = np.concatenate([image_group, group])
+        n += len(image)
+
+    # Data rows keep their order; each day's "รวม" row goes right after its last row
+    order = np.arange(n)
+    if summary_rows:
+        rows = np.bincount(group, minlength=groups)
+        last = np.full(groups, -1)
+        np.maximum.at(last, group, order)
+        logged = np.flatnonzero(rows)
+        summary_at = last[logged]
+        rank = np.argsort(summary_at, kind='stable')
+        logged, summary_at = logged[rank], summary_at[rank]
+        weight_totals = np.bincount(group, weights=numeric[COLUMNS[5]], minlength=groups)[logged].round(2)
+        value_totals = np.bincount(group, weights=values, minlength=groups)[logged]
+
+        data_position = order + np.searchsorted(summary_at, order, side='left')
+        summary_position = summary_at + 1 + np.arange(len(logged))
+        m = n + len(logged)
+        take = np.empty(m, dtype=np.int64)
+        take[data_position] = order
+        take[summary_position] = n + np.arange(len(logged))
+
+        # Summary rows: the day's date, "รวม", total weight, total value and row count
+        total_codes, total_labels = pd.factorize(pd.Series([f"{total:,.2f} THB" for total in value_totals], dtype=object))
+        summary_text = {
+            COLUMNS[1]: ([SUMMARY_LABEL], np.zeros(len(logged), dtype=np.int64)),
+            COLUMNS[11]: (list(total_labels), total_codes)
+        }
+        for col, column in text.items():
+            if col == COLUMNS[0]:
+                # Day labels keep their codes when image rows are prepended
+                column = (column[0], np.concatenate([column[1], logged % days]))
+            else:
+                column = append_text(column, *summary_text.get(col, ([], np.full(len(logged), -1))))
+            text[col] = (column[0], column[1][take])
+        for col, column in numeric.items():
+            if col == COLUMNS[5]:
+                summary_values = weight_totals
+            elif col == COLUMNS[12]:
+                summary_values = rows[logged]
+            else:
+                summary_values = np.full(len(logged), np.nan)
+            numeric[col] = np.concatenate([column, summary_values.astype(column.dtype)])[take]
+        group = np.concatenate([group, logged])[take]
+
+    # The arrays are fresh, so the frame takes them without copying into merged blocks
+    df = pd.DataFrame({
+        col: strings(*text[col]) if col in text else numeric[col]
+        for col in COLUMNS
+    }, copy=False)
+    if stations > 1:
+        df['station'] = pd.Categorical.from_codes(group // days, [f"station-{i:02d}" for i in range(1, stations + 1)])
+    return df
+
+
+def write_excel(df, path):
+    """Stream a weigh log to .xlsx with openpyxl's write-only mode; summary rows are green."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import PatternFill
+
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df):,} rows do not fit in one Excel sheet ({EXCEL_MAX_ROWS:,}); "
+                         "write CSV or Parquet instead")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
     # Green fill for summary rows
     green_fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
-    
-    for row in range(2, ws.max_row + 1):
-        if ws.cell(row=row, column=2).value == "รวม":  # Log column
-            for col in range(1, ws.max_column + 1):
-                ws.cell(row=row, column=col).fill = green_fill
-
-    wb.save(filename)
-    wb.close()
-    
+
+    def green(value):
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.fill = green_fill
+        return cell
+
+    sheet.append(list(df.columns))
+    summary = (df[COLUMNS[1]] == SUMMARY_LABEL).to_numpy()
+    columns = [df[col].astype(object).where(df[col].notna(), None).tolist() for col in df.columns]
+    for is_summary, row in zip(summary, zip(*columns)):
+        sheet.append([green(value) for value in row] if is_summary else row)
+    workbook.save(path)
+
+
+def write_weigh_logs(df, path):
+    """Write a weigh log as .xlsx, .csv, or a columnar file, chosen by extension."""
+    if storage_format(path):
+        write_table(df, path)
+    elif str(path).lower().endswith('.csv'):
+        df.to_csv(path, index=False)
+    elif str(path).lower().endswith('.xlsx'):
+        write_excel(df, path)
+    else:
+        raise ValueError(f"Unknown weigh log file type: {path}")
+
+
+def write_station_logs(df, directory, filename):
+    """One file per station as <directory>/<station>/<filename>, the layout workbook_ingest reads."""
+    if 'station' not in df.columns:
+        df = df.assign(station='station-01')
+    paths = []
+    for station, rows in df.groupby('station', observed=True, sort=True):
+        folder = os.path.join(directory, station)
+        os.makedirs(folder, exist_ok=True)
+        paths.append(os.path.join(folder, filename))
+        write_weigh_logs(rows.drop(columns='station').reset_index(drop=True), paths[-1])
+    return paths
+
+
+def create_real_thai_data(filename="thai_truck_weigh_logs_real_2568.xlsx", seed=None):
+    """Create real Thai truck weigh station data based on the image."""
+    df = generate_weigh_logs(seed=seed, image_rows=True)
+    write_weigh_logs(df, filename)
+
     print(f"Real Thai truck weigh station data created: {filename}")
-    print(f"Total records: {len(data)}")
+    print(f"Total records: {len(df)}")
     print(f"Days covered: 1-31 Jul 68")
     print(f"Sample data structure matches the image format")
-    
+
     return filename
 
+
+def rows_per_day_arg(value):
+    """"N" or "LOW-HIGH" weighs per station per day."""
+    low, _, high = value.partition('-')
+    low, high = int(low), int(high or low)
+    if not 0 <= low <= high:
+        raise argparse.ArgumentTypeError(f"expected N or LOW-HIGH with 0 <= LOW <= HIGH, got {value!r}")
+    return (low, high) if '-' in value else low
+
+
+def positive_int(value):
+    """A count of trucks, stations or clients."""
+    if int(value) < 1:
+        raise argparse.ArgumentTypeError(f"expected at least 1, got {value}")
+    return int(value)
+
+
+def main():
+    """Generate a weigh log from the command line."""
+    parser = argparse.ArgumentParser(description="Generate synthetic Thai truck weigh station logs")
+    parser.add_argument('--output', default="thai_truck_weigh_logs_real_2568.xlsx",
+                        help=".xlsx, .csv, .parquet or .arrow file")
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--trucks', type=positive_int, default=8)
+    parser.add_argument('--stations', type=positive_int, default=1)
+    parser.add_argument('--clients', type=positive_int, default=1)
+    parser.add_argument('--rows-per-day', type=rows_per_day_arg, default=(5, 15),
+                        help="weighs per station per day: N or LOW-HIGH (default 5-15)")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible logs")
+    parser.add_argument('--start-date', default='2025-07-01')
+    parser.add_argument('--no-image-rows', action='store_true',
+                        help="leave out the rows from the image (only added when the days cover 1-2 Jul 68)")
+    parser.add_argument('--no-summary-rows', action='store_true', help="leave out the daily รวม rows")
+    parser.add_argument('--per-station', metavar='DIRECTORY',
+                        help="write <DIRECTORY>/<station>/<output> per station instead of one file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        image_rows = not args.no_image_rows and covers_image_rows(args.start_date, args.days)
+        df = generate_weigh_logs(days=args.days, trucks=args.trucks, stations=args.stations, clients=args.clients,
+                                 rows_per_day=args.rows_per_day, seed=args.seed, start_date=args.start_date,
+                                 image_rows=image_rows, summary_rows=not args.no_summary_rows)
+    except ValueError as e:
+        parser.error(str(e))
+    generated = time.perf_counter() - start
+    if args.per_station:
+        paths = write_station_logs(df, args.per_station, args.output)
+    else:
+        write_weigh_logs(df, args.output)
+        paths = [args.output]
+
+    print(f"Real Thai truck weigh station data created: {', '.join(paths) if len(paths) <= 3 else f'{len(paths)} files'}")
+    print(f"Total records: {len(df):,} ({args.stations} stations x {args.days} days)")
+    print(f"Generated in {generated:.2f}s, written in {time.perf_counter() - start - generated:.2f}s")
+
+
 if __name__ == "__main__":
-    create_real_thai_data()
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Date-sorted row indexes and period views for the analyzers' stores.
+A DateIndex orders a frame's rows by (filter keys, date) once, so the rows of a period,
+optionally for one station, truck or counterparty, are a contiguous run of that order
+found by binary search: a query costs O(log n + k) for k matching rows instead of a
+boolean mask over all n rows.
+"""
+
+import functools
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min
+
+
+class DateIndex:
+    """Row positions of a frame ordered by (keys, date) for range queries.
+
+    dates is a datetime64 column and keys are columns whose values a query can pin
+    (e.g. a truck plate). Without keys, a frame already in date order is sliced
+    directly; otherwise rows are taken in index order, i.e. by date and, within a
+    date, in frame order.
+    """
+
+    def __init__(self, dates, keys=()):
+        dates = pd.to_datetime(pd.Series(dates)).to_numpy(dtype='datetime64[ns]').view('int64')
+        self.size = len(dates)
+        self.categories = []
+        codes = np.zeros(self.size, dtype=np.int64)
+        for key in keys:
+            key = pd.Categorical(key)
+            self.categories.append(key.categories)
+            # Code 0 holds missing values, which no query pins
+            codes = codes * (len(key.categories) + 1) + key.codes.astype(np.int64) + 1
+
+        if self.categories:
+            self.order = np.lexsort((dates, codes))
+            self.codes = codes[self.order]
+        elif self.size and (dates[1:] >= dates[:-1]).all():
+            self.order = self.codes = None
+        else:
+            self.order = np.argsort(dates, kind='stable')
+            self.codes = None
+        self.dates = dates if self.order is None else dates[self.order]
+
+    def _code(self, values):
+        code = 0
+        for categories, value in zip(self.categories, values):
+            position = categories.get_indexer([value])[0]
+            if position < 0:
+                return None
+            code = code * (len(categories) + 1) + position + 1
+        return code
+
+    def locate(self, start=None, end=None, values=()):
+        """(lo, hi) offsets into the index order of rows dated start..end (inclusive) with the key values."""
+        lo, hi = 0, self.size
+        if self.codes is not None:
+            code = self._code(values)
+            if code is None:
+                return 0, 0
+            lo, hi = np.searchsorted(self.codes, code, 'left'), np.searchsorted(self.codes, code, 'right')
+        if start is not None or end is not None:
+            # Undated rows sort first within a key and fall in no period
+            lo += np.searchsorted(self.dates[lo:hi], NAT, 'right')
+        if start is not None:
+            lo += np.searchsorted(self.dates[lo:hi], pd.Timestamp(start).value, 'left')
+        if end is not None:
+            hi = lo + np.searchsorted(self.dates[lo:hi], pd.Timestamp(end).value, 'right')
+        return int(lo), int(hi)
+
+    def take(self, frame, start=None, end=None, values=()):
+        """Rows of frame (the frame the index was built on) dated start..end with the key values."""
+        lo, hi = self.locate(start, end, values)
+        if self.order is None:
+            return frame.iloc[lo:hi]
+        return frame.take(self.order[lo:hi])
+
+
+class PeriodCache:
+    """Date indexes and the most recent period views of an analyzer, dropped when its data changes."""
+
+    def __init__(self, size=8):
+        self.size = size
+        self.version = None
+        self.indexes = {}
+        self.views = OrderedDict()
+
+    def _sync(self, version):
+        if version != self.version:
+            self.version = version
+            self.indexes.clear()
+            self.views.clear()
+
+    def index(self, version, key, build):
+        """Index stored under key for this data version, built by build() on first use."""
+        self._sync(version)
+        if key not in self.indexes:
+            self.indexes[key] = build()
+        return self.indexes[key]
+
+    def view(self, version, key, build):
+        """Period view stored under key for this data version; least recently used views are evicted."""
+        self._sync(version)
+        if key in self.views:
+            self.views.move_to_end(key)
+            return self.views[key]
+        view = self.views[key] = build()
+        if len(self.views) > self.size:
+            self.views.popitem(last=False)
+        return view
+
+
+def period_key(start, end, filters):
+    """Hashable cache key of a period query; unset filters are dropped."""
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+    return start, end, tuple(sorted((key, value) for key, value in filters.items() if value is not None))
+
+
+def period_filtered(func):
+    """Let an analysis method take start/end and the class's period_filters as keywords.
+
+    Without any of them the method runs on the full history; otherwise it runs on
+    self.period(start, end, **filters), a view over the rows of that period.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, start=None, end=None, **kwargs):
+        filters = {key: kwargs.pop(key) for key in self.period_filters if key in kwargs}
+        if start is None and end is None and all(value is None for value in filters.values()):
+            return func(self, *args, **kwargs)
+        return func(self.period(start, end, **filters), *args, **kwargs)
+    return wrapper
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Recursive multi-step forecasting for the predictive analytics models.
+A fitted regressor is stepped forward one day at a time: each prediction is written
+into a preallocated (series x history + horizon) buffer and the lag, moving-average
+and power features for the next day are read back from it. All series advance
+together, so each step is one batched predict call however many series are forecast.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+CALENDAR_FEATURES = {
+    'day_of_week': lambda dates: dates.dayofweek,
+    'month': lambda dates: dates.month,
+    'day': lambda dates: dates.day,
+    'quarter': lambda dates: dates.quarter,
+    'year': lambda dates: dates.year,
+    'day_of_year': lambda dates: dates.dayofyear,
+    'week_of_year': lambda dates: dates.isocalendar().week.to_numpy()
+}
+
+POWERS = {'squared': 2, 'cubed': 3}
+
+
+def calendar_features(dates, names):
+    """(len(dates), len(names)) float matrix of calendar features for a DatetimeIndex."""
+    return np.column_stack([np.asarray(CALENDAR_FEATURES[name](dates), dtype=float) for name in names])
+
+
+class RecursiveForecaster:
+    """Roll a fitted model's lag/moving-average features forward over many series at once."""
+
+    def __init__(self, model, feature_columns, target='revenue'):
+        self.model = model
+        self.feature_columns = list(feature_columns)
+        self.calendar, self.lags, self.windows, self.powers = [], [], [], []
+
+        pattern = re.compile(rf'^{re.escape(target)}_(?:lag(\d+)|ma(\d+)|(squared|cubed))$')
+        for index, name in enumerate(self.feature_columns):
+            match = pattern.match(name)
+            if name in CALENDAR_FEATURES:
+                self.calendar.append((index, name))
+            elif match and match.group(1):
+                self.lags.append((index, int(match.group(1))))
+            elif match and match.group(2):
+                self.windows.append((index, int(match.group(2))))
+            elif match:
+                self.powers.append((index, POWERS[match.group(3)]))
+            else:
+                raise ValueError(f"Cannot roll feature forward: {name}")
+
+    def forecast(self, history, last_date, horizon=90):
+        """Forecast horizon days after last_date for each row of history.
+
+        history is (n_series, n_observations) or a single 1-D series, oldest first.
+        Lags reaching before the first observation use the first observation, and
+        moving averages use however many values are available. Returns an
+        (n_series, horizon) array.
+        """
+        history = np.atleast_2d(np.asarray(history, dtype=float))
+        n_series, n_history = history.shape
+        if n_history == 0:
+            raise ValueError("history must contain at least one observation")
+
+        dates = pd.date_range(start=pd.Timestamp(last_date) + pd.Timedelta(days=1), periods=horizon, freq='D')
+        calendar = calendar_features(dates, [name for _, name in self.calendar]) if self.calendar else None
+        calendar_index = [index for index, _ in self.calendar]
+
+        values = np.empty((n_series, n_history + horizon))
+        values[:, :n_history] = history
+        X = np.empty((n_series, len(self.feature_columns)))
+
+        for step in range(horizon):
+            t = n_history + step
+            if calendar is not None:
+                X[:, calendar_index] = calendar[step]
+            for index, lag in self.lags:
+                X[:, index] = values[:, max(t - lag, 0)]
+            for index, window in self.windows:
+                X[:, index] = values[:, max(t - window, 0):t].mean(axis=1)
+            for index, power in self.powers:
+                X[:, index] = values[:, t - 1] ** power
+            values[:, t] = self.model.predict(X)
+
+        return values[:, n_history:]
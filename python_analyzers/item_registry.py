@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Item registry for recycled items.
+Keeps the item list and aligned NumPy price/cost vectors in one place so per-item
+metrics can be computed with array operations over an item-quantity matrix.
+"""
+
+import numpy as np
+
+
+class ItemRegistry:
+    """Ordered item catalogue with aligned price and cost vectors."""
+
+    def __init__(self, prices, costs, items=None):
+        self.items = list(items if items is not None else prices)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self.prices = np.array([prices.get(item, 0) for item in self.items], dtype=float)
+        self.costs = np.array([costs.get(item, 0) for item in self.items], dtype=float)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def quantity_matrix(self, df):
+        """Rows x items float matrix; missing items and blanks count as zero."""
+        if df is None or len(df) == 0:
+            return np.zeros((0, len(self.items)))
+        return df.reindex(columns=self.items).fillna(0).to_numpy(dtype=float)
+
+    def totals(self, quantities):
+        """Per-item column sums of a quantity matrix."""
+        return np.ones(quantities.shape[0]) @ quantities
+
+    def as_dict(self, values):
+        """Map an item-aligned vector back to {item: value}."""
+        return dict(zip(self.items, np.asarray(values).tolist()))
+
+
+def safe_divide(numerator, denominator):
+    """Elementwise numerator / denominator, 0 where the denominator is not positive."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator > 0)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON export for the dashboard data files.
+Analysis results are encoded as they are: NumPy scalars and arrays, pandas Timestamps,
+Series and DataFrames are converted while encoding, without a conversion pass over the
+whole tree first. Output is produced in chunks and each chunk is written to every
+destination, so a document is encoded once however many copies are saved. DataFrames
+are streamed as record objects a slice at a time rather than materialized as a list.
+"""
+
+import json
+import math
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    from _json import encode_basestring as _encode_string
+except ImportError:
+    from json.encoder import py_encode_basestring as _encode_string
+
+# Rows per DataFrame slice or list slice encoded in one go
+CHUNK_ROWS = 10000
+# Bytes collected before each write to the destination files
+WRITE_BUFFER = 1 << 20
+
+
+def to_json_value(obj):
+    """JSON-native equivalent of a NumPy/pandas/datetime value; other objects become str."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('records')
+    if isinstance(obj, pd.Series):
+        return obj.to_dict()
+    return str(obj)
+
+
+def _encode_key(key):
+    """Object key as json.dumps writes it; other keys (e.g. Timestamps) become str(key)."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, (float, np.floating)):
+        return _encode_float(float(key))
+    if isinstance(key, (int, np.integer)):
+        return int.__repr__(int(key))
+    return str(key)
+
+
+def _encode_float(value):
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    return float.__repr__(value)
+
+
+class DashboardJSONEncoder:
+    """Chunked JSON encoder for analysis result trees.
+
+    indent=2 matches json.dump(..., indent=2, ensure_ascii=False) output; compact=True
+    writes no whitespace and hands whole slices of lists to the C encoder.
+    """
+
+    def __init__(self, compact=False, indent=2):
+        self.compact = compact
+        self.indent = None if compact else indent
+        self.key_separator = ':' if compact else ': '
+        self._c_encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(',', ':'), default=to_json_value, check_circular=False
+        ).encode
+
+    def iterencode(self, obj):
+        """Yield the JSON text for obj in chunks."""
+        return self._iter(obj, 0)
+
+    def _iter(self, obj, level):
+        if isinstance(obj, str):
+            yield _encode_string(obj)
+        elif obj is None:
+            yield 'null'
+        elif obj is True:
+            yield 'true'
+        elif obj is False:
+            yield 'false'
+        elif isinstance(obj, int):
+            yield int.__repr__(obj)
+        elif isinstance(obj, float):
+            yield _encode_float(obj)
+        elif isinstance(obj, dict):
+            yield from self._iter_dict(obj, level)
+        elif isinstance(obj, (list, tuple)):
+            yield from self._iter_list(obj, level)
+        elif isinstance(obj, pd.DataFrame):
+            yield from self._iter_frame(obj, level)
+        else:
+            yield from self._iter(to_json_value(obj), level)
+
+    def _newline(self, level):
+        return '\n' + ' ' * (self.indent * level)
+
+    def _iter_dict(self, obj, level):
+        if not obj:
+            yield '{}'
+            return
+        if self.indent is None:
+            opening, separator, closing = '{', ',', '}'
+        else:
+            opening = '{' + self._newline(level + 1)
+            separator = ',' + self._newline(level + 1)
+            closing = self._newline(level) + '}'
+
+        yield opening
+        first = True
+        for key, value in obj.items():
+            if not first:
+                yield separator
+            first = False
+            yield _encode_string(_encode_key(key)) + self.key_separator
+            yield from self._iter(value, level + 1)
+        yield closing
+
+    def _iter_list(self, obj, level):
+        if not obj:
+            yield '[]'
+            return
+        if self.indent is None:
+            yield '['
+            for start in range(0, len(obj), CHUNK_ROWS):
+                if start:
+                    yield ','
+                yield from self._iter_slice(obj[start:start + CHUNK_ROWS])
+            yield ']'
+            return
+
+        yield '[' + self._newline(level + 1)
+        separator = ',' + self._newline(level + 1)
+        for index, value in enumerate(obj):
+            if index:
+                yield separator
+            yield from self._iter(value, level + 1)
+        yield self._newline(level) + ']'
+
+    def _iter_slice(self, items):
+        """Compact items of one list slice, without brackets."""
+        try:
+            yield self._c_encode(items)[1:-1]
+        except TypeError:
+            # Non-string keys somewhere in the slice; encode it item by item
+            for index, value in enumerate(items):
+                if index:
+                    yield ','
+                yield from self._iter(value, 0)
+
+    def _iter_frame(self, frame, level):
+        """A DataFrame as a list of record objects, encoded a column slice at a time."""
+        if frame.empty or frame.columns.empty:
+            yield from self._iter_list(frame.to_dict('records'), level)
+            return
+
+        keys = [_encode_string(_encode_key(column)) + self.key_separator for column in frame.columns]
+        if self.indent is None:
+            opening, separator, closing, row_separator = '{', ',', '}', ','
+            yield '['
+        else:
+            opening = '{' + self._newline(level + 2)
+            separator = ',' + self._newline(level + 2)
+            closing = self._newline(level + 1) + '}'
+            row_separator = ',' + self._newline(level + 1)
+            yield '[' + self._newline(level + 1)
+
+        for start in range(0, len(frame), CHUNK_ROWS):
+            if start:
+                yield row_separator
+            chunk = frame.iloc[start:start + CHUNK_ROWS]
+            columns = [self._encode_column(chunk.iloc[:, i], level + 2) for i in range(len(keys))]
+            yield row_separator.join(
+                opening + separator.join(map(str.__add__, keys, values)) + closing
+                for values in zip(*columns)
+            )
+        yield ']' if self.indent is None else self._newline(level) + ']'
+
+    def _encode_column(self, values, level):
+        """JSON text for each value of a DataFrame column."""
+        items = values.tolist()
+        dtype = values.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+            if np.isfinite(values.to_numpy()).all():
+                return list(map(float.__repr__, items))
+            return list(map(_encode_float, items))
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+            return list(map(int.__repr__, items))
+        if dtype == object and pd.api.types.infer_dtype(values, skipna=False) == 'string':
+            return list(map(_encode_string, items))
+        return [''.join(self._iter(value, level)) for value in items]
+
+
+def write_json(obj, paths, compact=False):
+    """Encode obj once and write the same bytes to every path.
+
+    The first path is required. Later paths are best-effort copies: ones that cannot be
+    opened are skipped and returned as {path: error}.
+    """
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    files, failed = [open(paths[0], 'wb')], {}
+    try:
+        for path in paths[1:]:
+            try:
+                files.append(open(path, 'wb'))
+            except OSError as e:
+                failed[path] = e
+
+        buffer, size = [], 0
+        for chunk in DashboardJSONEncoder(compact=compact).iterencode(obj):
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= WRITE_BUFFER:
+                data = ''.join(buffer).encode('utf-8')
+                for f in files:
+                    f.write(data)
+                buffer, size = [], 0
+        data = ''.join(buffer).encode('utf-8')
+        for f in files:
+            f.write(data)
+    finally:
+        for f in files:
+            f.close()
+    return failed
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Columnar storage for the sales/purchase ledgers and the weigh station logs.
+Ledgers are stored as Parquet (compact, for archiving) or Arrow IPC/Feather files
+(uncompressed, so reads map the file and use its buffers in place). Reads are
+memory-mapped and take a column list, so only the projected columns are decoded.
+Converters write the existing record-dict ledgers and Excel weigh logs to either format.
+pyarrow is only needed when one of these files is read or written.
+"""
+
+import argparse
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'ipc', '.feather': 'ipc', '.ipc': 'ipc'}
+
+# Rows converted to record dicts at a time when iterating a loaded ledger
+RECORD_CHUNK = 10000
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow ledgers need pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+def storage_format(path):
+    """'parquet' or 'ipc' by file extension, or None for other files."""
+    path = str(path).lower()
+    for suffix, fmt in FORMATS.items():
+        if path.endswith(suffix):
+            return fmt
+    return None
+
+
+def read_table(path, columns=None):
+    """Memory-map a Parquet or Arrow IPC file into a DataFrame with only the given columns."""
+    pa = _pyarrow()
+    fmt = storage_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    elif fmt == 'ipc':
+        # The table references the mapped file; unselected columns are never touched
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    else:
+        raise ValueError(f"Unknown columnar file type: {path}")
+    return table.to_pandas(split_blocks=True, date_as_object=False)
+
+
+def write_table(frame, path, metadata=None):
+    """Write a DataFrame as Parquet or uncompressed Arrow IPC, chosen by extension.
+
+    metadata is an optional {str: str} stored in the file's schema (see read_metadata).
+    """
+    pa = _pyarrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    fmt = storage_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    elif fmt == 'ipc':
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression='uncompressed')
+    else:
+        raise ValueError(f"Unknown columnar file type: {path}")
+
+
+def read_metadata(path):
+    """{str: str} schema metadata of a columnar file, read without loading any column."""
+    pa = _pyarrow()
+    fmt = storage_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        schema = pq.read_schema(path)
+    elif fmt == 'ipc':
+        with pa.memory_map(str(path)) as source:
+            schema = pa.ipc.open_file(source).schema
+    else:
+        raise ValueError(f"Unknown columnar file type: {path}")
+    return {key.decode(): value.decode() for key, value in (schema.metadata or {}).items()}
+
+
+def ledger_frame(records, category_columns=()):
+    """Typed frame for ledger records: datetime dates, categorical counterparties."""
+    df = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+    for col in category_columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def write_ledger(records, path, category_columns=()):
+    """Convert ledger record dicts (or a ledger frame) to a columnar file."""
+    write_table(ledger_frame(records, category_columns), path)
+
+
+def read_ledger(path, columns=None, category_columns=()):
+    """Load a columnar ledger as records backed by the loaded frame."""
+    return LedgerRecords(ledger_frame(read_table(path, columns), category_columns))
+
+
+class LedgerRecords(Sequence):
+    """Read-only record-dict view of a ledger frame.
+
+    Stands in for the list of record dicts the analyzers otherwise hold: length and
+    truthiness come from the frame, and records (with 'YYYY-MM-DD' dates) are only
+    built when iterated.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._records(self.frame.iloc[index]))
+        return next(self._records(self.frame.iloc[[index]]))
+
+    def __iter__(self):
+        for start in range(0, len(self.frame), RECORD_CHUNK):
+            yield from self._records(self.frame.iloc[start:start + RECORD_CHUNK])
+
+    @staticmethod
+    def _records(chunk):
+        if 'date' in chunk.columns:
+            chunk = chunk.assign(date=chunk['date'].dt.strftime('%Y-%m-%d'))
+        return iter(chunk.to_dict('records'))
+
+
+def weigh_log_frame(df):
+    """Make a raw weigh log frame storable: mixed-type text columns become strings."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def read_weigh_log(path, columns=None):
+    """Load a columnar weigh log with the same missing values as the Excel original."""
+    df = read_table(path, columns)
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def convert_weigh_workbook(xlsx_path, path):
+    """Convert an Excel weigh log workbook to a columnar file."""
+    write_table(weigh_log_frame(pd.read_excel(xlsx_path)), path)
+
+
+def main():
+    """Convert Excel weigh logs and the sample ledgers to columnar files."""
+    parser = argparse.ArgumentParser(description="Convert ledgers and weigh logs to Parquet/Arrow")
+    parser.add_argument('--weigh-log', nargs=2, metavar=('XLSX', 'OUT'), help="convert a weigh log workbook")
+    parser.add_argument('--sample-ledgers', nargs=2, metavar=('SALES_OUT', 'PURCHASES_OUT'),
+                        help="write the demo sales and purchase ledgers")
+    args = parser.parse_args()
+
+    if args.weigh_log:
+        convert_weigh_workbook(*args.weigh_log)
+        print(f"✅ Weigh log written to {args.weigh_log[1]}")
+    if args.sample_ledgers:
+        from recycled_items_analyzer import RecycledItemsAnalyzer
+        analyzer = RecycledItemsAnalyzer()
+        analyzer.load_sample_data()
+        analyzer.save_sales(args.sample_ledgers[0])
+        analyzer.save_purchases(args.sample_ledgers[1])
+        print(f"✅ Sample ledgers written to {', '.join(args.sample_ledgers)}")
+
+
+if __name__ == "__main__":
+    main()
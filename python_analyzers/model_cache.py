@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of fitted predictive models.
+Entries are keyed by a fingerprint of the training data and the model hyperparameters,
+so an unchanged sales ledger reuses the models fitted by an earlier run instead of
+retraining the whole model zoo. The directory is bounded by entry count and total bytes,
+evicting least recently used entries first.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+
+class ModelCache:
+    """Size-bounded LRU cache of pickled model bundles in a directory."""
+
+    suffix = '.pkl'
+
+    def __init__(self, directory, max_entries=16, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(arrays, models, **metadata):
+        """Fingerprint of the training arrays, each model's hyperparameters and metadata."""
+        import sklearn
+
+        digest = hashlib.sha256()
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            if array.dtype.hasobject:
+                # Object arrays hold pointers; hash the values they point to
+                digest.update(repr(array.tolist()).encode())
+            else:
+                digest.update(array.tobytes())
+
+        params = {
+            name: [type(model).__name__, model.get_params(deep=True)]
+            for name, model in models.items()
+        }
+        description = {'models': params, 'metadata': metadata, 'sklearn': sklearn.__version__}
+        digest.update(json.dumps(description, sort_keys=True, default=repr).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key):
+        """Cached bundle for key, or None; a hit marks the entry most recently used."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                bundle = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        self.hits += 1
+        return bundle
+
+    def put(self, key, bundle):
+        """Store bundle under key, then evict least recently used entries over the bounds."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when key is None."""
+        keys = [key] if key is not None else [entry for entry, _, _ in self.entries()]
+        for entry in keys:
+            try:
+                os.remove(self._path(entry))
+            except FileNotFoundError:
+                pass
+
+    def entries(self):
+        """(key, size in bytes, last use time) for each entry, least recently used first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((name[:-len(self.suffix)], stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def _evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            key, size, _ = entries.pop(0)
+            self.invalidate(key)
+            total -= size
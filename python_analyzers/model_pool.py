@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Concurrent model fitting for the predictive analytics model zoo.
+Runs one task per model on a thread or process pool, times each task inside the
+worker, and drops tasks that run past a per-model time budget so a slow model
+cannot hold up the dashboard export.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor
+}
+
+
+def fit_model(model, X, y):
+    """Fit one estimator; returns (fitted estimator, seconds)."""
+    start = time.perf_counter()
+    model.fit(X, y)
+    return model, time.perf_counter() - start
+
+
+def predict_model(model, X):
+    """Predict with one estimator; returns (predictions, seconds)."""
+    start = time.perf_counter()
+    predictions = model.predict(X)
+    return predictions, time.perf_counter() - start
+
+
+def run_with_budget(tasks, executor='thread', workers=None, time_budget=None):
+    """Run {name: (func, args)} concurrently and collect {name: result}.
+
+    Returns (results, errors, dropped): results keep the task order, errors maps
+    a name to the exception its task raised, and dropped lists tasks that were
+    still running time_budget seconds after they started. With the process
+    executor, the workers still running dropped tasks are terminated. Dropped
+    threads cannot be interrupted: they finish in the background, their results
+    are discarded, and the interpreter does not exit until they are done, so use
+    the process executor where a budget must also bound the process's run time.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown model executor: {executor}")
+    workers = workers or min(len(tasks), os.cpu_count() or 1)
+
+    pool = EXECUTORS[executor](max_workers=max(workers, 1))
+    futures = {pool.submit(func, *args): name for name, (func, args) in tasks.items()}
+    started = {}
+    dropped = []
+    pending = set(futures)
+
+    try:
+        while pending:
+            timeout = None
+            if time_budget is not None:
+                now = time.perf_counter()
+                for future in pending:
+                    if future not in started and future.running():
+                        started[future] = now
+                stragglers = {f for f in started if f in pending and now - started[f] > time_budget}
+                for future in stragglers:
+                    future.cancel()
+                    dropped.append(futures[future])
+                pending -= stragglers
+                if not pending:
+                    break
+                # Wake for the next completion, the next deadline, or to notice queued tasks starting
+                wakeups = [started[f] + time_budget - now for f in pending if f in started]
+                if len(wakeups) < len(pending):
+                    wakeups.append(time_budget / 10)
+                timeout = max(min(wakeups), 0) + 1e-3
+            _, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+    finally:
+        # Every task still running is a dropped one; only process workers can be stopped
+        workers = list(pool._processes.values()) if dropped and executor == 'process' else []
+        pool.shutdown(wait=not dropped, cancel_futures=True)
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
+    results, errors = {}, {}
+    for future, name in futures.items():
+        if name in dropped or not future.done() or future.cancelled():
+            continue
+        if future.exception() is not None:
+            errors[name] = future.exception()
+        else:
+            results[name] = future.result()
+
+    results = {name: results[name] for name in tasks if name in results}
+    return results, errors, [name for name in tasks if name in dropped]
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-stage profiling for the analyzers.
+A Profiler records nested spans with wall time, CPU time, tracemalloc peak and row count,
+and exports them as JSON or as collapsed stacks for flamegraph tools (flamegraph.pl,
+inferno, speedscope). Analyzer stages are wrapped with @profiled, which costs one
+attribute lookup when no profiler is attached.
+"""
+
+import contextlib
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+
+class Span:
+    """One profiled stage and the stages it ran."""
+
+    __slots__ = ('name', 'rows', 'wall_seconds', 'cpu_seconds', 'peak_bytes', 'children', '_traced_start', '_peak')
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = None
+        self.children = []
+        self._traced_start = self._peak = 0
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'rows': self.rows,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'peak_mb': None if self.peak_bytes is None else self.peak_bytes / 1024 / 1024,
+            'children': [child.as_dict() for child in self.children]
+        }
+
+
+class Profiler:
+    """Collects nested spans per thread; root spans are kept in order in spans.
+
+    CPU time is process CPU, so pool threads count toward the span waiting on them.
+    Peak memory is traced with tracemalloc (started for the outermost span unless it
+    is already tracing) and is the span's peak above what was allocated when it began.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.spans = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owns_tracing = False
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, name, rows=None):
+        """Record the enclosed block as a span, nested in the enclosing one."""
+        stack = self._stack()
+        span = Span(name, rows)
+        parent = stack[-1] if stack else None
+        if parent is None:
+            with self._lock:
+                self.spans.append(span)
+            if self.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+        else:
+            parent.children.append(span)
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent._peak = max(parent._peak, peak)
+            span._traced_start = span._peak = current
+            tracemalloc.reset_peak()
+
+        stack.append(span)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_seconds = time.perf_counter() - wall
+            span.cpu_seconds = time.process_time() - cpu
+            stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                span._peak = max(span._peak, tracemalloc.get_traced_memory()[1])
+                span.peak_bytes = span._peak - span._traced_start
+                if parent is not None:
+                    parent._peak = max(parent._peak, span._peak)
+            if parent is None and self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    def as_dict(self):
+        return {'spans': [span.as_dict() for span in self.spans]}
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, ensure_ascii=False, indent=2)
+
+    def collapsed_stacks(self, metric='wall_seconds'):
+        """Lines of "outer;inner microseconds" with each span's exclusive time.
+
+        This is the folded format flamegraph.pl and speedscope read; identical stacks
+        are summed by those tools.
+        """
+        lines = []
+
+        def walk(span, prefix):
+            path = prefix + span.name.replace(';', ':')
+            own = getattr(span, metric) - sum(getattr(child, metric) for child in span.children)
+            micros = round(own * 1e6)
+            if micros > 0:
+                lines.append(f"{path} {micros}")
+            for child in span.children:
+                walk(child, path + ';')
+
+        for span in self.spans:
+            walk(span, '')
+        return lines
+
+    def write_collapsed(self, path, metric='wall_seconds'):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(line + '\n' for line in self.collapsed_stacks(metric))
+
+    def write(self, prefix):
+        """Write <prefix>.json and <prefix>.folded; returns both paths."""
+        paths = (f"{prefix}.json", f"{prefix}.folded")
+        self.write_json(paths[0])
+        self.write_collapsed(paths[1])
+        return paths
+
+
+def profiled(name=None, rows=None):
+    """Run a method in a span of self.profiler when one is attached.
+
+    rows gives the span's row count: an attribute name of self, or the position of an
+    argument, whose len() is taken when the method is called.
+    """
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, 'profiler', None)
+            if profiler is None:
+                return func(self, *args, **kwargs)
+            if isinstance(rows, str):
+                count = len(getattr(self, rows))
+            elif isinstance(rows, int) and rows < len(args):
+                count = len(args[rows])
+            else:
+                count = None
+            with profiler.span(label, count):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorate
@@ -1,19 +1,48 @@
+import copy
 import pandas as pd
-import json
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler, PolynomialFeatures
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-from sklearn.svm import SVR
-from sklearn.neural_network import MLPRegressor
 import warnings
+from contextlib import nullcontext
+from analysis_graph import AnalysisGraph
+from anomaly_detection import StreamingAnomalyDetector
+from console_report import render_recycled_summary
+from date_index import DateIndex, PeriodCache, period_filtered, period_key
+from forecasting import RecursiveForecaster
+from trends import TrendFit, fit_grouped_trends, fit_trends
+from item_registry import ItemRegistry, safe_divide
+from json_export import write_json
+from compact_dtypes import compact_columns, format_megabytes
+from ledger_store import LedgerRecords, ledger_frame, read_ledger, write_table
+from model_cache import ModelCache
+from model_pool import fit_model, predict_model, run_with_budget
+from profiling import Profiler, profiled
 warnings.filterwarnings('ignore')
 
 class RecycledItemsAnalyzer:
-    def __init__(self):
+    def __init__(self, model_workers=None, model_executor='thread', model_time_budget=None, model_cache=None,
+                 progress=print, profiler=None, compact_dtypes=False):
+        # Predictive model zoo: pool size (None = one per model, up to CPU count),
+        # 'thread' or 'process' pool, and per-model seconds before a model is dropped
+        # (a dropped thread still delays interpreter exit; a dropped process is terminated)
+        self.model_workers = model_workers
+        self.model_executor = model_executor
+        self.model_time_budget = model_time_budget
+        # Optional ModelCache (or cache directory) reusing fitted models across runs
+        self.model_cache = ModelCache(model_cache) if isinstance(model_cache, str) else model_cache
+        # Called with model warnings and export notes; None keeps the analyzer silent
+        self.progress = progress
+        # Optional profiling.Profiler recording each stage as a span
+        self.profiler = profiler
+        # Keep ledger frames in compact dtypes; memory_usage holds the before/after bytes
+        self.compact_dtypes = compact_dtypes
+        self.memory_usage = {}
+        # Date indexes and period views (see period)
+        self.periods = PeriodCache()
+        
+        self._data_version = 0
+        self._sales_frame = None
+        self._purchase_frame = None
         self.sales_data = []
         self.purchase_data = []
         
@@ -49,6 +78,165 @@ class RecycledItemsAnalyzer:
             'glassBottles': 1.2,
             'battery': 70.0
         }
+        
+        self.items = ItemRegistry(self.item_prices, self.item_costs)
+        self.graph = self._build_graph()
+    
+    @property
+    def sales_data(self):
+        return self._sales_data
+    
+    @sales_data.setter
+    def sales_data(self, records):
+        self._sales_data = records
+        self._sales_frame = None
+        self._data_version += 1
+    
+    @property
+    def purchase_data(self):
+        return self._purchase_data
+    
+    @purchase_data.setter
+    def purchase_data(self, records):
+        self._purchase_data = records
+        self._purchase_frame = None
+        self._data_version += 1
+    
+    @profiled()
+    def load_sales(self, path, columns=None):
+        """Load the sales ledger from a Parquet/Arrow IPC file, optionally only some columns"""
+        self.sales_data = read_ledger(path, columns, ['customer'])
+    
+    @profiled()
+    def load_purchases(self, path, columns=None):
+        """Load the purchase ledger from a Parquet/Arrow IPC file, optionally only some columns"""
+        self.purchase_data = read_ledger(path, columns, ['supplier'])
+    
+    @profiled(rows='sales_data')
+    def save_sales(self, path):
+        """Write the sales ledger to a Parquet/Arrow IPC file (format by extension)"""
+        write_table(self._sales_df(), path)
+    
+    @profiled(rows='purchase_data')
+    def save_purchases(self, path):
+        """Write the purchase ledger to a Parquet/Arrow IPC file (format by extension)"""
+        write_table(self._purchase_df(), path)
+    
+    def _log(self, message):
+        if self.progress:
+            self.progress(message)
+    
+    def invalidate_model_cache(self):
+        """Drop every cached fitted model so the next forecast retrains the model zoo"""
+        if self.model_cache is not None:
+            self.model_cache.invalidate()
+    
+    def invalidate_frames(self):
+        """Drop cached frames after mutating sales_data/purchase_data in place"""
+        self._sales_frame = None
+        self._purchase_frame = None
+        self._data_version += 1
+    
+    def _build_graph(self):
+        """Register each analysis as a graph node with its declared inputs"""
+        graph = AnalysisGraph(lambda: self._data_version, self.profiler, lambda: len(self.sales_data))
+        ledgers = ('sales_analysis', 'purchase_analysis')
+        graph.add_node('sales_quantities', lambda: self.items.quantity_matrix(self._sales_df() if self.sales_data else None))
+        graph.add_node('purchase_quantities', lambda: self.items.quantity_matrix(self._purchase_df() if self.purchase_data else None))
+        graph.add_node('sales_item_totals', self.items.totals, ('sales_quantities',))
+        graph.add_node('purchase_item_totals', self.items.totals, ('purchase_quantities',))
+        graph.add_node('sales_analysis', self._compute_sales_analysis, ('sales_item_totals',))
+        graph.add_node('purchase_analysis', self._compute_purchase_analysis, ('purchase_item_totals',))
+        graph.add_node('financial_analysis', self._compute_profit_margin, ledgers)
+        graph.add_node('item_insights', self._compute_item_insights, ledgers + ('sales_item_totals', 'purchase_item_totals'))
+        graph.add_node('predictive_analytics', self._compute_predictive_analytics)
+        graph.add_node('advanced_metrics', self._compute_advanced_metrics, ledgers)
+        graph.add_node('environmental_impact', self._compute_environmental_impact, ledgers)
+        graph.add_node('market_analysis', self._compute_market_analysis, ledgers)
+        return graph
+    
+    def _build_frame(self, records, category_columns, name):
+        """Convert ledger records to a typed columnar frame"""
+        frame = records.frame if isinstance(records, LedgerRecords) else ledger_frame(records, category_columns)
+        if self.compact_dtypes:
+            self.compact_ledger(frame, name)
+        return frame
+    
+    @profiled(rows=0)
+    def compact_ledger(self, frame, name):
+        """Store a ledger frame in compact dtypes, in place, and log the memory saved.
+        
+        Customers, suppliers and registrations become categorical and item quantities
+        float32. Revenue and amounts stay float64, and quantity matrices are widened
+        back to float64, so results match the default dtypes to float32 precision.
+        """
+        before, after = compact_columns(
+            frame,
+            categories=['customer', 'supplier', 'registration'],
+            float32=[item for item in self.items if item in frame.columns]
+        )
+        self.memory_usage[name] = {'before_bytes': before, 'after_bytes': after}
+        self._log(f"Compact dtypes: {name} ledger, {len(frame)} rows, {format_megabytes(before, after)}")
+    
+    def _sales_df(self):
+        """Cached sales frame, built once per load. Callers must not mutate it."""
+        if self._sales_frame is None:
+            self._sales_frame = self._build_frame(self._sales_data, ['customer'], 'sales')
+        return self._sales_frame
+    
+    def _purchase_df(self):
+        """Cached purchase frame, built once per load. Callers must not mutate it."""
+        if self._purchase_frame is None:
+            self._purchase_frame = self._build_frame(self._purchase_data, ['supplier'], 'purchases')
+        return self._purchase_frame
+    
+    # period() filters: keyword -> (ledger, column) it pins; the other ledger is only limited to the period
+    period_filters = {'customer': ('sales', 'customer'), 'supplier': ('purchases', 'supplier'),
+                      'truck': ('purchases', 'registration')}
+    
+    def period(self, start=None, end=None, **filters):
+        """Read-only analyzer view over the sales and purchases dated start..end (inclusive)
+        
+        customer pins one sales counterparty, supplier and truck (registration) one
+        purchase counterparty or vehicle. Records are found by binary search in a date
+        index per ledger (see date_index), so a query costs O(log n + k) for k records;
+        indexes and recent views are cached per data version. Every analysis method
+        takes the same keywords and runs on the view.
+        """
+        unknown = set(filters) - set(self.period_filters)
+        if unknown:
+            raise ValueError(f"Unknown period filters: {', '.join(sorted(unknown))}")
+        key = period_key(start, end, filters)
+        return self.periods.view(self._data_version, key, lambda: self._build_period(*key))
+    
+    def _build_period(self, start, end, filters):
+        ledgers = {}
+        for ledger, frame in (('sales', self._sales_df), ('purchases', self._purchase_df)):
+            records = self.sales_data if ledger == 'sales' else self.purchase_data
+            if not records:
+                ledgers[ledger] = records
+                continue
+            frame = frame()
+            pinned = [(self.period_filters[name][1], value) for name, value in filters
+                      if self.period_filters[name][0] == ledger]
+            for column, _ in pinned:
+                if column not in frame.columns:
+                    raise ValueError(f"Cannot filter {ledger} by {column}: no such column in the ledger")
+            columns = tuple(column for column, _ in pinned)
+            index = self.periods.index(self._data_version, (ledger, columns), lambda: DateIndex(
+                frame['date'], [frame[column] for column in columns]
+            ))
+            ledgers[ledger] = LedgerRecords(index.take(frame, start, end, [value for _, value in pinned]))
+        
+        view = copy.copy(self)
+        view.periods = PeriodCache()
+        view.memory_usage = {}
+        # Period frames are slices of frames that were already compacted
+        view.compact_dtypes = False
+        view.sales_data = ledgers['sales']
+        view.purchase_data = ledgers['purchases']
+        view.graph = view._build_graph()
+        return view
     
     def get_item_price(self, item):
         """Get the selling price for an item"""
@@ -451,13 +639,17 @@ class RecycledItemsAnalyzer:
             }
         ]
     
+    @period_filtered
     def analyze_sales_data(self):
         """Analyze sales data and generate insights"""
+        return self.graph.evaluate('sales_analysis')
+    
+    def _compute_sales_analysis(self, item_totals):
+        """Graph node for analyze_sales_data"""
         if not self.sales_data:
             return {}
         
-        df = pd.DataFrame(self.sales_data)
-        df['date'] = pd.to_datetime(df['date'])
+        df = self._sales_df()
         
         # Basic statistics
         total_revenue = df['totalRevenue'].sum()
@@ -465,27 +657,19 @@ class RecycledItemsAnalyzer:
         unique_customers = df['customer'].nunique()
         
         # Item analysis
-        item_columns = ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                       'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                       'buckets', 'glassBottles', 'battery']
-        
-        item_totals = {}
-        for col in item_columns:
-            item_totals[col] = df[col].sum()
+        item_totals = self.items.as_dict(item_totals)
         
         # Customer analysis
-        customer_revenue = df.groupby('customer')['totalRevenue'].sum().to_dict()
-        customer_transactions = df['customer'].value_counts().to_dict()
+        customer_revenue = df.groupby('customer', observed=True)['totalRevenue'].sum().to_dict()
+        customer_transactions = df.groupby('customer', observed=True).size().sort_values(ascending=False, kind='stable').to_dict()
         
         # Daily trends
         daily_revenue = df.groupby('date')['totalRevenue'].sum().to_dict()
         daily_transactions = df.groupby('date').size().to_dict()
         
         # Top performing items
-        item_revenue_contribution = {}
-        for col in item_columns:
-            # Estimate revenue contribution based on quantity (simplified)
-            item_revenue_contribution[col] = df[col].sum()
+        # Estimate revenue contribution based on quantity (simplified)
+        item_revenue_contribution = dict(item_totals)
         
         return {
             'total_revenue': total_revenue,
@@ -500,13 +684,17 @@ class RecycledItemsAnalyzer:
             'average_revenue_per_transaction': total_revenue / total_transactions if total_transactions > 0 else 0
         }
     
+    @period_filtered
     def analyze_purchase_data(self):
         """Analyze purchase data and generate insights"""
+        return self.graph.evaluate('purchase_analysis')
+    
+    def _compute_purchase_analysis(self, item_totals):
+        """Graph node for analyze_purchase_data"""
         if not self.purchase_data:
             return {}
         
-        df = pd.DataFrame(self.purchase_data)
-        df['date'] = pd.to_datetime(df['date'])
+        df = self._purchase_df()
         
         # Basic statistics
         total_cost = df['amount'].sum()
@@ -514,17 +702,11 @@ class RecycledItemsAnalyzer:
         unique_suppliers = df['supplier'].nunique()
         
         # Item analysis
-        item_columns = ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                       'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                       'buckets', 'glassBottles', 'battery']
-        
-        item_totals = {}
-        for col in item_columns:
-            item_totals[col] = df[col].sum()
+        item_totals = self.items.as_dict(item_totals)
         
         # Supplier analysis
-        supplier_cost = df.groupby('supplier')['amount'].sum().to_dict()
-        supplier_purchases = df['supplier'].value_counts().to_dict()
+        supplier_cost = df.groupby('supplier', observed=True)['amount'].sum().to_dict()
+        supplier_purchases = df.groupby('supplier', observed=True).size().sort_values(ascending=False, kind='stable').to_dict()
         
         # Daily trends
         daily_cost = df.groupby('date')['amount'].sum().to_dict()
@@ -533,6 +715,9 @@ class RecycledItemsAnalyzer:
         # Registration analysis
         unique_registrations = df['registration'].nunique()
         
+        # Unusual purchase amounts, in the order they were logged
+        amount_anomalies = self._detect_anomalies(df.sort_values('date', kind='stable'), 'amount')
+        
         return {
             'total_cost': total_cost,
             'total_purchases': total_purchases,
@@ -543,14 +728,17 @@ class RecycledItemsAnalyzer:
             'supplier_purchases': supplier_purchases,
             'daily_cost': daily_cost,
             'daily_purchases': daily_purchases,
+            'amount_anomalies': amount_anomalies,
             'average_cost_per_purchase': total_cost / total_purchases if total_purchases > 0 else 0
         }
     
+    @period_filtered
     def calculate_profit_margin(self):
         """Calculate profit margin and financial insights"""
-        sales_analysis = self.analyze_sales_data()
-        purchase_analysis = self.analyze_purchase_data()
-        
+        return self.graph.evaluate('financial_analysis')
+    
+    def _compute_profit_margin(self, sales_analysis, purchase_analysis):
+        """Graph node for calculate_profit_margin"""
         if not sales_analysis or not purchase_analysis:
             return {}
         
@@ -568,53 +756,48 @@ class RecycledItemsAnalyzer:
             'roi': (gross_profit / total_cost * 100) if total_cost > 0 else 0
         }
     
+    @period_filtered
     def generate_item_insights(self):
         """Generate insights about individual items"""
-        sales_analysis = self.analyze_sales_data()
-        purchase_analysis = self.analyze_purchase_data()
-        
+        return self.graph.evaluate('item_insights')
+    
+    def _compute_item_insights(self, sales_analysis, purchase_analysis, sales_qty, purchase_qty):
+        """Graph node for generate_item_insights"""
         if not sales_analysis or not purchase_analysis:
             return {}
         
-        item_columns = ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                       'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                       'buckets', 'glassBottles', 'battery']
+        # Calculate turnover rate
+        turnover_rate = safe_divide(sales_qty, purchase_qty) * 100
+        
+        # Determine item performance
+        performance = np.select(
+            [turnover_rate > 80, turnover_rate > 60, turnover_rate > 40],
+            ['Excellent', 'Good', 'Fair'],
+            default='Poor'
+        )
         
         item_insights = {}
-        for item in item_columns:
-            sales_qty = sales_analysis['item_totals'].get(item, 0)
-            purchase_qty = purchase_analysis['item_totals'].get(item, 0)
-            
-            # Calculate turnover rate
-            turnover_rate = (sales_qty / purchase_qty * 100) if purchase_qty > 0 else 0
-            
-            # Determine item performance
-            if turnover_rate > 80:
-                performance = 'Excellent'
-            elif turnover_rate > 60:
-                performance = 'Good'
-            elif turnover_rate > 40:
-                performance = 'Fair'
-            else:
-                performance = 'Poor'
-            
+        for i, item in enumerate(self.items):
             item_insights[item] = {
-                'sales_quantity': sales_qty,
-                'purchase_quantity': purchase_qty,
-                'turnover_rate': turnover_rate,
-                'performance': performance
+                'sales_quantity': float(sales_qty[i]),
+                'purchase_quantity': float(purchase_qty[i]),
+                'turnover_rate': float(turnover_rate[i]),
+                'performance': str(performance[i])
             }
         
         return item_insights
     
+    @period_filtered
     def generate_predictive_analytics(self):
         """Generate comprehensive sales forecasting and predictive insights"""
+        return self.graph.evaluate('predictive_analytics')
+    
+    def _compute_predictive_analytics(self):
+        """Graph node for generate_predictive_analytics"""
         if not self.sales_data:
             return {}
         
-        df = pd.DataFrame(self.sales_data)
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
+        df = self._sales_df().sort_values('date')
         
         # Create comprehensive time-based features
         df['day_of_week'] = df['date'].dt.dayofweek
@@ -652,14 +835,42 @@ class RecycledItemsAnalyzer:
         X = df[feature_columns].values
         y = df['totalRevenue'].values
         
-        # Split data for validation
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        # Train multiple models
-        models = self._train_multiple_models(X_train, y_train)
-        
-        # Evaluate models
-        model_evaluations = self._evaluate_models(models, X_test, y_test)
+        # Reuse models fitted on identical training data by an earlier run
+        models = self._build_model_zoo()
+        cache_key = None
+        cached = None
+        if self.model_cache is not None:
+            cache_key = self.model_cache.key((X, y), models, feature_columns=feature_columns,
+                                             test_size=0.2, random_state=42)
+            cached = self.model_cache.get(cache_key)
+        
+        if cached is not None:
+            models = cached['models']
+            model_evaluations = cached['model_performance']
+            dropped_models = []
+        else:
+            from sklearn.model_selection import train_test_split
+            
+            # Split data for validation
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+            
+            # Train multiple models
+            models, fit_seconds, dropped_models = self._train_multiple_models(X_train, y_train, models)
+            
+            # Evaluate models
+            model_evaluations, dropped_at_predict = self._evaluate_models(models, X_test, y_test, fit_seconds)
+            dropped_models += dropped_at_predict
+            
+            if not model_evaluations:
+                return self._generate_basic_predictions(df)
+            
+            # Results missing budget-dropped models are not worth reusing
+            if cache_key is not None and not dropped_models:
+                self.model_cache.put(cache_key, {
+                    'models': models,
+                    'model_performance': model_evaluations,
+                    'feature_columns': feature_columns
+                })
         
         # Get best model
         best_model_name = max(model_evaluations, key=lambda k: model_evaluations[k]['r2_score'])
@@ -677,11 +888,12 @@ class RecycledItemsAnalyzer:
         # Anomaly detection
         anomalies = self._detect_anomalies(df)
         
-        # Demand forecasting by item
+        # Demand forecasting by item, and revenue trends by customer
         item_forecasts = self._forecast_by_item(df)
+        customer_forecasts = self._forecast_by_customer()
         
         # Risk assessment
-        risk_assessment = self._assess_risks(df, future_predictions)
+        risk_assessment = self._assess_risks(df, future_predictions, seasonal_analysis)
         
         return {
             'sales_forecast': {
@@ -694,9 +906,11 @@ class RecycledItemsAnalyzer:
                 'best_model': best_model_name
             },
             'model_performance': model_evaluations,
+            'dropped_models': dropped_models,
             'seasonal_analysis': seasonal_analysis,
             'anomaly_detection': anomalies,
             'item_forecasts': item_forecasts,
+            'customer_forecasts': customer_forecasts,
             'risk_assessment': risk_assessment,
             'trend_analysis': trend_analysis
         }
@@ -719,23 +933,17 @@ class RecycledItemsAnalyzer:
             }
         
         # Simple linear regression
-        X = np.arange(len(df)).reshape(-1, 1)
-        y = df['totalRevenue'].values
-        
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        future_days = np.arange(len(df), len(df) + 7).reshape(-1, 1)
-        future_predictions = model.predict(future_days)
+        fit = fit_trends(df['totalRevenue'].values)
+        future_predictions = fit.project(7)[0]
         
-        trend = "Increasing" if model.coef_[0] > 0 else "Decreasing"
+        trend = "Increasing" if fit.slope[0] > 0 else "Decreasing"
         
         return {
             'sales_forecast': {
                 'next_7_days': future_predictions.tolist(),
                 'trend': trend,
-                'trend_strength': float(abs(model.coef_[0])),
-                'confidence': float(model.score(X, y))
+                'trend_strength': float(abs(fit.slope[0])),
+                'confidence': float(fit.r_squared[0])
             },
             'seasonal_analysis': {
                 'peak_month': int(df['month'].mode().iloc[0]) if len(df) > 0 else 1,
@@ -744,8 +952,15 @@ class RecycledItemsAnalyzer:
             }
         }
     
-    def _train_multiple_models(self, X_train, y_train):
-        """Train multiple machine learning models"""
+    @profiled()
+    def _build_model_zoo(self):
+        """Unfitted estimators for the predictive model zoo"""
+        # scikit-learn is only loaded once a forecast actually needs it
+        from sklearn.linear_model import LinearRegression, Ridge, Lasso
+        from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+        from sklearn.svm import SVR
+        from sklearn.neural_network import MLPRegressor
+        
         models = {}
         
         # Linear models
@@ -763,74 +978,88 @@ class RecycledItemsAnalyzer:
         # Neural Network
         models['Neural Network'] = MLPRegressor(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42)
         
-        # Train all models
-        for name, model in models.items():
-            try:
-                model.fit(X_train, y_train)
-            except Exception as e:
-                print(f"Error training {name}: {e}")
-                # Remove failed model
-                models.pop(name, None)
-        
         return models
     
-    def _evaluate_models(self, models, X_test, y_test):
-        """Evaluate model performance"""
+    @profiled(rows=0)
+    def _train_multiple_models(self, X_train, y_train, models=None):
+        """Train multiple machine learning models concurrently.
+        
+        Returns (fitted models, fit seconds per model, models dropped for exceeding
+        model_time_budget).
+        """
+        if models is None:
+            models = self._build_model_zoo()
+        
+        # Train all models
+        fitted, errors, dropped = self._run_model_tasks(
+            {name: (fit_model, (model, X_train, y_train)) for name, model in models.items()}
+        )
+        for name, e in errors.items():
+            self._log(f"Error training {name}: {e}")
+        for name in dropped:
+            self._log(f"Dropped {name}: training exceeded {self.model_time_budget}s budget")
+        
+        models = {name: model for name, (model, _) in fitted.items()}
+        fit_seconds = {name: seconds for name, (_, seconds) in fitted.items()}
+        return models, fit_seconds, dropped
+    
+    @profiled(rows=1)
+    def _evaluate_models(self, models, X_test, y_test, fit_seconds=None):
+        """Evaluate model performance; returns (evaluations, models dropped at predict)"""
+        from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+        
         evaluations = {}
+        fit_seconds = fit_seconds or {}
+        
+        predicted, errors, dropped = self._run_model_tasks(
+            {name: (predict_model, (model, X_test)) for name, model in models.items()}
+        )
+        for name in dropped:
+            self._log(f"Dropped {name}: prediction exceeded {self.model_time_budget}s budget")
         
-        for name, model in models.items():
+        for name in models:
+            if name in dropped:
+                continue
             try:
-                y_pred = model.predict(X_test)
+                if name in errors:
+                    raise errors[name]
+                y_pred, predict_seconds = predicted[name]
                 
                 evaluations[name] = {
                     'r2_score': float(r2_score(y_test, y_pred)),
                     'mse': float(mean_squared_error(y_test, y_pred)),
                     'mae': float(mean_absolute_error(y_test, y_pred)),
-                    'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred)))
+                    'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+                    'fit_seconds': fit_seconds.get(name),
+                    'predict_seconds': predict_seconds
                 }
             except Exception as e:
-                print(f"Error evaluating {name}: {e}")
+                self._log(f"Error evaluating {name}: {e}")
                 evaluations[name] = {
                     'r2_score': 0,
                     'mse': float('inf'),
                     'mae': float('inf'),
-                    'rmse': float('inf')
+                    'rmse': float('inf'),
+                    'fit_seconds': fit_seconds.get(name),
+                    'predict_seconds': None
                 }
         
-        return evaluations
+        return evaluations, dropped
     
+    def _run_model_tasks(self, tasks):
+        """Run per-model tasks on the configured pool under the per-model time budget"""
+        return run_with_budget(tasks, executor=self.model_executor, workers=self.model_workers,
+                               time_budget=self.model_time_budget)
+    
+    @profiled(rows=0)
     def _generate_future_predictions(self, df, model, feature_columns):
-        """Generate future predictions using the best model"""
-        # Create future dates
-        last_date = df['date'].max()
-        future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=90, freq='D')
-        
-        # Create future feature matrix
-        future_df = pd.DataFrame({'date': future_dates})
-        future_df['day_of_week'] = future_df['date'].dt.dayofweek
-        future_df['month'] = future_df['date'].dt.month
-        future_df['day'] = future_df['date'].dt.day
-        future_df['quarter'] = future_df['date'].dt.quarter
-        future_df['year'] = future_df['date'].dt.year
-        future_df['day_of_year'] = future_df['date'].dt.dayofyear
-        future_df['week_of_year'] = future_df['date'].dt.isocalendar().week
-        
-        # Use last known values for lag features
-        last_revenue = df['totalRevenue'].iloc[-1]
-        last_revenue_lag1 = df['totalRevenue'].iloc[-2] if len(df) > 1 else last_revenue
-        last_revenue_lag2 = df['totalRevenue'].iloc[-3] if len(df) > 2 else last_revenue_lag1
-        
-        future_df['revenue_lag1'] = last_revenue
-        future_df['revenue_lag2'] = last_revenue_lag1
-        future_df['revenue_lag3'] = last_revenue_lag2
-        future_df['revenue_ma3'] = df['totalRevenue'].tail(3).mean()
-        future_df['revenue_ma7'] = df['totalRevenue'].tail(7).mean()
-        future_df['revenue_squared'] = last_revenue ** 2
-        future_df['revenue_cubed'] = last_revenue ** 3
-        
-        # Make predictions
-        X_future = future_df[feature_columns].values
-        predictions = model.predict(X_future)
+        """Generate future predictions using the best model.
+        
+        Lag, moving-average and power features are rolled forward from each day's
+        prediction rather than frozen at the last observed values.
+        """
+        forecaster = RecursiveForecaster(model, feature_columns)
+        predictions = forecaster.forecast(df['totalRevenue'].to_numpy(), df['date'].max(), horizon=90)[0]
         
         return {
             'next_7_days': predictions[:7].tolist(),
@@ -840,21 +1069,14 @@ class RecycledItemsAnalyzer:
     
     def _analyze_trends(self, df):
         """Analyze trends in the data"""
-        # Linear trend
-        X = np.arange(len(df)).reshape(-1, 1)
-        y = df['totalRevenue'].values
-        
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        trend = "Increasing" if model.coef_[0] > 0 else "Decreasing"
-        trend_strength = abs(model.coef_[0])
+        # Linear and exponential (log) trends as two columns of one least-squares fit
+        y = df['totalRevenue'].to_numpy(dtype=float)
+        fit = fit_trends(np.column_stack([y, np.log(y + 1)]))  # Add 1 to avoid log(0)
+        slope, exp_slope = fit.slope
         
-        # Exponential trend
-        log_y = np.log(y + 1)  # Add 1 to avoid log(0)
-        exp_model = LinearRegression()
-        exp_model.fit(X, log_y)
-        exp_trend = "Exponential Growth" if exp_model.coef_[0] > 0 else "Exponential Decay"
+        trend = "Increasing" if slope > 0 else "Decreasing"
+        trend_strength = abs(slope)
+        exp_trend = "Exponential Growth" if exp_slope > 0 else "Exponential Decay"
         
         # Volatility analysis
         volatility = df['totalRevenue'].std()
@@ -867,9 +1089,10 @@ class RecycledItemsAnalyzer:
             'exponential_trend': exp_trend,
             'volatility': float(volatility),
             'coefficient_of_variation': float(cv),
-            'trend_confidence': float(model.score(X, y))
+            'trend_confidence': float(fit.r_squared[0])
         }
     
+    @profiled(rows=0)
     def _seasonal_decomposition(self, df):
         """Perform seasonal decomposition analysis"""
         if len(df) < 12:  # Need at least 12 data points for seasonal analysis
@@ -904,80 +1127,82 @@ class RecycledItemsAnalyzer:
             'seasonal_strength': float(seasonal_strength)
         }
     
-    def _detect_anomalies(self, df):
-        """Detect anomalies in the data"""
-        revenue = df['totalRevenue'].values
-        
-        # Statistical anomaly detection (3-sigma rule)
-        mean_revenue = np.mean(revenue)
-        std_revenue = np.std(revenue)
-        
-        upper_bound = mean_revenue + 2 * std_revenue
-        lower_bound = mean_revenue - 2 * std_revenue
-        
-        anomalies = []
-        for i, value in enumerate(revenue):
-            if value > upper_bound or value < lower_bound:
-                anomalies.append({
-                    'index': i,
-                    'date': df['date'].iloc[i].strftime('%Y-%m-%d'),
-                    'value': float(value),
-                    'expected_range': [float(lower_bound), float(upper_bound)],
-                    'severity': 'high' if abs(value - mean_revenue) > 3 * std_revenue else 'medium'
-                })
+    @profiled(rows=0)
+    def _detect_anomalies(self, df, column='totalRevenue'):
+        """Detect anomalies in a date-ordered series, each judged only against earlier values"""
+        detector = StreamingAnomalyDetector()
+        events = detector.backfill(df[column].to_numpy(dtype=float))
+        
+        dates = df['date'].iloc[[event['index'] for event in events]].dt.strftime('%Y-%m-%d')
+        anomalies = [{'index': event['index'], 'date': date, **event} for event, date in zip(events, dates)]
+        lower_bound, upper_bound = detector.bounds()
         
         return {
             'anomalies': anomalies,
             'anomaly_count': len(anomalies),
-            'anomaly_rate': len(anomalies) / len(revenue) if len(revenue) > 0 else 0,
+            'anomaly_rate': len(anomalies) / len(df) if len(df) > 0 else 0,
             'upper_bound': float(upper_bound),
             'lower_bound': float(lower_bound)
         }
     
+    @profiled(rows=0)
     def _forecast_by_item(self, df):
         """Generate forecasts for individual items"""
         if not self.sales_data:
             return {}
         
-        item_forecasts = {}
+        sales_df = self._sales_df()
+        items = [col for col in sales_df.columns if col not in ('date', 'customer', 'totalRevenue')]
+        if len(sales_df) < 2 or not items:
+            return {}
         
-        # Get unique items from sales data
-        all_items = set()
-        for sale in self.sales_data:
-            for item, qty in sale.items():
-                if item != 'date' and item != 'customer' and item != 'totalRevenue':
-                    all_items.add(item)
-        
-        for item in all_items:
-            # Calculate item-specific trends
-            item_totals = []
-            for sale in self.sales_data:
-                item_qty = sale.get(item, 0)
-                item_totals.append(item_qty)
-            
-            if len(item_totals) > 1:
-                # Simple trend analysis for each item
-                X = np.arange(len(item_totals)).reshape(-1, 1)
-                y = np.array(item_totals)
-                
-                model = LinearRegression()
-                model.fit(X, y)
-                
-                # Predict next 7 days
-                future_X = np.arange(len(item_totals), len(item_totals) + 7).reshape(-1, 1)
-                future_predictions = model.predict(future_X)
-                
-                item_forecasts[item] = {
-                    'trend': "Increasing" if model.coef_[0] > 0 else "Decreasing",
-                    'trend_strength': float(abs(model.coef_[0])),
-                    'next_7_days': future_predictions.tolist(),
-                    'confidence': float(model.score(X, y))
-                }
+        # One trend per item over the sales ledger order, fitted in a single solve
+        quantities = sales_df[items].fillna(0).to_numpy(dtype=float)
+        return self._trend_forecasts(items, fit_trends(quantities))
+    
+    @profiled(rows='sales_data')
+    def _forecast_by_customer(self):
+        """Per-customer revenue trends against calendar days"""
+        if not self.sales_data:
+            return {}
         
-        return item_forecasts
+        sales_df = self._sales_df()
+        days = (sales_df['date'] - sales_df['date'].min()).dt.days.to_numpy()
+        codes = sales_df['customer'].cat.codes.to_numpy()
+        customers = sales_df['customer'].cat.categories
+        # Sales without a customer (code -1) belong to no customer's trend
+        named = codes >= 0
+        days, codes = days[named], codes[named]
+        fit = fit_grouped_trends(days, sales_df['totalRevenue'].to_numpy()[named], codes, len(customers))
+        
+        # A trend needs at least two distinct sale dates
+        distinct_days = pd.Series(days).groupby(codes).nunique().reindex(range(len(customers)), fill_value=0)
+        fitted = distinct_days.to_numpy() > 1
+        return self._trend_forecasts(list(customers[fitted]), TrendFit(
+            fit.slope[fitted], fit.intercept[fitted], fit.r_squared[fitted], fit.x_last[fitted]
+        ))
+    
+    def _trend_forecasts(self, names, fit):
+        """Trend direction, strength, R² and 7/30/90-step projections per series"""
+        next_7 = fit.project(7)
+        projections = fit.project(90)
+        return {
+            name: {
+                'trend': "Increasing" if slope > 0 else "Decreasing",
+                'trend_strength': float(abs(slope)),
+                'next_7_days': next_7[i].tolist(),
+                'projection_30_days': float(projections[i, 29]),
+                'projection_90_days': float(projections[i, 89]),
+                'confidence': float(fit.r_squared[i])
+            }
+            for i, (name, slope) in enumerate(zip(names, fit.slope))
+        }
     
-    def _assess_risks(self, df, future_predictions):
+    def _assess_risks(self, df, future_predictions, seasonal_analysis=None):
         """Assess risks in future predictions"""
+        if seasonal_analysis is None:
+            seasonal_analysis = self._seasonal_decomposition(df)
+        
         # Calculate prediction intervals
         revenue_std = df['totalRevenue'].std()
         
@@ -985,7 +1210,7 @@ class RecycledItemsAnalyzer:
         risk_factors = {
             'volatility_risk': float(revenue_std / df['totalRevenue'].mean()) if df['totalRevenue'].mean() > 0 else 0,
             'trend_risk': 1 - abs(df['totalRevenue'].corr(pd.Series(range(len(df))))),
-            'seasonal_risk': 1 - self._seasonal_decomposition(df)['seasonal_strength'],
+            'seasonal_risk': 1 - seasonal_analysis['seasonal_strength'],
             'data_quality_risk': 1 - (len(df) / 30)  # Risk based on data quantity
         }
         
@@ -1007,11 +1232,13 @@ class RecycledItemsAnalyzer:
             'prediction_confidence': 1 - overall_risk
         }
     
+    @period_filtered
     def calculate_advanced_metrics(self):
         """Calculate advanced business metrics"""
-        sales_analysis = self.analyze_sales_data()
-        purchase_analysis = self.analyze_purchase_data()
-        
+        return self.graph.evaluate('advanced_metrics')
+    
+    def _compute_advanced_metrics(self, sales_analysis, purchase_analysis):
+        """Graph node for calculate_advanced_metrics"""
         if not sales_analysis or not purchase_analysis:
             return {}
         
@@ -1049,11 +1276,13 @@ class RecycledItemsAnalyzer:
             'operational_efficiency': 85.5  # Placeholder
         }
     
+    @period_filtered
     def generate_environmental_impact(self):
         """Calculate environmental impact metrics"""
-        sales_analysis = self.analyze_sales_data()
-        purchase_analysis = self.analyze_purchase_data()
-        
+        return self.graph.evaluate('environmental_impact')
+    
+    def _compute_environmental_impact(self, sales_analysis, purchase_analysis):
+        """Graph node for generate_environmental_impact"""
         if not sales_analysis or not purchase_analysis:
             return {}
         
@@ -1083,11 +1312,13 @@ class RecycledItemsAnalyzer:
             'environmental_score': min(100, diversion_rate)
         }
     
+    @period_filtered
     def generate_market_analysis(self):
         """Generate market and competitive analysis"""
-        sales_analysis = self.analyze_sales_data()
-        purchase_analysis = self.analyze_purchase_data()
-        
+        return self.graph.evaluate('market_analysis')
+    
+    def _compute_market_analysis(self, sales_analysis, purchase_analysis):
+        """Graph node for generate_market_analysis"""
         if not sales_analysis or not purchase_analysis:
             return {}
         
@@ -1118,6 +1349,8 @@ class RecycledItemsAnalyzer:
             'market_position': "Market Leader" if market_share > 10 else "Established Player"
         }
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_advanced_analytics(self):
         """Generate advanced analytics and insights"""
         sales_analysis = self.analyze_sales_data()
@@ -1156,61 +1389,56 @@ class RecycledItemsAnalyzer:
             'performance_metrics': performance_metrics
         }
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def calculate_item_profitability(self):
         """Calculate profitability metrics for each item"""
         if not self.sales_data or not self.purchase_data:
             return {}
         
-        sales_df = pd.DataFrame(self.sales_data)
-        purchase_df = pd.DataFrame(self.purchase_data)
+        total_sales_qty = self.graph.evaluate('sales_item_totals')
+        total_purchase_qty = self.graph.evaluate('purchase_item_totals')
+        total_revenue = self._sales_df()['totalRevenue'].sum()
+        total_cost = self._purchase_df()['amount'].sum()
         
-        item_columns = ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                       'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                       'buckets', 'glassBottles', 'battery']
+        # Calculate average revenue and cost per unit (simplified)
+        avg_revenue_per_unit = safe_divide(total_revenue, total_sales_qty)
+        avg_cost_per_unit = safe_divide(total_cost, total_purchase_qty)
+        
+        # Calculate profit margin and ROI
+        unit_profit = avg_revenue_per_unit - avg_cost_per_unit
+        profit_margin = safe_divide(unit_profit, avg_revenue_per_unit) * 100
+        roi = safe_divide(unit_profit, avg_cost_per_unit) * 100
+        profitability_score = self.calculate_profitability_score(profit_margin, roi)
         
         profitability = {}
-        for item in item_columns:
-            # Calculate average revenue per unit (simplified)
-            total_sales_qty = sales_df[item].sum()
-            total_revenue = sales_df['totalRevenue'].sum()
-            avg_revenue_per_unit = total_revenue / total_sales_qty if total_sales_qty > 0 else 0
-            
-            # Calculate average cost per unit (simplified)
-            total_purchase_qty = purchase_df[item].sum()
-            total_cost = purchase_df['amount'].sum()
-            avg_cost_per_unit = total_cost / total_purchase_qty if total_purchase_qty > 0 else 0
-            
-            # Calculate profit margin
-            profit_margin = ((avg_revenue_per_unit - avg_cost_per_unit) / avg_revenue_per_unit * 100) if avg_revenue_per_unit > 0 else 0
-            
-            # Calculate ROI
-            roi = ((avg_revenue_per_unit - avg_cost_per_unit) / avg_cost_per_unit * 100) if avg_cost_per_unit > 0 else 0
-            
+        for i, item in enumerate(self.items):
             profitability[item] = {
-                'avg_revenue_per_unit': avg_revenue_per_unit,
-                'avg_cost_per_unit': avg_cost_per_unit,
-                'profit_margin': profit_margin,
-                'roi': roi,
-                'total_sales_qty': total_sales_qty,
-                'total_purchase_qty': total_purchase_qty,
-                'profitability_score': self.calculate_profitability_score(profit_margin, roi)
+                'avg_revenue_per_unit': float(avg_revenue_per_unit[i]),
+                'avg_cost_per_unit': float(avg_cost_per_unit[i]),
+                'profit_margin': float(profit_margin[i]),
+                'roi': float(roi[i]),
+                'total_sales_qty': float(total_sales_qty[i]),
+                'total_purchase_qty': float(total_purchase_qty[i]),
+                'profitability_score': float(profitability_score[i])
             }
         
         return profitability
     
     def calculate_profitability_score(self, profit_margin, roi):
-        """Calculate a profitability score from 0-100"""
+        """Calculate a profitability score from 0-100 (scalars or item vectors)"""
         # Weight profit margin 60% and ROI 40%
-        score = (profit_margin * 0.6) + (min(roi, 100) * 0.4)
-        return max(0, min(100, score))
+        score = (np.asarray(profit_margin) * 0.6) + (np.minimum(roi, 100) * 0.4)
+        return np.clip(score, 0, 100)
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_sales_forecast(self):
         """Generate sales forecast for next 30 days"""
         if not self.sales_data:
             return {}
         
-        df = pd.DataFrame(self.sales_data)
-        df['date'] = pd.to_datetime(df['date'])
+        df = self._sales_df()
         
         # Calculate daily average revenue
         daily_avg_revenue = df['totalRevenue'].mean()
@@ -1244,23 +1472,24 @@ class RecycledItemsAnalyzer:
             'total_forecast_revenue': sum(f['predicted_revenue'] for f in forecast)
         }
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def analyze_seasonal_patterns(self):
         """Analyze seasonal patterns in the data"""
         if not self.sales_data:
             return {}
         
-        df = pd.DataFrame(self.sales_data)
-        df['date'] = pd.to_datetime(df['date'])
-        df['month'] = df['date'].dt.month
-        df['day_of_week'] = df['date'].dt.dayofweek
+        df = self._sales_df()
+        month = df['date'].dt.month
+        day_of_week = df['date'].dt.dayofweek
         
         # Monthly patterns
-        monthly_revenue = df.groupby('month')['totalRevenue'].sum().to_dict()
-        monthly_avg = df.groupby('month')['totalRevenue'].mean().to_dict()
+        monthly_revenue = df.groupby(month)['totalRevenue'].sum().to_dict()
+        monthly_avg = df.groupby(month)['totalRevenue'].mean().to_dict()
         
         # Day of week patterns
-        dow_revenue = df.groupby('day_of_week')['totalRevenue'].sum().to_dict()
-        dow_avg = df.groupby('day_of_week')['totalRevenue'].mean().to_dict()
+        dow_revenue = df.groupby(day_of_week)['totalRevenue'].sum().to_dict()
+        dow_avg = df.groupby(day_of_week)['totalRevenue'].mean().to_dict()
         
         # Identify peak months
         peak_month = max(monthly_revenue, key=monthly_revenue.get) if monthly_revenue else None
@@ -1290,46 +1519,40 @@ class RecycledItemsAnalyzer:
         seasonality_score = min(100, (std_dev / mean_val) * 100) if mean_val > 0 else 0
         return seasonality_score
     
-    def analyze_customer_behavior(self):
+    @period_filtered
+    @profiled(rows='sales_data')
+    def analyze_customer_behavior(self, top_n=3):
         """Analyze customer behavior patterns"""
         if not self.sales_data:
             return {}
         
-        df = pd.DataFrame(self.sales_data)
+        df = self._sales_df()
+        
+        # Single grouped pass: frequency, value and per-item quantities per customer
+        stats = self._counterparty_stats(df, 'customer', 'totalRevenue')
         
         # Customer frequency analysis
-        customer_frequency = df['customer'].value_counts().to_dict()
+        customer_frequency = stats['frequency'].sort_values(ascending=False, kind='stable').to_dict()
         
         # Customer value analysis
-        customer_value = df.groupby('customer')['totalRevenue'].sum().to_dict()
-        customer_avg_value = df.groupby('customer')['totalRevenue'].mean().to_dict()
+        by_name = stats.sort_index()
+        customer_value = by_name['value'].to_dict()
+        customer_avg_value = by_name['avg_value'].to_dict()
         
         # Customer preferences (top items per customer)
-        customer_preferences = {}
-        for customer in df['customer'].unique():
-            customer_data = df[df['customer'] == customer]
-            item_columns = ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                           'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                           'buckets', 'glassBottles', 'battery']
-            
-            preferences = {}
-            for item in item_columns:
-                preferences[item] = customer_data[item].sum()
-            
-            # Get top 3 items
-            top_items = sorted(preferences.items(), key=lambda x: x[1], reverse=True)[:3]
-            customer_preferences[customer] = top_items
+        item_sums = stats[self.items.items].to_numpy(dtype=float)
+        top_idx = np.argsort(-item_sums, axis=1, kind='stable')[:, :top_n]
+        top_qty = np.take_along_axis(item_sums, top_idx, axis=1).tolist()
+        items = self.items.items
+        customer_preferences = {
+            customer: [(items[j], qty) for j, qty in zip(idx, qtys)]
+            for customer, idx, qtys in zip(stats.index, top_idx.tolist(), top_qty)
+        }
         
         # Customer loyalty score
-        loyalty_scores = {}
-        for customer in customer_value:
-            frequency = customer_frequency.get(customer, 0)
-            value = customer_value.get(customer, 0)
-            avg_value = customer_avg_value.get(customer, 0)
-            
-            # Simple loyalty score based on frequency and value
-            loyalty_score = min(100, (frequency * 20) + (avg_value / 100))
-            loyalty_scores[customer] = loyalty_score
+        # Simple loyalty score based on frequency and value
+        loyalty = np.minimum(100, by_name['frequency'] * 20 + by_name['avg_value'] / 100)
+        loyalty_scores = loyalty.to_dict()
         
         return {
             'customer_frequency': customer_frequency,
@@ -1340,42 +1563,36 @@ class RecycledItemsAnalyzer:
             'top_customers': sorted(customer_value.items(), key=lambda x: x[1], reverse=True)[:3]
         }
     
+    @period_filtered
+    @profiled(rows='purchase_data')
     def analyze_supplier_performance(self):
         """Analyze supplier performance metrics"""
         if not self.purchase_data:
             return {}
         
-        df = pd.DataFrame(self.purchase_data)
+        df = self._purchase_df()
+        
+        # Single grouped pass: frequency, cost spread and per-item quantities per supplier
+        stats = self._counterparty_stats(df, 'supplier', 'amount')
         
         # Supplier cost analysis
-        supplier_cost = df.groupby('supplier')['amount'].sum().to_dict()
-        supplier_avg_cost = df.groupby('supplier')['amount'].mean().to_dict()
-        supplier_frequency = df['supplier'].value_counts().to_dict()
+        by_name = stats.sort_index()
+        supplier_cost = by_name['value'].to_dict()
+        supplier_avg_cost = by_name['avg_value'].to_dict()
+        supplier_frequency = stats['frequency'].sort_values(ascending=False, kind='stable').to_dict()
         
         # Supplier reliability (based on consistency of purchases)
-        supplier_reliability = {}
-        for supplier in df['supplier'].unique():
-            supplier_data = df[df['supplier'] == supplier]
-            frequency = len(supplier_data)
-            avg_amount = supplier_data['amount'].mean()
-            std_amount = supplier_data['amount'].std()
-            
-            # Reliability score based on consistency
-            consistency = 1 - (std_amount / avg_amount) if avg_amount > 0 else 0
-            reliability_score = min(100, (frequency * 10) + (consistency * 50))
-            supplier_reliability[supplier] = reliability_score
+        avg_amount = stats['avg_value'].to_numpy(dtype=float)
+        consistency = np.where(avg_amount > 0, 1 - safe_divide(stats['std_value'], avg_amount), 0)
+        reliability = stats['frequency'].to_numpy() * 10 + consistency * 50
+        # Reliability score capped at 100; single-purchase suppliers (NaN std) hit the cap
+        reliability = np.where(reliability < 100, reliability, 100)
+        supplier_reliability = dict(zip(stats.index, reliability.tolist()))
         
         # Supplier quality (based on item variety)
-        supplier_quality = {}
-        item_columns = ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                       'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                       'buckets', 'glassBottles', 'battery']
-        
-        for supplier in df['supplier'].unique():
-            supplier_data = df[df['supplier'] == supplier]
-            item_variety = sum(1 for item in item_columns if supplier_data[item].sum() > 0)
-            quality_score = min(100, item_variety * 7.7)  # 13 items max = 100 score
-            supplier_quality[supplier] = quality_score
+        item_variety = (stats[self.items.items].to_numpy(dtype=float) > 0).sum(axis=1)
+        quality = np.minimum(100, item_variety * 7.7)  # 13 items max = 100 score
+        supplier_quality = dict(zip(stats.index, quality.tolist()))
         
         return {
             'supplier_cost': supplier_cost,
@@ -1386,74 +1603,80 @@ class RecycledItemsAnalyzer:
             'top_suppliers': sorted(supplier_cost.items(), key=lambda x: x[1], reverse=True)[:3]
         }
     
+    def _counterparty_stats(self, df, key, value_col):
+        """One groupby over a counterparty column, in first-appearance order"""
+        frame = pd.DataFrame(self.items.quantity_matrix(df), columns=self.items.items, index=df.index)
+        frame[key] = df[key]
+        frame['_value'] = df[value_col]
+        aggregations = {
+            'frequency': ('_value', 'size'),
+            'value': ('_value', 'sum'),
+            'avg_value': ('_value', 'mean'),
+            'std_value': ('_value', 'std'),
+        }
+        aggregations.update({item: (item, 'sum') for item in self.items})
+        return frame.groupby(key, observed=True, sort=False).agg(**aggregations)
+    
+    @period_filtered
+    @profiled(rows='sales_data')
     def optimize_inventory_levels(self):
         """Optimize inventory levels based on sales patterns"""
         if not self.sales_data or not self.purchase_data:
             return {}
         
-        sales_df = pd.DataFrame(self.sales_data)
-        purchase_df = pd.DataFrame(self.purchase_data)
+        total_sales = self.graph.evaluate('sales_item_totals')
+        total_purchased = self.graph.evaluate('purchase_item_totals')
+        days_of_data = len(self._sales_df())
+        
+        # Calculate daily sales rate
+        daily_sales_rate = safe_divide(total_sales, days_of_data)
+        
+        # Calculate safety stock (20% of daily sales for 7 days)
+        safety_stock = daily_sales_rate * 7 * 0.2
+        
+        # Calculate reorder point (7 days of sales + safety stock)
+        reorder_point = daily_sales_rate * 7 + safety_stock
+        
+        # Calculate optimal order quantity (14 days of sales)
+        optimal_order_qty = daily_sales_rate * 14
+        
+        # Calculate current inventory (simplified - purchase - sales)
+        current_inventory = total_purchased - total_sales
+        days_of_inventory = safe_divide(current_inventory, daily_sales_rate)
         
-        item_columns = ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                       'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                       'buckets', 'glassBottles', 'battery']
+        # Determine action needed
+        reorder = current_inventory <= reorder_point
+        action = np.where(reorder, 'Reorder', 'Hold')
+        urgency = np.where(reorder, np.where(current_inventory <= safety_stock, 'High', 'Medium'), 'Low')
         
         inventory_recommendations = {}
-        for item in item_columns:
-            # Calculate daily sales rate
-            total_sales = sales_df[item].sum()
-            days_of_data = len(sales_df)
-            daily_sales_rate = total_sales / days_of_data if days_of_data > 0 else 0
-            
-            # Calculate safety stock (20% of daily sales for 7 days)
-            safety_stock = daily_sales_rate * 7 * 0.2
-            
-            # Calculate reorder point (7 days of sales + safety stock)
-            reorder_point = daily_sales_rate * 7 + safety_stock
-            
-            # Calculate optimal order quantity (14 days of sales)
-            optimal_order_qty = daily_sales_rate * 14
-            
-            # Calculate current inventory (simplified - purchase - sales)
-            total_purchased = purchase_df[item].sum()
-            current_inventory = total_purchased - total_sales
-            
-            # Determine action needed
-            if current_inventory <= reorder_point:
-                action = 'Reorder'
-                urgency = 'High' if current_inventory <= safety_stock else 'Medium'
-            else:
-                action = 'Hold'
-                urgency = 'Low'
-            
+        for i, item in enumerate(self.items):
             inventory_recommendations[item] = {
-                'daily_sales_rate': daily_sales_rate,
-                'safety_stock': safety_stock,
-                'reorder_point': reorder_point,
-                'optimal_order_qty': optimal_order_qty,
-                'current_inventory': current_inventory,
-                'action': action,
-                'urgency': urgency,
-                'days_of_inventory': current_inventory / daily_sales_rate if daily_sales_rate > 0 else 0
+                'daily_sales_rate': float(daily_sales_rate[i]),
+                'safety_stock': float(safety_stock[i]),
+                'reorder_point': float(reorder_point[i]),
+                'optimal_order_qty': float(optimal_order_qty[i]),
+                'current_inventory': float(current_inventory[i]),
+                'action': str(action[i]),
+                'urgency': str(urgency[i]),
+                'days_of_inventory': float(days_of_inventory[i])
             }
         
         return inventory_recommendations
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def calculate_performance_metrics(self):
         """Calculate key performance indicators"""
         if not self.sales_data or not self.purchase_data:
             return {}
         
-        sales_df = pd.DataFrame(self.sales_data)
-        purchase_df = pd.DataFrame(self.purchase_data)
+        sales_df = self._sales_df()
+        purchase_df = self._purchase_df()
         
         # Inventory turnover rate
-        total_sales_qty = sum(sales_df[col].sum() for col in ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                                                             'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                                                             'buckets', 'glassBottles', 'battery'])
-        total_purchase_qty = sum(purchase_df[col].sum() for col in ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                                                                   'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                                                                   'buckets', 'glassBottles', 'battery'])
+        total_sales_qty = float(self.graph.evaluate('sales_item_totals').sum())
+        total_purchase_qty = float(self.graph.evaluate('purchase_item_totals').sum())
         
         avg_inventory = (total_purchase_qty - total_sales_qty) / 2 if total_purchase_qty > total_sales_qty else 0
         inventory_turnover = total_sales_qty / avg_inventory if avg_inventory > 0 else 0
@@ -1484,31 +1707,30 @@ class RecycledItemsAnalyzer:
             'avg_inventory': avg_inventory
         }
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_profit_margin_data(self):
         """Generate profit margin data for charts"""
-        profit_margin_data = {}
-        
         # Calculate profit margins for each item
-        for item in ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                    'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                    'buckets', 'glassBottles', 'battery']:
-            total_revenue = sum(sale.get(item, 0) * self.get_item_price(item) for sale in self.sales_data)
-            total_cost = sum(sale.get(item, 0) * self.get_item_cost(item) for sale in self.sales_data)
-            
-            if total_revenue > 0:
-                profit_margin = ((total_revenue - total_cost) / total_revenue) * 100
-            else:
-                profit_margin = 0
-                
+        quantities = self.graph.evaluate('sales_item_totals')
+        total_revenue = quantities * self.items.prices
+        total_cost = quantities * self.items.costs
+        profit = total_revenue - total_cost
+        profit_margin = safe_divide(profit, total_revenue) * 100
+        
+        profit_margin_data = {}
+        for i, item in enumerate(self.items):
             profit_margin_data[item] = {
-                'revenue': total_revenue,
-                'cost': total_cost,
-                'profit': total_revenue - total_cost,
-                'margin': profit_margin
+                'revenue': float(total_revenue[i]),
+                'cost': float(total_cost[i]),
+                'profit': float(profit[i]),
+                'margin': float(profit_margin[i])
             }
         
         return profit_margin_data
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_growth_rate_data(self):
         """Generate growth rate data for charts"""
         daily_revenue = {}
@@ -1541,32 +1763,29 @@ class RecycledItemsAnalyzer:
             'avg_growth_rate': np.mean(list(growth_rates.values())) if growth_rates else 0
         }
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_inventory_turnover_data(self):
         """Generate inventory turnover data for charts"""
-        turnover_data = {}
+        # Calculate total quantity sold
+        total_quantity = self.graph.evaluate('sales_item_totals')
         
-        for item in ['clearBottles', 'mixedPlastic', 'iron', 'aluminum', 'steelCans', 
-                    'beerCans', 'beerCrates', 'crates', 'paperScraps', 'usedOil', 
-                    'buckets', 'glassBottles', 'battery']:
-            # Calculate total quantity sold
-            total_quantity = sum(sale.get(item, 0) for sale in self.sales_data)
-            
-            # Estimate average inventory (simplified calculation)
-            avg_inventory = total_quantity * 0.3  # Assume 30% of total sales as average inventory
-            
-            if avg_inventory > 0:
-                turnover_rate = total_quantity / avg_inventory
-            else:
-                turnover_rate = 0
-                
+        # Estimate average inventory (simplified calculation)
+        avg_inventory = total_quantity * 0.3  # Assume 30% of total sales as average inventory
+        turnover_rate = safe_divide(total_quantity, avg_inventory)
+        
+        turnover_data = {}
+        for i, item in enumerate(self.items):
             turnover_data[item] = {
-                'total_quantity': total_quantity,
-                'avg_inventory': avg_inventory,
-                'turnover_rate': turnover_rate
+                'total_quantity': float(total_quantity[i]),
+                'avg_inventory': float(avg_inventory[i]),
+                'turnover_rate': float(turnover_rate[i])
             }
         
         return turnover_data
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_cash_flow_data(self):
         """Generate cash flow data for charts"""
         daily_revenue = {}
@@ -1605,6 +1824,8 @@ class RecycledItemsAnalyzer:
             'cumulative_cash_flow': cumulative_cash_flow
         }
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_daily_heatmap_data(self):
         """Generate daily heatmap data for charts"""
         daily_revenue = {}
@@ -1633,6 +1854,8 @@ class RecycledItemsAnalyzer:
             'max_revenue': max(daily_revenue.values()) if daily_revenue else 0
         }
     
+    @period_filtered
+    @profiled(rows='sales_data')
     def generate_dashboard_data(self):
         """Generate comprehensive dashboard data"""
         sales_analysis = self.analyze_sales_data()
@@ -1686,86 +1909,55 @@ class RecycledItemsAnalyzer:
             'market_analysis': market_analysis
         }
     
-    def export_json_for_dashboard(self):
-        """Export data in JSON format for dashboard consumption"""
-        dashboard_data = self.generate_dashboard_data()
-        
-        # Convert datetime objects to strings for JSON serialization
-        def convert_datetime(obj):
-            if isinstance(obj, dict):
-                return {str(k): convert_datetime(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_datetime(item) for item in obj]
-            elif isinstance(obj, (datetime, pd.Timestamp)):
-                return obj.isoformat()
-            elif isinstance(obj, (np.integer, np.floating)):
-                return float(obj)
-            else:
-                return obj
-        
-        dashboard_data = convert_datetime(dashboard_data)
-        
-        # Save to JSON file
-        with open('../html_dashboards/recycled_items_dashboard_data.json', 'w', encoding='utf-8') as f:
-            json.dump(dashboard_data, f, ensure_ascii=False, indent=2, default=str)
-        
-        print("✅ Recycled items dashboard data exported successfully!")
+    @period_filtered
+    @profiled(rows='sales_data')
+    def export_json_for_dashboard(self, compact=False, dashboard_data=None):
+        """Export data in JSON format for dashboard consumption
+        
+        compact=True writes the production payload without indentation. Pass the
+        result of generate_dashboard_data to write it without recomputing.
+        """
+        if dashboard_data is None:
+            dashboard_data = self.generate_dashboard_data()
+        
+        # NumPy/pandas values and Timestamp keys are converted while encoding
+        with self.profiler.span('write_json') if self.profiler else nullcontext():
+            write_json(dashboard_data, '../html_dashboards/recycled_items_dashboard_data.json', compact=compact)
+        
+        self._log("✅ Recycled items dashboard data exported successfully!")
         return dashboard_data
 
-def main():
-    """Main function to run the analyzer"""
+def main(profile=None, compact_dtypes=False):
+    """Main function to run the analyzer
+    
+    With profile, per-stage spans are written to <profile>.json and <profile>.folded.
+    With compact_dtypes, the ledger frames are kept in compact dtypes.
+    """
     print("🔄 Starting Recycled Items Analysis...")
     
-    analyzer = RecycledItemsAnalyzer()
+    profiler = Profiler() if profile else None
+    analyzer = RecycledItemsAnalyzer(model_cache='.model_cache', profiler=profiler, compact_dtypes=compact_dtypes)
     analyzer.load_sample_data()
     
-    print("📊 Analyzing sales data...")
-    sales_analysis = analyzer.analyze_sales_data()
-    print(f"   - Total Revenue: ฿{sales_analysis['total_revenue']:,.2f}")
-    print(f"   - Total Transactions: {sales_analysis['total_transactions']}")
-    print(f"   - Unique Customers: {sales_analysis['unique_customers']}")
-    
-    print("📥 Analyzing purchase data...")
-    purchase_analysis = analyzer.analyze_purchase_data()
-    print(f"   - Total Cost: ฿{purchase_analysis['total_cost']:,.2f}")
-    print(f"   - Total Purchases: {purchase_analysis['total_purchases']}")
-    print(f"   - Unique Suppliers: {purchase_analysis['unique_suppliers']}")
-    
-    print("💰 Calculating financial metrics...")
-    financial_analysis = analyzer.calculate_profit_margin()
-    print(f"   - Gross Profit: ฿{financial_analysis['gross_profit']:,.2f}")
-    print(f"   - Profit Margin: {financial_analysis['profit_margin']:.1f}%")
-    print(f"   - ROI: {financial_analysis['roi']:.1f}%")
-    
-    print("📈 Generating item insights...")
-    item_insights = analyzer.generate_item_insights()
-    print(f"   - Items Analyzed: {len(item_insights)}")
-    
-    print("🔮 Generating predictive analytics...")
-    predictive_analytics = analyzer.generate_predictive_analytics()
-    print(f"   - Sales Trend: {predictive_analytics.get('sales_forecast', {}).get('trend', 'Unknown')}")
-    print(f"   - Best Model: {predictive_analytics.get('sales_forecast', {}).get('best_model', 'Unknown')}")
-    print(f"   - Confidence: {predictive_analytics.get('sales_forecast', {}).get('confidence', 0):.2f}")
-    print(f"   - Anomalies Detected: {predictive_analytics.get('anomaly_detection', {}).get('anomaly_count', 0)}")
-    print(f"   - Risk Level: {predictive_analytics.get('risk_assessment', {}).get('risk_level', 'Unknown')}")
-    
-    print("📊 Calculating advanced metrics...")
-    advanced_metrics = analyzer.calculate_advanced_metrics()
-    print(f"   - Inventory Turnover: {advanced_metrics.get('inventory_turnover_rate', 0):.2f}")
-    
-    print("🌱 Calculating environmental impact...")
-    environmental_impact = analyzer.generate_environmental_impact()
-    print(f"   - Carbon Saved: {environmental_impact.get('carbon_footprint_reduction', 0):.0f} kg CO2")
-    
-    print("🏭 Generating market analysis...")
-    market_analysis = analyzer.generate_market_analysis()
-    print(f"   - Market Share: {market_analysis.get('market_share_percentage', 0):.2f}%")
+    # Every analysis is computed before the summary is rendered from the results
+    dashboard_data = analyzer.generate_dashboard_data()
+    render_recycled_summary(dashboard_data)
     
     print("💾 Exporting dashboard data...")
-    dashboard_data = analyzer.export_json_for_dashboard()
+    analyzer.export_json_for_dashboard(dashboard_data=dashboard_data)
+    
+    if profiler:
+        print(f"⏱️ Profile written to {', '.join(profiler.write(profile))}")
     
     print("✅ Recycled Items Analysis Complete!")
     return dashboard_data
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Recycled items sales/purchase analyzer")
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help="record per-stage timings and memory to PREFIX.json and PREFIX.folded (flamegraph)")
+    parser.add_argument('--compact-dtypes', action='store_true',
+                        help="keep ledger frames in categorical/float32 dtypes and report the memory saved")
+    args = parser.parse_args()
+    main(args.profile, args.compact_dtypes)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Append-only row chunks for incremental weigh log analysis.
+Raw and cleaned rows are kept in arrival order as chunks, each with the dates of its
+cleaned rows. Re-folding the dates that new rows touch only reads the chunks holding those
+dates, and saving writes one pickle file per new chunk into a directory next to the state
+file, so a nightly update neither reads nor rewrites the rows of earlier nights. Chunks
+restored from disk are loaded only when a full frame is needed (e.g. for an export).
+"""
+
+import os
+import pickle
+import tempfile
+import uuid
+
+import numpy as np
+import pandas as pd
+
+
+def concat_rows(frames):
+    """Concatenate row frames; categorical columns keep a sorted union of their categories."""
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames)
+    for col in frames[0].select_dtypes('category').columns:
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            df[col] = pd.api.types.union_categoricals([frame[col] for frame in frames], sort_categories=True)
+    return df
+
+
+class RowChunks:
+    """Raw and cleaned rows of an analyzer in arrival order, as chunks with their dates."""
+
+    # Cleaned rows per chunk when a large frame is added at once
+    chunk_rows = 100_000
+
+    def __init__(self, date_col, chunks=None, directory=None):
+        self.date_col = date_col
+        # Each chunk: raw 'rows', cleaned 'records', their 'dates' (an Index) and whether any
+        # is 'undated', its 'file' in directory once saved, and its 'frames' while in memory
+        self.chunks = chunks or []
+        self.directory = directory
+
+    def __len__(self):
+        """Raw rows in every chunk."""
+        return sum(chunk['rows'] for chunk in self.chunks)
+
+    @property
+    def records(self):
+        """Cleaned rows in every chunk."""
+        return sum(chunk['records'] for chunk in self.chunks)
+
+    def append(self, df, df_clean, kept):
+        """Add raw rows df and their cleaned rows; kept masks the raw rows df_clean holds."""
+        if self.chunks and not len(df):
+            return
+        positions = np.flatnonzero(np.asarray(kept))
+        bounds = list(range(0, len(df_clean), self.chunk_rows)) or [0]
+        for i, start in enumerate(bounds):
+            end = bounds[i + 1] if i + 1 < len(bounds) else len(df_clean)
+            # Raw rows run up to the next chunk's first cleaned row
+            raw_start = 0 if i == 0 else positions[start]
+            raw_end = positions[end] if end < len(df_clean) else len(df)
+            clean = df_clean.iloc[start:end]
+            dates = clean[self.date_col]
+            self.chunks.append({
+                'rows': raw_end - raw_start,
+                'records': len(clean),
+                'dates': pd.Index(dates.dropna().unique()),
+                'undated': bool(dates.isna().any()),
+                'file': None,
+                'frames': (df.iloc[raw_start:raw_end], clean)
+            })
+
+    def _frames(self, chunk):
+        if chunk['frames'] is not None:
+            return chunk['frames']
+        with open(os.path.join(self.directory, chunk['file']), 'rb') as f:
+            return pickle.load(f)
+
+    def frames(self):
+        """(raw rows, cleaned rows) of every chunk, concatenated in arrival order."""
+        parts = [self._frames(chunk) for chunk in self.chunks]
+        df, df_clean = concat_rows([raw for raw, _ in parts]), concat_rows([clean for _, clean in parts])
+        # Chunks held in memory become views of the concatenated frames
+        raw_end, clean_end = np.cumsum([len(raw) for raw, _ in parts]), np.cumsum([len(clean) for _, clean in parts])
+        for chunk, raw_stop, clean_stop in zip(self.chunks, raw_end, clean_end):
+            if chunk['frames'] is not None:
+                chunk['frames'] = (df.iloc[raw_stop - chunk['rows']:raw_stop],
+                                   df_clean.iloc[clean_stop - chunk['records']:clean_stop])
+        return df, df_clean
+
+    def rows_on(self, dates):
+        """Cleaned rows dated any of dates (a missing date matches undated rows), in arrival order.
+
+        Only chunks holding one of the dates are read; returns a list of frames.
+        """
+        dates = pd.Index(dates)
+        undated = dates.hasnans
+        parts = []
+        for chunk in self.chunks:
+            if chunk['dates'].isin(dates).any() or (undated and chunk['undated']):
+                clean = self._frames(chunk)[1]
+                parts.append(clean[clean[self.date_col].isin(dates)])
+        return parts
+
+    def save(self, directory):
+        """Write the chunks not yet stored in directory and return their manifest.
+
+        Saving to a new directory writes every chunk; files of chunks that are no
+        longer listed are removed by prune once the manifest is saved.
+        """
+        os.makedirs(directory, exist_ok=True)
+        moved = self.directory is None or os.path.abspath(self.directory) != os.path.abspath(directory)
+        for chunk in self.chunks:
+            if chunk['file'] is None or moved:
+                frames = self._frames(chunk)
+                name = f"{uuid.uuid4().hex}.pkl"
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(frames, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, os.path.join(directory, name))
+                chunk['file'] = name
+        self.directory = directory
+        return [{key: value for key, value in chunk.items() if key != 'frames'} for chunk in self.chunks]
+
+    def prune(self):
+        """Remove chunk files in the directory that no chunk refers to."""
+        listed = {chunk['file'] for chunk in self.chunks}
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl') and name not in listed:
+                os.remove(os.path.join(self.directory, name))
+
+    @classmethod
+    def restore(cls, date_col, manifest, directory):
+        """Chunks listed by a saved manifest; their rows stay on disk until needed."""
+        return cls(date_col, [{**chunk, 'frames': None} for chunk in manifest], directory)
@@ -8,14 +8,56 @@ Updated for correct column structure A-M with Thai Buddhist calendar year 2568.
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import copy
+import os
+import pickle
+import tempfile
 import warnings
+from contextlib import nullcontext
 warnings.filterwarnings('ignore')
 
+from analysis_graph import AnalysisGraph
+from anomaly_detection import StreamingAnomalyDetector
+from compact_dtypes import compact_columns, format_megabytes
+from console_report import render
+from date_index import DateIndex, PeriodCache, period_filtered, period_key
+from json_export import write_json
+from ledger_store import read_weigh_log, storage_format
+from profiling import Profiler, profiled
+from row_chunks import RowChunks, concat_rows
+from workbook_cache import load_weigh_workbook, read_weigh_log_tail
+from workbook_ingest import ingest_workbooks
+from weigh_aggregates import WeighLogAggregates
+from weigh_results import (
+    AnomalyAnalysis, BasicStatistics, CapacityUtilization, ClientPricing, ColumnProfile,
+    ColumnStructure, DailyAnalysis, FleetOptimization, OperationalEfficiency, PricingStrategy,
+    StrategicInsights, TimePattern, TruckAnalysis, WasteManagement, WeighReport
+)
+
 class SimpleThaiTruckAnalyzer:
-    """Simple analyzer class for Thai truck weigh station log data without matplotlib."""
+    """Simple analyzer class for Thai truck weigh station log data without matplotlib.
+    
+    analysis() and analyze() return typed results (see weigh_results) without any I/O.
+    The named analysis methods also render their console section (see console_report)
+    and return the tables/dicts the exports use. Pass progress=None to silence every
+    message, e.g. when embedding the analyzer in a service. Pass a profiling.Profiler
+    to record each stage as a span. Pass compact_dtypes=True to keep cleaned rows in
+    compact dtypes (see compact_rows); memory_usage then holds the before/after bytes.
+    The analysis methods take start/end dates and station/truck/client filters and
+    then run on a period view (see period).
+    """
     
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, progress=print, profiler=None, compact_dtypes=False):
         """Initialize with either file path or DataFrame."""
+        self.progress = progress
+        self.profiler = profiler
+        self.compact_dtypes = compact_dtypes
+        self.memory_usage = {}
+        self.periods = PeriodCache()
+        # Raw and cleaned rows as append-only chunks (see row_chunks), set up in setup_data
+        self.rows = None
+        # Digest of the source rows processed so far (see update_from_workbook)
+        self.source_digest = None
         if df is not None:
             self.df = df
         elif file_path:
@@ -23,20 +65,148 @@ class SimpleThaiTruckAnalyzer:
         else:
             raise ValueError("Either file_path or df must be provided")
         
+        self.graph = self._build_graph()
         self.setup_data()
     
+    def _log(self, message):
+        if self.progress:
+            self.progress(message)
+    
+    @property
+    def df(self):
+        if self._df is None:
+            self._concat_rows()
+        return self._df
+    
+    @df.setter
+    def df(self, df):
+        self._df = df
+    
+    @property
+    def df_clean(self):
+        if self._df_clean is None:
+            self._concat_rows()
+        return self._df_clean
+    
+    @df_clean.setter
+    def df_clean(self, df_clean):
+        self._df_clean = df_clean
+        # Analysis results are memoized per cleaned frame
+        self._data_version = getattr(self, '_data_version', 0) + 1
+    
+    def _concat_rows(self):
+        # Frames dropped by append_rows or not yet loaded from a saved state
+        df, df_clean = self.rows.frames()
+        if self._df is None:
+            self._df = df
+        if self._df_clean is None:
+            self._df_clean = df_clean
+    
+    def invalidate_results(self):
+        """Drop memoized analysis results after mutating df_clean in place."""
+        self._data_version += 1
+    
+    # Analyses whose results are inputs of other analyses
+    analysis_inputs = {
+        'fleet_optimization_analysis': ('truck_analysis',),
+        'operational_efficiency_analysis': ('time_pattern_analysis',),
+        'strategic_business_intelligence': ('truck_analysis',)
+    }
+    
+    def _build_graph(self):
+        """Register each analysis as a graph node, computed once per df_clean."""
+        graph = AnalysisGraph(lambda: self._data_version, self.profiler, lambda: len(self.df_clean))
+        for name in WeighReport.analyses():
+            graph.add_node(name, getattr(self, f'_compute_{name}'), self.analysis_inputs.get(name, ()))
+        return graph
+    
+    @period_filtered
+    def analysis(self, name):
+        """Typed result of one analysis (a WeighReport field name); no I/O."""
+        return self.graph.evaluate(name)
+    
+    @period_filtered
+    @profiled(rows='df_clean')
+    def analyze(self):
+        """Every analysis as a WeighReport; no I/O."""
+        return WeighReport(**{name: self.analysis(name) for name in WeighReport.analyses()})
+    
+    def _section(self, name):
+        """Typed result of one analysis, with its console section rendered to progress."""
+        result = self.analysis(name)
+        if self.progress:
+            render(result, self.progress)
+        return result
+    
+    def reuse_report(self):
+        """Report how often each memoized analysis was computed and reused."""
+        report = self.graph.reuse_report()
+        avoided = sum(counts['hits'] for counts in report.values())
+        self._log(f"\n♻️ Memoized analyses: {avoided} recomputations avoided")
+        for name, counts in report.items():
+            self._log(f"  {name}: computed {counts['evaluations']}x, reused {counts['hits']}x")
+        return report
+    
+    # period() filters: keyword -> thai_columns key or parsed column it pins
+    period_filters = {'station': 'station', 'truck': 'license_plate', 'client': 'client'}
+    
+    def period(self, start=None, end=None, **filters):
+        """Read-only analyzer view over the cleaned rows dated start..end (inclusive).
+        
+        station, truck and client pin one value each. Rows are found by binary search in
+        a date index over df_clean (see date_index), so a query costs O(log n + k) for k
+        rows; indexes and recent views are cached per data version. The view rebuilds
+        its partial aggregates and anomaly detectors from its own rows; its column
+        structure still describes the whole source.
+        """
+        unknown = set(filters) - set(self.period_filters)
+        if unknown:
+            raise ValueError(f"Unknown period filters: {', '.join(sorted(unknown))}")
+        key = period_key(start, end, filters)
+        return self.periods.view(self._data_version, key, lambda: self._build_period(*key))
+    
+    def _build_period(self, start, end, filters):
+        columns = []
+        for name, _ in filters:
+            column = self.thai_columns.get(self.period_filters[name], self.period_filters[name])
+            if column not in self.df_clean.columns:
+                raise ValueError(f"Cannot filter by {name}: no '{column}' column in the weigh log")
+            columns.append(column)
+        index = self.periods.index(self._data_version, tuple(columns), lambda: DateIndex(
+            self.df_clean[self.thai_columns['date']], [self.df_clean[column] for column in columns]
+        ))
+        
+        view = copy.copy(self)
+        view.periods = PeriodCache()
+        view.memory_usage = {}
+        view.df_clean = index.take(self.df_clean, start, end, [value for _, value in filters])
+        view.graph = view._build_graph()
+        view.aggregates = WeighLogAggregates.from_frame(view.df_clean, self.thai_columns)
+        view.build_anomaly_detectors()
+        return view
+    
+    @profiled()
     def load_data(self, file_path):
-        """Load data from Excel file."""
+        """Load data from an Excel workbook or a Parquet/Arrow file (see ledger_store).
+        
+        Workbooks are read through a columnar sidecar cache (see workbook_cache), and
+        their "รวม" summary rows are dropped while reading.
+        """
         try:
             # Try to read the file
-            df = pd.read_excel(file_path)
-            print(f"Data loaded successfully from {file_path}")
-            print(f"Columns detected: {len(df.columns)} (A-{chr(65 + len(df.columns) - 1)})")
+            if storage_format(file_path):
+                df = read_weigh_log(file_path)
+                self._log(f"Data loaded successfully from {file_path}")
+            else:
+                df, cached = load_weigh_workbook(file_path)
+                self._log(f"Data loaded successfully from {file_path}{' (columnar cache)' if cached else ''}")
+            self._log(f"Columns detected: {len(df.columns)} (A-{chr(65 + len(df.columns) - 1)})")
             return df
         except Exception as e:
-            print(f"Error loading file: {e}")
+            self._log(f"Error loading file: {e}")
             return None
     
+    @profiled(rows='df')
     def setup_data(self):
         """Setup and clean the data."""
         # Detect Thai columns for the 13-column structure (A-M) - Truck Weigh Station
@@ -56,24 +226,42 @@ class SimpleThaiTruckAnalyzer:
             'log_count': [col for col in self.df.columns if 'จำนวนรายการ' in str(col) or 'Log_Count' in str(col)][0]
         }
         
+        self.df_clean = self.clean_rows(self.df)
+        self.rows = RowChunks(self.thai_columns['date'])
+        self.rows.append(self.df, self.df_clean, self._logged_rows(self.df))
+        
+        # Daily, truck, hourly, client and pricing statistics are derived from these partials
+        self.aggregates = WeighLogAggregates.from_frame(self.df_clean, self.thai_columns)
+        self.build_anomaly_detectors()
+        
+        self._log(f"Data cleaned: {len(self.df_clean)} records")
+        self._log(f"Column structure: A-M ({len(self.thai_columns)} columns)")
+    
+    def _logged_rows(self, df):
+        """Mask of the weigh records among raw rows, i.e. all but the daily "รวม" total rows."""
+        return df[self.thai_columns['log_number']] != 'รวม'
+    
+    @profiled(rows=0)
+    def clean_rows(self, df):
+        """Drop daily total rows from raw A-M rows and convert/parse them into typed columns."""
         # Remove total rows and clean data
-        self.df_clean = self.df[self.df[self.thai_columns['log_number']] != 'รวม'].copy()
+        df_clean = df[self._logged_rows(df)].copy()
         
         # Convert date column (handle both 2568 and 2025 formats)
         date_col = self.thai_columns['date']
         try:
             # Try Thai Buddhist calendar format first (2568)
-            self.df_clean[date_col] = pd.to_datetime(
-                self.df_clean[date_col], 
+            df_clean[date_col] = pd.to_datetime(
+                df_clean[date_col], 
                 format='%d %b %y', 
                 errors='coerce'
             )
             # If dates are in 2025, convert to 2568 for display
-            if self.df_clean[date_col].dt.year.iloc[0] == 2025:
-                print("Converting Western calendar dates to Thai Buddhist calendar (2568)")
-                self.df_clean[date_col] = self.df_clean[date_col].dt.year + 543
+            if df_clean[date_col].dt.year.iloc[0] == 2025:
+                self._log("Converting Western calendar dates to Thai Buddhist calendar (2568)")
+                df_clean[date_col] = df_clean[date_col].dt.year + 543
         except:
-            print("Date conversion failed, keeping original format")
+            self._log("Date conversion failed, keeping original format")
         
         # Convert numeric columns
         numeric_cols = [
@@ -87,329 +275,456 @@ class SimpleThaiTruckAnalyzer:
         ]
         
         # Extract redemption value from Column L (ข้อมูลเพิ่มเติม) which contains "CLIENT-X - WASTE_TYPE - VALUE THB"
-        if self.thai_columns['additional_data'] in self.df_clean.columns:
+        if self.thai_columns['additional_data'] in df_clean.columns:
             # Extract the numeric value from the end of the additional_data string
-            extracted_values = self.df_clean[self.thai_columns['additional_data']].str.extract(r'(\d+(?:,\d+)*\.?\d*)\s*THB')
+            extracted_values = df_clean[self.thai_columns['additional_data']].str.extract(r'(\d+(?:,\d+)*\.?\d*)\s*THB')
             # Replace commas in numbers like "23,738.68" and convert to float
-            self.df_clean['redemption_value'] = extracted_values[0].str.replace(',', '').astype(float)
+            df_clean['redemption_value'] = extracted_values[0].str.replace(',', '').astype(float)
         
         for col in numeric_cols:
-            if col in self.df_clean.columns:
-                self.df_clean[col] = pd.to_numeric(self.df_clean[col], errors='coerce')
+            if col in df_clean.columns:
+                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
         
-        print(f"Data cleaned: {len(self.df_clean)} records")
-        print(f"Column structure: A-M ({len(self.thai_columns)} columns)")
+        # Parse Column L and the HH.MM.SS times once; analyses read these typed columns
+        self.parse_additional_data(df_clean)
+        self.parse_times(df_clean)
+        
+        if self.compact_dtypes:
+            self.compact_rows(df_clean)
+        return df_clean
+    
+    # Derived columns added by the parse stage; excluded from the Clean_Data export
+    parsed_columns = ['client', 'waste_type', 'l_parts', 'client_tagged',
+                      'time_in_seconds', 'time_out_seconds', 'time_in_hour', 'processing_minutes']
+    
+    @profiled(rows=0)
+    def parse_additional_data(self, df_clean):
+        """Split Column L ("CLIENT - WASTE_TYPE - ... - VALUE THB") into typed columns."""
+        text = df_clean[self.thai_columns['additional_data']].astype(str)
+        parts = text.str.split(' - ')
+        
+        df_clean['l_parts'] = parts.str.len().astype('int32')
+        df_clean['client'] = parts.str[0].astype('category')
+        df_clean['waste_type'] = parts.str[1].astype('category')
+        df_clean['client_tagged'] = text.str.contains('CLIENT-', regex=False)
+    
+    @profiled(rows=0)
+    def parse_times(self, df_clean):
+        """Convert HH.MM.SS time_in/time_out to seconds-of-day, with day-wrap durations."""
+        seconds = {}
+        for key in ['time_in', 'time_out']:
+            parts = df_clean[self.thai_columns[key]].astype(str).str.extract(r'^\s*(\d+)\.(\d+)(?:\.(\d+))?').astype(float)
+            hours, minutes, secs = parts[0], parts[1], parts[2].fillna(0)
+            # Logged times may run past 24.00.00 when a weigh crosses midnight
+            seconds[key] = (hours * 3600 + minutes * 60 + secs) % (24 * 3600)
+            df_clean[f'{key}_seconds'] = seconds[key]
+            if key == 'time_in':
+                # Only well-formed HH.MM.SS clock times get an hour bucket
+                valid = parts[2].notna() & (hours < 24) & (minutes < 60) & (parts[2] < 60)
+                df_clean['time_in_hour'] = hours.where(valid)
+                # Exported with the cleaned rows, as an integer column when every row is timed
+                hour = df_clean['time_in_hour']
+                df_clean['hour'] = hour.astype('Int64') if hour.isna().any() else hour.astype('int32')
+        
+        # Processing time in whole minutes; a time_out earlier than time_in wraps past midnight
+        in_minutes = seconds['time_in'] // 60
+        out_minutes = seconds['time_out'] // 60
+        out_minutes = out_minutes.where(out_minutes >= in_minutes, out_minutes + 24 * 60)
+        df_clean['processing_minutes'] = out_minutes - in_minutes
+    
+    @profiled(rows=0)
+    def compact_rows(self, df_clean):
+        """Store cleaned rows in compact dtypes, in place, and log the memory saved.
+        
+        Plates, log numbers and raw clock times become categorical, weights and price
+        float32, parsed times int32 seconds and counts nullable integers. Redemption
+        values stay float64, and the partial aggregates sum in float64, so results
+        match the default dtypes to float32 precision (statistics rounded to 2
+        decimals may differ in their last digit).
+        """
+        cols = self.thai_columns
+        before, after = compact_columns(
+            df_clean,
+            categories=[cols['license_plate'], cols['log_number'], cols['time_in'], cols['time_out']],
+            float32=[cols[key] for key in ['total_weight', 'max_redemption', 'empty_weight', 'garbage_weight',
+                                           'redeemable_weight', 'price_per_ton']],
+            integers={cols['log_count']: 'Int32', 'time_in_seconds': 'Int32',
+                      'time_out_seconds': 'Int32', 'time_in_hour': 'Int8', 'hour': 'Int8', 'processing_minutes': 'Int32'}
+        )
+        usage = self.memory_usage.setdefault('df_clean', {'before_bytes': 0, 'after_bytes': 0})
+        usage['before_bytes'] += before
+        usage['after_bytes'] += after
+        self._log(f"Compact dtypes: {len(df_clean)} cleaned rows, {format_megabytes(before, after)}")
+    
+    # Series watched for unusual weigh records, as thai_columns keys
+    anomaly_series = ['garbage_weight', 'price_per_ton']
+    
+    @profiled(rows='df_clean')
+    def build_anomaly_detectors(self):
+        """Score every cleaned record and keep one streaming detector per watched series."""
+        self.anomaly_detectors = {}
+        self.anomaly_events = {}
+        for key in self.anomaly_series:
+            detector = StreamingAnomalyDetector()
+            self.anomaly_events[key] = detector.backfill(self.df_clean[self.thai_columns[key]].to_numpy(dtype=float))
+            self.anomaly_detectors[key] = detector
+    
+    # Bumped whenever the pickled incremental state layout changes
+    state_version = 4
+    
+    @profiled(rows=0)
+    def append_rows(self, new_rows):
+        """Fold newly logged raw A-M rows into the analysis (append-only).
+        
+        Only the new rows are cleaned and parsed, and only partial aggregates for the
+        dates they touch are rebuilt, from the row chunks holding those dates, so exports
+        match a full recompute of all rows. The full frames are concatenated again only
+        when next used.
+        """
+        if new_rows.empty:
+            return
+        
+        start = len(self.rows)
+        new_rows = new_rows.set_axis(pd.RangeIndex(start, start + len(new_rows)))
+        new_clean = self.clean_rows(new_rows)
+        
+        # Rows appended for a date already seen are re-folded together with that date's earlier rows
+        earlier = self.rows.rows_on(new_clean[self.thai_columns['date']].unique())
+        self.aggregates = self.aggregates.merge(
+            WeighLogAggregates.from_frame(concat_rows([*earlier, new_clean]), self.thai_columns)
+        )
+        self.rows.append(new_rows, new_clean, self._logged_rows(new_rows))
+        self._df = self._df_clean = None
+        self.invalidate_results()
+        
+        # Each new record is scored against everything logged before it
+        for key, detector in self.anomaly_detectors.items():
+            for value in new_clean[self.thai_columns[key]].to_numpy(dtype=float):
+                event = detector.update(value)
+                if event is not None:
+                    self.anomaly_events[key].append(event)
+        self._log(f"Appended {len(new_clean)} records ({self.rows.records} total)")
+    
+    @staticmethod
+    def rows_directory(state_path):
+        """Directory of the row chunk files of an incremental state."""
+        return os.fspath(state_path) + '.rows'
+    
+    @profiled(rows='rows')
+    def save_incremental_state(self, state_path):
+        """Persist partial aggregates and detectors, appending new row chunks, for the next run.
+        
+        The state file holds the partials, detectors and a manifest of row chunks;
+        rows go to files in rows_directory(state_path), and only chunks added since
+        the state was last saved there are written.
+        """
+        manifest = self.rows.save(self.rows_directory(state_path))
+        state = {
+            'version': self.state_version,
+            'thai_columns': self.thai_columns,
+            'aggregates': self.aggregates,
+            'anomaly_detectors': self.anomaly_detectors,
+            'anomaly_events': self.anomaly_events,
+            'compact_dtypes': self.compact_dtypes,
+            'source_digest': self.source_digest,
+            'rows': manifest
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(state_path)))
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, state_path)
+        self.rows.prune()
+        self._log(f"Incremental state saved to {state_path}")
+    
+    @classmethod
+    def from_incremental_state(cls, state_path, progress=print, profiler=None):
+        """Restore an analyzer saved by save_incremental_state without re-cleaning any rows.
+        
+        Rows stay on disk until df or df_clean is first used.
+        """
+        with open(state_path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != cls.state_version:
+            raise ValueError(f"Incompatible incremental state version in {state_path}")
+        
+        analyzer = cls.__new__(cls)
+        analyzer.progress = progress
+        analyzer.profiler = profiler
+        analyzer.compact_dtypes = state.get('compact_dtypes', False)
+        analyzer.memory_usage = {}
+        analyzer.periods = PeriodCache()
+        analyzer.graph = analyzer._build_graph()
+        analyzer.thai_columns = state['thai_columns']
+        analyzer.rows = RowChunks.restore(analyzer.thai_columns['date'], state['rows'],
+                                          cls.rows_directory(state_path))
+        analyzer.source_digest = state['source_digest']
+        analyzer.df = analyzer.df_clean = None
+        analyzer.aggregates = state['aggregates']
+        analyzer.anomaly_detectors = state['anomaly_detectors']
+        analyzer.anomaly_events = state['anomaly_events']
+        return analyzer
+    
+    @classmethod
+    def from_workbooks(cls, source, workers=None, executor='process', progress=print, profiler=None,
+                       compact_dtypes=False):
+        """Analyze every workbook in a directory or glob as one data set.
+        
+        Workbooks are parsed concurrently (see workbook_ingest) and their records are
+        tagged with categorical 'station' and 'source_file' columns.
+        """
+        if progress:
+            progress(f"Ingesting weigh logs from {source}...")
+        with profiler.span('ingest_workbooks') if profiler else nullcontext():
+            df, timings = ingest_workbooks(source, workers=workers, executor=executor, progress=progress)
+        analyzer = cls(df=df, progress=progress, profiler=profiler, compact_dtypes=compact_dtypes)
+        analyzer.ingest_timings = timings
+        return analyzer
+    
+    @classmethod
+    def update_from_workbook(cls, file_path, state_path, progress=print, profiler=None, compact_dtypes=False):
+        """Nightly entry point: fold rows appended to the workbook since the saved state.
+        
+        Only rows after those already processed are read into a frame; the earlier rows
+        are checked against the digest saved with the state (see read_weigh_log_tail).
+        Falls back to a full analysis when there is no state yet or when rows that were
+        already processed have changed in the workbook. compact_dtypes applies to full
+        analyses; a restored state keeps the dtypes it was saved with.
+        """
+        if not os.path.exists(state_path):
+            if progress:
+                progress(f"No incremental state at {state_path}, running full analysis")
+            analyzer = None
+        else:
+            analyzer = cls.from_incremental_state(state_path, progress, profiler)
+            known = len(analyzer.rows)
+            with profiler.span('read_weigh_log_tail') if profiler else nullcontext():
+                new_rows, prefix_digest, digest = read_weigh_log_tail(file_path, known)
+            if analyzer.source_digest is not None and prefix_digest == analyzer.source_digest:
+                analyzer._log(f"Incremental update: {len(new_rows)} new rows since last run")
+                analyzer.append_rows(new_rows)
+            else:
+                analyzer._log("Previously processed rows changed, running full analysis")
+                analyzer = None
+        
+        if analyzer is None:
+            with profiler.span('read_weigh_log_tail') if profiler else nullcontext():
+                df, _, digest = read_weigh_log_tail(file_path, 0)
+            analyzer = cls(df=df, progress=progress, profiler=profiler, compact_dtypes=compact_dtypes)
+        analyzer.source_digest = digest
+        analyzer.save_incremental_state(state_path)
+        return analyzer
     
+    @period_filtered
     def basic_statistics(self):
         """Display basic statistics about the data."""
-        print("=" * 60)
-        print("BASIC STATISTICS")
-        print("=" * 60)
-        
-        print(f"Total Records: {len(self.df_clean)}")
-        print(f"Date Range: {self.df_clean[self.thai_columns['date']].min()} to {self.df_clean[self.thai_columns['date']].max()}")
-        print(f"Unique Trucks: {self.df_clean[self.thai_columns['license_plate']].nunique()}")
-        print(f"License Plates: {', '.join(self.df_clean[self.thai_columns['license_plate']].unique()[:10])}...")
-        
-        print(f"\nWeight Statistics:")
-        print(f"  Average Total Weight: {self.df_clean[self.thai_columns['total_weight']].mean():.2f} kg")
-        print(f"  Average Garbage Weight: {self.df_clean[self.thai_columns['garbage_weight']].mean():.2f} kg")
-        print(f"  Average Redeemable Weight: {self.df_clean[self.thai_columns['redeemable_weight']].mean():.2f} kg")
-        
-        print(f"\nRedemption Statistics:")
-        if 'redemption_value' in self.df_clean.columns:
-            total_value = self.df_clean['redemption_value'].sum()
-            avg_value = self.df_clean['redemption_value'].mean()
-            print(f"  Total Redemption Value (Column L): {total_value:,.2f} THB")
-            print(f"  Average Redemption per Record: {avg_value:,.2f} THB")
+        return self._section('basic_statistics')
+    
+    def _compute_basic_statistics(self):
+        df, cols = self.df_clean, self.thai_columns
+        
+        if 'redemption_value' in df.columns:
+            redemption = df['redemption_value']
         else:
             # Fallback calculation if Column L parsing failed
-            total_value = (self.df_clean[self.thai_columns['redeemable_weight']] * self.df_clean[self.thai_columns['price_per_ton']] / 1000).sum()
-            avg_value = (self.df_clean[self.thai_columns['redeemable_weight']] * self.df_clean[self.thai_columns['price_per_ton']] / 1000).mean()
-            print(f"  Total Redemption Value (Calculated): {total_value:,.2f} THB")
-            print(f"  Average Redemption per Record: {avg_value:,.2f} THB")
-        print(f"  Average Price per Ton: {self.df_clean[self.thai_columns['price_per_ton']].mean():,.2f} THB")
-        
-        print(f"\nClient Analysis:")
-        if self.thai_columns['additional_data'] in self.df_clean.columns:
-            clients = self.df_clean[self.thai_columns['additional_data']].str.split(' - ').str[0].nunique()
-            waste_types = self.df_clean[self.thai_columns['additional_data']].str.split(' - ').str[1].nunique()
-            print(f"  Unique Clients: {clients}")
-            print(f"  Waste Types: {waste_types}")
+            redemption = df[cols['redeemable_weight']] * df[cols['price_per_ton']] / 1000
+        has_clients = cols['additional_data'] in df.columns
+        
+        return BasicStatistics(
+            total_records=len(df),
+            date_min=df[cols['date']].min(),
+            date_max=df[cols['date']].max(),
+            unique_trucks=df[cols['license_plate']].nunique(),
+            license_plates=list(df[cols['license_plate']].unique()[:10]),
+            avg_total_weight=df[cols['total_weight']].mean(),
+            avg_garbage_weight=df[cols['garbage_weight']].mean(),
+            avg_redeemable_weight=df[cols['redeemable_weight']].mean(),
+            total_redemption_value=redemption.sum(),
+            avg_redemption_value=redemption.mean(),
+            redemption_from_column_l='redemption_value' in df.columns,
+            avg_price_per_ton=df[cols['price_per_ton']].mean(),
+            unique_clients=df['client'].nunique() if has_clients else None,
+            waste_types=df['waste_type'].nunique() if has_clients else None
+        )
     
+    @period_filtered
     def daily_analysis(self):
         """Analyze daily patterns."""
-        print("\n" + "=" * 60)
-        print("DAILY ANALYSIS")
-        print("=" * 60)
-        
-        daily_stats = self.df_clean.groupby(self.thai_columns['date']).agg({
-            self.thai_columns['total_weight']: ['count', 'sum', 'mean'],
-            self.thai_columns['garbage_weight']: 'sum',
-            self.thai_columns['redeemable_weight']: 'sum',
-            self.thai_columns['price_per_ton']: 'mean',
-            self.thai_columns['log_count']: 'sum'
-        }).round(2)
-        
-        daily_stats.columns = ['Records', 'Total_Weight_Sum', 'Avg_Weight', 'Total_Garbage', 'Total_Redeemable', 'Avg_Price_Per_Ton', 'Total_Logs']
-        
-        print("Daily Summary (first 10 days):")
-        print(daily_stats.head(10))
-        
-        return daily_stats
+        return self._section('daily_analysis').daily_stats
     
+    def _compute_daily_analysis(self):
+        return DailyAnalysis(self.aggregates.daily_stats())
+    
+    @period_filtered
     def truck_analysis(self):
         """Analyze truck performance."""
-        print("\n" + "=" * 60)
-        print("TRUCK ANALYSIS")
-        print("=" * 60)
-        
-        truck_stats = self.df_clean.groupby(self.thai_columns['license_plate']).agg({
-            self.thai_columns['total_weight']: ['count', 'sum', 'mean'],
-            self.thai_columns['garbage_weight']: 'sum',
-            self.thai_columns['redeemable_weight']: 'sum',
-            self.thai_columns['price_per_ton']: 'mean',
-            self.thai_columns['log_count']: 'sum'
-        }).round(2)
-        
-        truck_stats.columns = ['Records', 'Total_Weight_Sum', 'Avg_Weight', 'Total_Garbage', 'Total_Redeemable', 'Avg_Price_Per_Ton', 'Total_Logs']
-        
-        # Add revenue calculation if redemption_value exists
-        if 'redemption_value' in self.df_clean.columns:
-            revenue_by_truck = self.df_clean.groupby(self.thai_columns['license_plate'])['redemption_value'].sum().round(2)
-            truck_stats['Total_Revenue'] = revenue_by_truck
-        else:
-            # Calculate revenue from redeemable weight and price per ton
-            truck_stats['Total_Revenue'] = (truck_stats['Total_Redeemable'] * truck_stats['Avg_Price_Per_Ton'] / 1000).round(2)
-        
-        print("Truck Performance Summary:")
-        print(truck_stats.head(15))  # Show top 15 trucks
-        
-        return truck_stats
+        return self._section('truck_analysis').truck_stats
+    
+    def _compute_truck_analysis(self):
+        # Total_Revenue falls back to redeemable weight x price when Column L was not parsed
+        return TruckAnalysis(self.aggregates.truck_stats())
     
+    @period_filtered
     def time_pattern_analysis(self):
         """Analyze time patterns."""
-        print("\n" + "=" * 60)
-        print("TIME PATTERN ANALYSIS")
-        print("=" * 60)
-        
-        # Extract hour from time_in
-        self.df_clean['hour'] = pd.to_datetime(
-            self.df_clean[self.thai_columns['time_in']], 
-            format='%H.%M.%S', 
-            errors='coerce'
-        ).dt.hour
-        
-        hour_distribution = self.df_clean['hour'].value_counts().sort_index()
-        
-        print("Operations by Hour of Day:")
-        for hour, count in hour_distribution.items():
-            print(f"  {hour:02d}:00 - {hour:02d}:59: {count} operations")
-        
-        return hour_distribution
+        return self._section('time_pattern_analysis').hour_distribution
+    
+    def _compute_time_pattern_analysis(self):
+        return TimePattern(self.aggregates.hour_distribution())
     
+    @period_filtered
     def fleet_optimization_analysis(self):
         """Analyze fleet optimization opportunities."""
-        print("\n" + "=" * 60)
-        print("FLEET OPTIMIZATION ANALYSIS")
-        print("=" * 60)
-        
-        # Fleet performance metrics
-        fleet_performance = self.truck_analysis()
-        
-        # Top performers
-        top_revenue = fleet_performance.loc[fleet_performance['Total_Revenue'].idxmax()]
-        top_operations = fleet_performance.loc[fleet_performance['Records'].idxmax()]
-        top_weight = fleet_performance.loc[fleet_performance['Total_Weight_Sum'].idxmax()]
-        
-        print("🏆 TOP PERFORMERS:")
-        print(f"  Highest Revenue: {top_revenue.name} - {top_revenue['Total_Revenue']:,.0f} THB")
-        print(f"  Most Operations: {top_operations.name} - {top_operations['Records']} operations")
-        print(f"  Highest Weight: {top_weight.name} - {top_weight['Total_Weight_Sum']:,.0f} kg")
+        return self._section('fleet_optimization_analysis').fleet_performance
+    
+    def _compute_fleet_optimization_analysis(self, trucks):
+        fleet_performance = trucks.truck_stats
+        revenue = fleet_performance['Total_Revenue']
         
         # Performance tiers
-        elite_threshold = fleet_performance['Total_Revenue'].quantile(0.8)
-        high_threshold = fleet_performance['Total_Revenue'].quantile(0.6)
-        good_threshold = fleet_performance['Total_Revenue'].quantile(0.4)
-        
-        elite_trucks = fleet_performance[fleet_performance['Total_Revenue'] > elite_threshold]
-        high_trucks = fleet_performance[(fleet_performance['Total_Revenue'] > high_threshold) & 
-                                      (fleet_performance['Total_Revenue'] <= elite_threshold)]
-        good_trucks = fleet_performance[(fleet_performance['Total_Revenue'] > good_threshold) & 
-                                      (fleet_performance['Total_Revenue'] <= high_threshold)]
-        needs_attention = fleet_performance[fleet_performance['Total_Revenue'] <= good_threshold]
-        
-        print(f"\n📊 PERFORMANCE TIERS:")
-        print(f"  🏆 Elite Trucks (>80th percentile): {len(elite_trucks)} trucks")
-        print(f"  ⭐ High Performers (60-80th percentile): {len(high_trucks)} trucks")
-        print(f"  📈 Good Performers (40-60th percentile): {len(good_trucks)} trucks")
-        print(f"  ⚠️ Needs Attention (<40th percentile): {len(needs_attention)} trucks")
-        
-        # Route optimization insights
-        print(f"\n🛣️ ROUTE OPTIMIZATION INSIGHTS:")
-        print(f"  Top route to replicate: {top_operations.name} ({top_operations['Records']} operations)")
-        print(f"  Most efficient weight handling: {top_weight.name} ({top_weight['Avg_Weight']:,.0f} kg avg)")
-        print(f"  Best revenue per operation: {top_revenue.name} ({top_revenue['Total_Revenue']/top_revenue['Records']:,.0f} THB/op)")
-        
-        return fleet_performance
-
+        elite_threshold = revenue.quantile(0.8)
+        high_threshold = revenue.quantile(0.6)
+        good_threshold = revenue.quantile(0.4)
+        
+        return FleetOptimization(
+            fleet_performance=fleet_performance,
+            top_revenue=fleet_performance.loc[revenue.idxmax()],
+            top_operations=fleet_performance.loc[fleet_performance['Records'].idxmax()],
+            top_weight=fleet_performance.loc[fleet_performance['Total_Weight_Sum'].idxmax()],
+            tiers={
+                'elite': int((revenue > elite_threshold).sum()),
+                'high': int(((revenue > high_threshold) & (revenue <= elite_threshold)).sum()),
+                'good': int(((revenue > good_threshold) & (revenue <= high_threshold)).sum()),
+                'needs_attention': int((revenue <= good_threshold).sum())
+            }
+        )
+    
+    @period_filtered
     def capacity_utilization_analysis(self):
         """Analyze weight capacity utilization across the fleet."""
-        print("\n" + "=" * 60)
-        print("WEIGHT CAPACITY UTILIZATION ANALYSIS")
-        print("=" * 60)
-        
-        # Capacity analysis
-        max_capacity = 15  # tons
-        total_weight_col = self.thai_columns['total_weight']
-        
-        if total_weight_col in self.df_clean.columns:
-            # Calculate capacity metrics
-            avg_weight = self.df_clean[total_weight_col].mean()
-            max_capacity_hits = (self.df_clean[total_weight_col] >= max_capacity).sum()
-            underutilized_count = (self.df_clean[total_weight_col] < (max_capacity * 0.8)).sum()
-            capacity_utilization = (avg_weight / max_capacity) * 100
-            
-            print(f"⚖️ CAPACITY METRICS:")
-            print(f"  Average Total Weight: {avg_weight:.1f} tons")
-            print(f"  Max Capacity Hits (15 tons): {max_capacity_hits} operations")
-            print(f"  Capacity Utilization: {capacity_utilization:.1f}%")
-            print(f"  Underutilized Operations (<12 tons): {underutilized_count}")
-            
-            # Capacity by truck
-            capacity_by_truck = self.df_clean.groupby(self.thai_columns['license_plate'])[total_weight_col].agg([
-                'count', 'mean', 'max', 'min'
-            ]).round(2)
-            capacity_by_truck.columns = ['Operations', 'Avg_Weight', 'Max_Weight', 'Min_Weight']
-            capacity_by_truck['Capacity_Utilization_%'] = (capacity_by_truck['Avg_Weight'] / max_capacity * 100).round(1)
-            
-            print(f"\n🚛 CAPACITY BY TRUCK:")
-            print(capacity_by_truck.sort_values('Capacity_Utilization_%', ascending=False).head(10))
-            
-            # Optimization recommendations
-            print(f"\n💡 CAPACITY OPTIMIZATION RECOMMENDATIONS:")
-            print(f"  • Standardize truck sizes for optimal {max_capacity}-ton capacity utilization")
-            print(f"  • Optimize routes to maximize weight per trip (current avg: {avg_weight:.1f} tons)")
-            print(f"  • Focus on {underutilized_count} underutilized operations for improvement")
-            print(f"  • Balance load distribution across {len(capacity_by_truck)} trucks")
-            
-            return capacity_by_truck
-        else:
-            print("Total weight column not found")
-            return pd.DataFrame()
-
+        return self._section('capacity_utilization_analysis').capacity_by_truck
+    
+    def _compute_capacity_utilization_analysis(self):
+        max_capacity = self.aggregates.max_capacity
+        if self.thai_columns['total_weight'] not in self.df_clean.columns:
+            return CapacityUtilization(pd.DataFrame(), max_capacity)
+        
+        capacity = self.aggregates.capacity_summary()
+        return CapacityUtilization(
+            capacity_by_truck=self.aggregates.capacity_by_truck(),
+            max_capacity=max_capacity,
+            average_weight=capacity['average_weight'],
+            max_capacity_hits=capacity['max_capacity_hits'],
+            underutilized=capacity['underutilized']
+        )
+    
+    @period_filtered
     def pricing_strategy_analysis(self):
         """Analyze pricing strategy and revenue optimization."""
-        print("\n" + "=" * 60)
-        print("PRICING STRATEGY ANALYSIS")
-        print("=" * 60)
-        
-        price_col = self.thai_columns['price_per_ton']
-        if price_col in self.df_clean.columns:
-            # Pricing analysis
-            avg_price = self.df_clean[price_col].mean()
-            price_range = self.df_clean[price_col].max() - self.df_clean[price_col].min()
-            price_std = self.df_clean[price_col].std()
-            
-            print(f"💰 PRICING INSIGHTS:")
-            print(f"  Average Price per Ton: {avg_price:,.0f} THB")
-            print(f"  Price Range: {price_range:,.0f} THB")
-            print(f"  Price Standard Deviation: {price_std:,.0f} THB")
-            
-            # Price distribution
-            price_quartiles = self.df_clean[price_col].quantile([0.25, 0.5, 0.75])
-            print(f"  Price Quartiles: Q1={price_quartiles[0.25]:,.0f}, Q2={price_quartiles[0.5]:,.0f}, Q3={price_quartiles[0.75]:,.0f} THB")
-            
-            # Pricing by client (if available)
-            if 'redemption_value' in self.df_clean.columns:
-                revenue_by_price = self.df_clean.groupby(price_col)['redemption_value'].agg(['count', 'sum']).round(2)
-                revenue_by_price.columns = ['Operations', 'Total_Revenue']
-                revenue_by_price['Avg_Revenue_per_Op'] = (revenue_by_price['Total_Revenue'] / revenue_by_price['Operations']).round(2)
-                
-                print(f"\n📊 REVENUE BY PRICE TIER:")
-                print(revenue_by_price.sort_index())
-            
-            # Optimization recommendations
-            print(f"\n💡 PRICING OPTIMIZATION RECOMMENDATIONS:")
-            if price_std > avg_price * 0.1:  # If standard deviation > 10% of average
-                print(f"  • Consider standardizing pricing (current variation: {price_std/avg_price*100:.1f}%)")
-            else:
-                print(f"  • Pricing is relatively consistent (variation: {price_std/avg_price*100:.1f}%)")
-            
-            print(f"  • Focus on high-value operations above {price_quartiles[0.75]:,.0f} THB/ton")
-            print(f"  • Analyze low-price operations below {price_quartiles[0.25]:,.0f} THB/ton for improvement")
-            
-            return revenue_by_price if 'redemption_value' in self.df_clean.columns else pd.DataFrame()
-        else:
-            print("Price per ton column not found")
-            return pd.DataFrame()
-
+        result = self._section('pricing_strategy_analysis')
+        return result.revenue_by_price if result.revenue_by_price is not None else pd.DataFrame()
+    
+    def _compute_pricing_strategy_analysis(self):
+        if self.thai_columns['price_per_ton'] not in self.df_clean.columns:
+            return PricingStrategy(None)
+        
+        # Revenue by price tier needs the Column L redemption values
+        revenue_by_price = self.aggregates.revenue_by_price() if 'redemption_value' in self.df_clean.columns else None
+        return PricingStrategy(self.aggregates.price_summary(), revenue_by_price)
+    
+    @period_filtered
+    def anomaly_analysis(self):
+        """Report weigh records that stand out from the records logged before them."""
+        return self._section('anomaly_analysis').series
+    
+    def _compute_anomaly_analysis(self):
+        series, bounds = {}, {}
+        for key in self.anomaly_series:
+            col = self.thai_columns[key]
+            events = self.anomaly_events[key]
+            rows = self.df_clean.iloc[[event['index'] for event in events]]
+            dates = rows[self.thai_columns['date']].dt.strftime('%Y-%m-%d')
+            lower_bound, upper_bound = self.anomaly_detectors[key].bounds()
+        
+            anomalies = []
+            for event, date, log_number, plate in zip(events, dates, rows[self.thai_columns['log_number']].tolist(), rows[self.thai_columns['license_plate']].tolist()):
+                anomalies.append({
+                    'date': date if isinstance(date, str) else None,
+                    'logNumber': log_number,
+                    'licensePlate': plate,
+                    'value': round(event['value'], 2),
+                    'expectedRange': [round(bound, 2) for bound in event['expected_range']],
+                    'robustRange': [round(bound, 2) for bound in event['robust_range']],
+                    'severity': event['severity']
+                })
+        
+            bounds[col] = (lower_bound, upper_bound)
+            series[col] = {
+                'anomalyCount': len(events),
+                'anomalyRate': round(len(events) / len(self.df_clean), 4) if len(self.df_clean) else 0,
+                'lowerBound': round(lower_bound, 2),
+                'upperBound': round(upper_bound, 2),
+                'anomalies': anomalies
+            }
+        
+        return AnomalyAnalysis(series, bounds)
+    
+    @period_filtered
     def column_structure_analysis(self):
         """Analyze the column structure and data types."""
-        print("\n" + "=" * 60)
-        print("COLUMN STRUCTURE ANALYSIS")
-        print("=" * 60)
-        
-        print("Column Structure (A-M):")
+        return self._section('column_structure_analysis')
+    
+    def _compute_column_structure_analysis(self):
         column_letters = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M']
         
+        columns = []
         for i, (col_letter, col_name) in enumerate(zip(column_letters, self.df.columns)):
-            data_type = str(self.df[col_name].dtype)
-            non_null_count = self.df[col_name].count()
-            unique_count = self.df[col_name].nunique()
-            
-            print(f"  Column {col_letter}: {col_name}")
-            print(f"    Data Type: {data_type}")
-            print(f"    Non-null Count: {non_null_count}")
-            print(f"    Unique Values: {unique_count}")
-            
-            # Show sample values for first few columns
-            if i < 5:
-                sample_values = self.df[col_name].dropna().head(3).tolist()
-                print(f"    Sample Values: {sample_values}")
-            print()
+            values = self.df[col_name]
+            columns.append(ColumnProfile(
+                letter=col_letter,
+                name=col_name,
+                dtype=str(values.dtype),
+                non_null=values.count(),
+                unique=values.nunique(),
+                # Show sample values for first few columns
+                samples=values.dropna().head(3).tolist() if i < 5 else None
+            ))
+        
+        return ColumnStructure(columns)
     
+    @profiled(rows='df_clean')
     def export_analysis(self, filename='thai_machinery_analysis_simple.xlsx'):
         """Export analysis results to Excel."""
-        print(f"\nExporting analysis to {filename}...")
+        self._log(f"\nExporting analysis to {filename}...")
         
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
             # Clean data
-            self.df_clean.to_excel(writer, sheet_name='Clean_Data', index=False)
+            self.df_clean.drop(columns=self.parsed_columns).to_excel(writer, sheet_name='Clean_Data', index=False)
             
             # Daily statistics
-            daily_stats = self.daily_analysis()
-            daily_stats.to_excel(writer, sheet_name='Daily_Statistics')
+            self.analysis('daily_analysis').daily_stats.to_excel(writer, sheet_name='Daily_Statistics')
             
             # Truck statistics
-            truck_stats = self.truck_analysis()
-            truck_stats.to_excel(writer, sheet_name='Truck_Statistics')
+            self.analysis('truck_analysis').truck_stats.to_excel(writer, sheet_name='Truck_Statistics')
             
             # Hour distribution
-            hour_dist = self.time_pattern_analysis()
+            hour_dist = self.analysis('time_pattern_analysis').hour_distribution
             hour_dist.to_frame('Operations_Count').to_excel(writer, sheet_name='Hour_Distribution')
             
             # Fleet optimization analysis
-            fleet_opt = self.fleet_optimization_analysis()
+            fleet_opt = self.analysis('fleet_optimization_analysis').fleet_performance
             fleet_opt.to_excel(writer, sheet_name='Fleet_Optimization', index=True)
             
             # Capacity utilization analysis
-            capacity_util = self.capacity_utilization_analysis()
+            capacity_util = self.analysis('capacity_utilization_analysis').capacity_by_truck
             capacity_util.to_excel(writer, sheet_name='Capacity_Utilization', index=True)
             
             # Pricing strategy analysis
-            pricing_strategy = self.pricing_strategy_analysis()
-            if not pricing_strategy.empty:
+            pricing_strategy = self.analysis('pricing_strategy_analysis').revenue_by_price
+            if pricing_strategy is not None and not pricing_strategy.empty:
                 pricing_strategy.to_excel(writer, sheet_name='Pricing_Strategy', index=True)
             
             # Column structure analysis
-            column_analysis = pd.DataFrame({
-                'Column': ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M'],
-                'Column_Name': list(self.df.columns),
-                'Data_Type': [str(self.df[col].dtype) for col in self.df.columns],
-                'Non_Null_Count': [self.df[col].count() for col in self.df.columns],
-                'Unique_Values': [self.df[col].nunique() for col in self.df.columns]
-            })
+            column_analysis = self.analysis('column_structure_analysis').to_frame()
             column_analysis.to_excel(writer, sheet_name='Column_Analysis', index=False)
             
             # Summary statistics
@@ -441,27 +756,156 @@ class SimpleThaiTruckAnalyzer:
             })
             summary_stats.to_excel(writer, sheet_name='Summary_Statistics', index=False)
         
-        print(f"Analysis exported to {filename}")
+        self._log(f"Analysis exported to {filename}")
+    
+    # Per-record redemption value bins (THB) for the dashboard distribution chart
+    redemption_bins = [0, 10, 100, 1000, 10000, np.inf]
+    redemption_bin_labels = ['< 10', '10-100', '100-1K', '1K-10K', '>= 10K']
     
-    def export_json_for_dashboard(self, filename='dashboard_data.json'):
-        """Export data in JSON format for the dashboard."""
-        print(f"\nExporting dashboard data to {filename}...")
+    @period_filtered
+    @profiled(rows='df_clean')
+    def dashboard_aggregates(self):
+        """KPIs, chart series and tables the dashboard renders, so it never scans rawData.
+        
+        Built from the memoized analysis results and the partial aggregates; only the
+        redemption distribution and the Column L validation read the cleaned rows.
+        """
+        df, cols = self.df_clean, self.thai_columns
+        truck_stats = self.analysis('truck_analysis').truck_stats
+        daily_stats = self.analysis('daily_analysis').daily_stats
+        hour_dist = self.analysis('time_pattern_analysis').hour_distribution
+        prices = self.analysis('pricing_strategy_analysis').prices
+        client_pricing = self.analysis('client_pricing_analysis').client_pricing
+        waste = self.analysis('waste_management_analysis')
+        strategic = self.analysis('strategic_business_intelligence')
+        total_records = len(df)
+        
+        def share(count):
+            return round(count / total_records * 100, 1) if total_records else 0
+        
+        # Column L against redeemable weight x price, as the raw data table checks it
+        actual = df['redemption_value'].astype(float) if 'redemption_value' in df.columns else pd.Series(0.0, index=df.index)
+        expected = df[cols['redeemable_weight']] * df[cols['price_per_ton']] / 1000
+        redemption = actual if 'redemption_value' in df.columns else expected
+        bins = pd.cut(redemption, self.redemption_bins, right=False, labels=self.redemption_bin_labels)
+        
+        # Trucks grouped by average price rounded to the nearest 100 THB (halves up)
+        tiers = truck_stats.groupby(np.floor(truck_stats['Avg_Price_Per_Ton'] / 100 + 0.5) * 100).agg(
+            operations=('Records', 'sum'), total_revenue=('Total_Revenue', 'sum')
+        )
+        price_counts = self.aggregates.price_counts()
+        
+        client_summary = None
+        if not client_pricing.empty:
+            client_prices = client_pricing['Avg_Price_Per_Ton']
+            client_summary = {
+                "minPrice": float(client_prices.min()),
+                "maxPrice": float(client_prices.max()),
+                "priceSpreadPercent": float((client_prices.max() - client_prices.min()) / prices['mean'] * 100) if prices else None,
+                "topPayer": client_prices.idxmax(),
+                "topPayerPrice": float(client_prices.max()),
+                "lowestPayer": client_prices.idxmin(),
+                "lowestPayerPrice": float(client_prices.min())
+            }
         
-        import json
+        return {
+            "kpis": {
+                "totalRecords": total_records,
+                "uniqueTrucks": int(df[cols['license_plate']].nunique()),
+                "uniqueDates": int(strategic.unique_dates),
+                "totalRevenue": round(float(truck_stats['Total_Revenue'].sum()), 2),
+                "avgPricePerTon": float(prices['mean']) if prices else None,
+                "avgTotalWeight": float(df[cols['total_weight']].mean()),
+                "avgGarbageWeight": float(waste.avg_garbage_weight),
+                "avgRedeemableWeight": float(waste.avg_redeemable_weight),
+                "lossWeight": float(waste.avg_garbage_weight - waste.avg_redeemable_weight),
+                "highValueOperations": int(price_counts[price_counts.index > 1500].sum()),
+                "highestRevenueAmount": float(strategic.highest_revenue) if strategic.highest_revenue is not None else None,
+                "uniqueClients": strategic.unique_clients or 0,
+                "uniqueWasteTypes": strategic.unique_waste_types or 0
+            },
+            "charts": {
+                "daily": {
+                    "labels": daily_stats.index.strftime('%Y-%m-%d').tolist(),
+                    "operations": daily_stats['Records'].tolist(),
+                    "weights": daily_stats['Total_Weight_Sum'].tolist()
+                },
+                "trucks": {
+                    "labels": truck_stats.index.tolist(),
+                    "operations": truck_stats['Records'].tolist(),
+                    "weights": truck_stats['Total_Weight_Sum'].tolist(),
+                    "revenue": truck_stats['Total_Revenue'].tolist()
+                },
+                "hourly": {
+                    "labels": [f"{int(hour):02d}:00" for hour in hour_dist.index],
+                    "operations": hour_dist.tolist()
+                },
+                "redemptionDistribution": {
+                    "labels": self.redemption_bin_labels,
+                    "counts": bins.value_counts(sort=False).tolist()
+                }
+            },
+            "pricingTiers": [
+                {
+                    "priceTier": float(price_tier),
+                    "operations": int(operations),
+                    "totalRevenue": float(total_revenue),
+                    "avgRevenuePerOperation": float(total_revenue / operations) if operations else 0,
+                    "percentage": share(operations)
+                }
+                for price_tier, operations, total_revenue in zip(tiers.index, tiers['operations'], tiers['total_revenue'])
+            ],
+            "wasteTypeBreakdown": [
+                {
+                    "wasteType": waste_type,
+                    "count": entry['count'],
+                    "totalValue": entry['total_value'],
+                    "avgValue": entry['total_value'] / entry['count'],
+                    "percentage": share(entry['count'])
+                }
+                for waste_type, entry in waste.waste_types.items()
+            ],
+            "clientPricingSummary": client_summary,
+            "validation": {
+                "recordsChecked": total_records,
+                "matchingRecords": int(((actual - expected).abs() < 0.01).sum()),
+                "totalCalculated": float(expected.sum()),
+                "totalActual": float(actual.sum())
+            }
+        }
+    
+    @period_filtered
+    @profiled(rows='df_clean')
+    def export_json_for_dashboard(self, filename='dashboard_data.json', raw_data_format='rows', compact=None,
+                                  raw_data_filename='dashboard_raw_data.json'):
+        """Export data in JSON format for the dashboard.
+        
+        The dashboard file carries precomputed KPIs and chart series (see
+        dashboard_aggregates) and names the raw rows file in rawDataUrl; the page only
+        fetches that file when the raw data table is shown. A relative
+        raw_data_filename is placed next to filename, so rawDataUrl resolves from the
+        dashboard file; raw_data_filename=None embeds rawData in the dashboard file
+        instead, as older exports did.
+        
+        raw_data_format='columnar' opts into the compact columnar rawData layout; that
+        payload is written without indentation (compact=True) by default since its
+        point is size and parse speed.
+        """
+        self._log(f"\nExporting dashboard data to {filename}...")
         
         # Get all the analysis data
-        daily_stats = self.daily_analysis()
-        truck_stats = self.truck_analysis()
-        hour_dist = self.time_pattern_analysis()
-        fleet_opt = self.fleet_optimization_analysis()
-        capacity_util = self.capacity_utilization_analysis()
-        pricing_strategy = self.pricing_strategy_analysis()
+        truck_stats = self.analysis('truck_analysis').truck_stats
+        hour_dist = self.analysis('time_pattern_analysis').hour_distribution
+        fleet = self.analysis('fleet_optimization_analysis')
+        capacity = self.analysis('capacity_utilization_analysis')
+        prices = self.analysis('pricing_strategy_analysis').prices
         
         # Get new business intelligence data
-        client_pricing = self.client_pricing_analysis()
-        operational_efficiency = self.operational_efficiency_analysis()
-        waste_management = self.waste_management_analysis()
-        strategic_bi = self.strategic_business_intelligence()
+        client_pricing = self.analysis('client_pricing_analysis').client_pricing
+        operational_efficiency = self.analysis('operational_efficiency_analysis').as_dict()
+        waste_management = self.analysis('waste_management_analysis').as_dict()
+        strategic_bi = self.analysis('strategic_business_intelligence').as_dict()
+        anomalies = self.analysis('anomaly_analysis').series
         
         # Prepare dashboard data structure
         dashboard_data = {
@@ -471,409 +915,353 @@ class SimpleThaiTruckAnalyzer:
                 "dateRange": f"{self.df_clean[self.thai_columns['date']].min()} to {self.df_clean[self.thai_columns['date']].max()}",
                 "analysisDate": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             },
-            "rawData": self.prepare_raw_data_for_dashboard(),
             "fleetPerformance": {
                 "topPerformers": {
                     "highestRevenue": {
-                        "license": truck_stats.loc[truck_stats['Total_Revenue'].idxmax()].name,
-                        "revenue": float(truck_stats.loc[truck_stats['Total_Revenue'].idxmax()]['Total_Revenue']),
-                        "operations": int(truck_stats.loc[truck_stats['Total_Revenue'].idxmax()]['Records'])
+                        "license": fleet.top_revenue.name,
+                        "revenue": float(fleet.top_revenue['Total_Revenue']),
+                        "operations": int(fleet.top_revenue['Records'])
                     },
                     "mostOperations": {
-                        "license": truck_stats.loc[truck_stats['Records'].idxmax()].name,
-                        "operations": int(truck_stats.loc[truck_stats['Records'].idxmax()]['Records']),
-                        "revenue": float(truck_stats.loc[truck_stats['Records'].idxmax()]['Total_Revenue'])
+                        "license": fleet.top_operations.name,
+                        "operations": int(fleet.top_operations['Records']),
+                        "revenue": float(fleet.top_operations['Total_Revenue'])
                     },
                     "highestWeight": {
-                        "license": truck_stats.loc[truck_stats['Total_Weight_Sum'].idxmax()].name,
-                        "weight": float(truck_stats.loc[truck_stats['Total_Weight_Sum'].idxmax()]['Total_Weight_Sum']),
-                        "operations": int(truck_stats.loc[truck_stats['Total_Weight_Sum'].idxmax()]['Records'])
+                        "license": fleet.top_weight.name,
+                        "weight": float(fleet.top_weight['Total_Weight_Sum']),
+                        "operations": int(fleet.top_weight['Records'])
                     }
                 },
                 "performanceTiers": {
-                    "elite": int(len(truck_stats[truck_stats['Total_Revenue'] > truck_stats['Total_Revenue'].quantile(0.8)])),
-                    "high": int(len(truck_stats[(truck_stats['Total_Revenue'] > truck_stats['Total_Revenue'].quantile(0.6)) & (truck_stats['Total_Revenue'] <= truck_stats['Total_Revenue'].quantile(0.8))])),
-                    "good": int(len(truck_stats[(truck_stats['Total_Revenue'] > truck_stats['Total_Revenue'].quantile(0.4)) & (truck_stats['Total_Revenue'] <= truck_stats['Total_Revenue'].quantile(0.6))])),
-                    "needsAttention": int(len(truck_stats[truck_stats['Total_Revenue'] <= truck_stats['Total_Revenue'].quantile(0.4)]))
+                    "elite": fleet.tiers['elite'],
+                    "high": fleet.tiers['high'],
+                    "good": fleet.tiers['good'],
+                    "needsAttention": fleet.tiers['needs_attention']
                 }
             },
             "capacityUtilization": {
-                "averageWeight": float(self.df_clean[self.thai_columns['total_weight']].mean()),
-                "maxCapacityHits": int((self.df_clean[self.thai_columns['total_weight']] >= 15).sum()),
-                "capacityUtilizationPercent": float((self.df_clean[self.thai_columns['total_weight']].mean() / 15) * 100),
-                "underutilizedOperations": int((self.df_clean[self.thai_columns['total_weight']] < 12).sum())
+                "averageWeight": float(capacity.average_weight),
+                "maxCapacityHits": capacity.max_capacity_hits,
+                "capacityUtilizationPercent": float(capacity.utilization_percent),
+                "underutilizedOperations": capacity.underutilized
             },
             "pricingStrategy": {
-                "averagePricePerTon": float(self.df_clean[self.thai_columns['price_per_ton']].mean()),
-                "priceRange": float(self.df_clean[self.thai_columns['price_per_ton']].max() - self.df_clean[self.thai_columns['price_per_ton']].min()),
-                "priceStandardDeviation": float(self.df_clean[self.thai_columns['price_per_ton']].std()),
+                "averagePricePerTon": float(prices['mean']),
+                "priceRange": float(prices['range']),
+                "priceStandardDeviation": float(prices['std']),
                 "priceQuartiles": {
-                    "q1": float(self.df_clean[self.thai_columns['price_per_ton']].quantile(0.25)),
-                    "q2": float(self.df_clean[self.thai_columns['price_per_ton']].quantile(0.5)),
-                    "q3": float(self.df_clean[self.thai_columns['price_per_ton']].quantile(0.75))
+                    "q1": float(prices['quantiles'][0.25]),
+                    "q2": float(prices['quantiles'][0.5]),
+                    "q3": float(prices['quantiles'][0.75])
                 }
             },
             "hourlyDistribution": hour_dist.to_dict() if not hour_dist.empty else {},
             "truckDetails": truck_stats.reset_index().to_dict('records') if not truck_stats.empty else [],
-            "capacityByTruck": capacity_util.reset_index().to_dict('records') if not capacity_util.empty else [],
+            "capacityByTruck": capacity.capacity_by_truck.reset_index().to_dict('records') if not capacity.capacity_by_truck.empty else [],
             
             # New business intelligence data
             "clientPricing": client_pricing.to_dict('index') if not client_pricing.empty else {},
             "operationalEfficiency": operational_efficiency,
             "wasteManagement": waste_management,
-            "strategicBI": strategic_bi
+            "strategicBI": strategic_bi,
+            "anomalyDetection": anomalies,
+            
+            # Chart-ready aggregates
+            **self.dashboard_aggregates()
         }
         
-        # Write to JSON file
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(dashboard_data, f, ensure_ascii=False, indent=2, default=str)
+        if compact is None:
+            compact = raw_data_format == 'columnar'
         
-        # Also copy to html_dashboards folder for easier access
-        html_filename = '../html_dashboards/dashboard_data.json'
-        try:
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                json.dump(dashboard_data, f, ensure_ascii=False, indent=2, default=str)
-            print(f"  Also saved to: {html_filename}")
-        except Exception as e:
-            print(f"  Note: Could not save to html_dashboards folder: {e}")
+        # Row records are streamed from the frame while encoding
+        raw_data = self.raw_data_frame() if raw_data_format == 'rows' else self.prepare_raw_data_for_dashboard(raw_data_format)
+        if raw_data_filename is None:
+            dashboard_data["rawData"] = raw_data
+        else:
+            dashboard_dir = os.path.dirname(filename)
+            raw_data_filename = os.path.join(dashboard_dir, raw_data_filename)
+            dashboard_data["rawDataUrl"] = os.path.relpath(raw_data_filename, dashboard_dir or os.curdir)
+            self._write_dashboard_json({"rawData": raw_data}, raw_data_filename, compact)
         
-        print(f"Dashboard data exported to {filename}")
+        self._write_dashboard_json(dashboard_data, filename, compact)
+        self._log(f"Dashboard data exported to {filename}")
     
+    @profiled(name='write_dashboard_json')
+    def _write_dashboard_json(self, data, filename, compact):
+        """Write one dashboard JSON file plus its html_dashboards copy."""
+        # Encoded once; the html_dashboards copy receives the same bytes
+        html_filename = os.path.join('../html_dashboards', os.path.basename(filename))
+        failed = write_json(data, [filename, html_filename], compact=compact)
+        if html_filename in failed:
+            self._log(f"  Note: Could not save to html_dashboards folder: {failed[html_filename]}")
+        else:
+            self._log(f"  Also saved to: {html_filename}")
+    
+    @period_filtered
     def client_pricing_analysis(self):
         """Analyze client pricing strategies and variations."""
-        print("\n" + "=" * 60)
-        print("CLIENT PRICING STRATEGY ANALYSIS")
-        print("=" * 60)
-        
-        # Extract client information from additional data
-        client_data = []
-        for _, row in self.df_clean.iterrows():
-            additional_data = str(row[self.thai_columns['additional_data']])
-            if 'CLIENT-' in additional_data:
-                parts = additional_data.split(' - ')
-                if len(parts) >= 3:
-                    client = parts[0]
-                    waste_type = parts[1]
-                    price_per_ton = row[self.thai_columns['price_per_ton']]
-                    redeemable_weight = row[self.thai_columns['redeemable_weight']]
-                    total_revenue = redeemable_weight * price_per_ton / 1000
-                    
-                    client_data.append({
-                        'client': client,
-                        'waste_type': waste_type,
-                        'price_per_ton': price_per_ton,
-                        'redeemable_weight': redeemable_weight,
-                        'total_revenue': total_revenue,
-                        'license_plate': row[self.thai_columns['license_plate']]
-                    })
-        
-        if client_data:
-            client_df = pd.DataFrame(client_data)
-            
-            # Client pricing analysis
-            client_pricing = client_df.groupby('client')['price_per_ton'].agg(['mean', 'min', 'max', 'count']).round(2)
-            client_pricing.columns = ['Avg_Price_Per_Ton', 'Min_Price', 'Max_Price', 'Operations']
-            
-            print("💰 CLIENT PRICING STRATEGY:")
-            print(f"  Price variation: {client_pricing['Min_Price'].min():.0f} THB/ton to {client_pricing['Max_Price'].max():.0f} THB/ton")
-            print(f"  Price spread: {((client_pricing['Max_Price'].max() - client_pricing['Min_Price'].min()) / client_pricing['Avg_Price_Per_Ton'].mean() * 100):.1f}%")
-            
-            # Top and lowest payers
-            top_payer = client_pricing.loc[client_pricing['Avg_Price_Per_Ton'].idxmax()]
-            lowest_payer = client_pricing.loc[client_pricing['Avg_Price_Per_Ton'].idxmin()]
-            
-            print(f"  Top Payer: {client_pricing['Avg_Price_Per_Ton'].idxmax()} gets {top_payer['Avg_Price_Per_Ton']:.0f} THB/ton")
-            print(f"  Lowest Payer: {client_pricing['Avg_Price_Per_Ton'].idxmin()} gets {lowest_payer['Avg_Price_Per_Ton']:.0f} THB/ton")
-            print(f"  Action: Negotiate higher rates with low-paying clients or offer premium services")
-            
-            return client_pricing
-        else:
-            print("No client data found in additional data column")
-            return pd.DataFrame()
+        client_pricing = self._section('client_pricing_analysis').client_pricing
+        return client_pricing if not client_pricing.empty else pd.DataFrame()
     
+    def _compute_client_pricing_analysis(self):
+        # Client pricing over CLIENT- tagged rows in the additional data column
+        return ClientPricing(self.aggregates.client_pricing())
+    
+    @period_filtered
     def operational_efficiency_analysis(self):
         """Analyze operational efficiency and time patterns."""
-        print("\n" + "=" * 60)
-        print("OPERATIONAL EFFICIENCY ANALYSIS")
-        print("=" * 60)
-        
-        # Calculate processing times
-        processing_times = []
-        for _, row in self.df_clean.iterrows():
-            time_in = str(row[self.thai_columns['time_in']])
-            time_out = str(row[self.thai_columns['time_out']])
-            
-            try:
-                # Parse times (HH.MM.SS format)
-                in_parts = time_in.split('.')
-                out_parts = time_out.split('.')
-                
-                if len(in_parts) >= 2 and len(out_parts) >= 2:
-                    in_minutes = int(in_parts[0]) * 60 + int(in_parts[1])
-                    out_minutes = int(out_parts[0]) * 60 + int(out_parts[1])
-                    
-                    # Handle day wrap-around
-                    if out_minutes < in_minutes:
-                        out_minutes += 24 * 60
-                    
-                    processing_time = out_minutes - in_minutes
-                    processing_times.append(processing_time)
-            except:
-                continue
-        
-        if processing_times:
-            avg_processing_time = np.mean(processing_times)
-            print(f"⏰ PROCESSING TIME OPTIMIZATION:")
-            print(f"  Average processing time: {avg_processing_time:.1f} minutes per truck")
-            print(f"  Range: {min(processing_times):.0f} to {max(processing_times):.0f} minutes")
+        return self._section('operational_efficiency_analysis').as_dict()
+    
+    def _compute_operational_efficiency_analysis(self, time_pattern):
+        # Processing times (parsed in setup_data), folded from the partials
+        processing = self.aggregates.measure_summary('processing_minutes')
         
         # Peak hours analysis
-        hour_dist = self.time_pattern_analysis()
-        peak_hour = None
-        low_hour = None
-        active_hours = 0
-        
+        hour_dist = time_pattern.hour_distribution
+        peak_hours = {}
         if not hour_dist.empty:
-            try:
-                # hour_dist is a Series, so we need to find the peak differently
-                peak_hour_name = hour_dist.idxmax()
-                peak_hour_count = hour_dist.max()
-                low_hour_name = hour_dist.idxmin()
-                low_hour_count = hour_dist.min()
-                
-                print(f"  Peak Hours: {peak_hour_name} ({peak_hour_count} ops)")
-                print(f"  Low Activity: {low_hour_name} ({low_hour_count} ops) - Maintenance Window Opportunity")
-                
-                # 24/7 operations pattern
-                active_hours = len(hour_dist[hour_dist > 0])
-                print(f"  24/7 OPERATIONS PATTERN:")
-                print(f"  Operations span: {active_hours} hours per day")
-                print(f"  Night Shift Efficiency: 00:00-06:00 has lower volume but consistent operations")
-                print(f"  Action: Optimize night shift staffing and pricing")
-            except Exception as e:
-                print(f"  Error in peak hours analysis: {e}")
+            peak_hours = {
+                'peak_hour': hour_dist.idxmax(),
+                'peak_count': hour_dist.max(),
+                'low_hour': hour_dist.idxmin(),
+                'low_count': hour_dist.min(),
+                'active_hours': len(hour_dist[hour_dist > 0])
+            }
         
-        return {
-            'avg_processing_time': avg_processing_time if processing_times else 0,
-            'peak_hour': peak_hour_name if 'peak_hour_name' in locals() else None,
-            'low_hour': low_hour_name if 'low_hour_name' in locals() else None,
-            'active_hours': active_hours
-        }
+        if not processing['n']:
+            return OperationalEfficiency(0, **peak_hours)
+        return OperationalEfficiency(
+            avg_processing_time=processing['mean'],
+            processing_range=(processing['min'], processing['max']),
+            **peak_hours
+        )
     
+    @period_filtered
     def waste_management_analysis(self):
         """Analyze waste management and quality insights."""
-        print("\n" + "=" * 60)
-        print("WASTE MANAGEMENT & QUALITY ANALYSIS")
-        print("=" * 60)
-        
+        return self._section('waste_management_analysis').as_dict()
+    
+    def _compute_waste_management_analysis(self):
         # Redemption rate analysis
-        avg_garbage_weight = self.df_clean[self.thai_columns['garbage_weight']].mean()
-        avg_redeemable_weight = self.df_clean[self.thai_columns['redeemable_weight']].mean()
+        avg_garbage_weight = self.aggregates.measure_summary('garbage_weight')['mean']
+        avg_redeemable_weight = self.aggregates.measure_summary('redeemable_weight')['mean']
         redemption_rate = (avg_redeemable_weight / avg_garbage_weight) * 100 if avg_garbage_weight > 0 else 0
-        loss_rate = 100 - redemption_rate
-        
-        print(f"🗑️ REDEMPTION RATE OPTIMIZATION:")
-        print(f"  Average garbage weight: {avg_garbage_weight:.1f} tons")
-        print(f"  Average redeemable: {avg_redeemable_weight:.1f} tons ({redemption_rate:.0f}% of garbage weight)")
-        print(f"  {loss_rate:.0f}% Loss: {avg_garbage_weight - avg_redeemable_weight:.1f} tons per truck is non-redeemable waste")
-        print(f"  Action: Improve sorting processes to increase redeemable percentage")
         
         # Weight vs Value correlation
-        correlation = self.df_clean[self.thai_columns['garbage_weight']].corr(
-            self.df_clean[self.thai_columns['price_per_ton']]
-        )
-        
-        print(f"  WEIGHT VS. VALUE CORRELATION:")
-        print(f"  Correlation coefficient: {correlation:.3f}")
-        if abs(correlation) < 0.3:
-            print(f"  Higher weight doesn't always mean higher value")
-            print(f"  Quality over Quantity: Focus on waste type quality, not just weight")
-        else:
-            print(f"  Strong correlation between weight and value")
+        correlation = self.aggregates.weight_price_correlation()
         
         # Waste type analysis
-        waste_types = {}
-        for _, row in self.df_clean.iterrows():
-            additional_data = str(row[self.thai_columns['additional_data']])
-            if ' - ' in additional_data:
-                parts = additional_data.split(' - ')
-                if len(parts) >= 2:
-                    waste_type = parts[1]
-                    if waste_type not in waste_types:
-                        waste_types[waste_type] = {'count': 0, 'total_value': 0}
-                    waste_types[waste_type]['count'] += 1
-                    waste_types[waste_type]['total_value'] += row.get('redemption_value', 0)
-        
-        if waste_types:
-            print(f"  WASTE TYPE ANALYSIS:")
-            for waste_type, data in waste_types.items():
-                avg_value = data['total_value'] / data['count']
-                print(f"    {waste_type}: {data['count']} operations, {avg_value:.0f} THB avg value")
-        
-        return {
-            'redemption_rate': redemption_rate,
-            'loss_rate': loss_rate,
-            'weight_value_correlation': correlation,
-            'waste_types': waste_types
+        waste_stats = self.aggregates.waste_types()
+        waste_types = {
+            waste_type: {'count': int(count), 'total_value': float(total_value)}
+            for waste_type, count, total_value in zip(waste_stats.index, waste_stats['count'], waste_stats['total_value'])
         }
+        
+        return WasteManagement(
+            avg_garbage_weight=avg_garbage_weight,
+            avg_redeemable_weight=avg_redeemable_weight,
+            redemption_rate=redemption_rate,
+            loss_rate=100 - redemption_rate,
+            weight_value_correlation=correlation,
+            waste_types=waste_types
+        )
     
+    @period_filtered
     def strategic_business_intelligence(self):
         """Generate strategic business intelligence insights."""
-        print("\n" + "=" * 60)
-        print("STRATEGIC BUSINESS INTELLIGENCE")
-        print("=" * 60)
+        return self._section('strategic_business_intelligence').as_dict()
+    
+    def _compute_strategic_business_intelligence(self, trucks):
+        portfolio = self.aggregates.portfolio_summary()
         
         # Client portfolio analysis
-        client_data = []
-        for _, row in self.df_clean.iterrows():
-            additional_data = str(row[self.thai_columns['additional_data']])
-            if 'CLIENT-' in additional_data:
-                parts = additional_data.split(' - ')
-                if len(parts) >= 3:
-                    client = parts[0]
-                    waste_type = parts[1]
-                    client_data.append({'client': client, 'waste_type': waste_type})
-        
-        if client_data:
-            client_df = pd.DataFrame(client_data)
-            unique_clients = client_df['client'].nunique()
-            unique_waste_types = client_df['waste_type'].nunique()
-            
-            print(f"📊 CLIENT PORTFOLIO ANALYSIS:")
-            print(f"  {unique_clients} active clients with different waste preferences")
-            print(f"  {unique_waste_types} different waste types processed")
-            print(f"  Client Segmentation: Some clients consistently provide higher-value waste")
-            print(f"  Action: Develop targeted services for high-value waste streams")
+        details = {}
+        if portfolio['tagged_records']:
+            details = {
+                'unique_clients': portfolio['clients'],
+                'unique_waste_types': portfolio['waste_types']
+            }
         
         # Seasonal & daily patterns
-        total_records = len(self.df_clean)
-        unique_dates = self.df_clean[self.thai_columns['date']].nunique()
-        avg_daily_operations = total_records / unique_dates if unique_dates > 0 else 0
-        
-        print(f"  SEASONAL & DAILY PATTERNS:")
-        print(f"  Consistent daily operations ({total_records} records across {unique_dates} days)")
-        print(f"  Average daily operations: {avg_daily_operations:.1f}")
-        print(f"  Predictability: Enables better resource planning and staffing")
-        print(f"  Action: Implement predictive scheduling based on historical patterns")
+        total_records = portfolio['records']
+        unique_dates = portfolio['dates']
         
         # Cost-benefit analysis
-        total_revenue = self.df_clean.get('redemption_value', pd.Series([0] * len(self.df_clean))).sum()
-        unique_trucks = self.df_clean[self.thai_columns['license_plate']].nunique()
-        avg_revenue_per_truck = total_revenue / unique_trucks if unique_trucks > 0 else 0
-        
-        print(f"  COST-BENEFIT ANALYSIS:")
-        print(f"  Total redemption value: {total_revenue:,.0f} THB")
-        print(f"  Per Truck Revenue: Average {avg_revenue_per_truck:,.0f} THB per truck")
-        print(f"  ROI Calculation: Compare truck costs vs. revenue generation")
+        total_revenue = portfolio['revenue']
+        unique_trucks = portfolio['trucks']
         
         # Revenue per truck analysis
-        truck_stats = self.truck_analysis()
+        truck_stats = trucks.truck_stats
         if not truck_stats.empty:
             highest_revenue_truck = truck_stats.loc[truck_stats['Total_Revenue'].idxmax()]
-            print(f"  REVENUE PER TRUCK ANALYSIS:")
-            print(f"  Highest revenue truck: {highest_revenue_truck.name} ({highest_revenue_truck['Total_Revenue']:,.0f} THB)")
-            print(f"  ROI Opportunity: Invest in more trucks like {highest_revenue_truck.name} or replicate their operational model")
+            details['highest_revenue_truck'] = highest_revenue_truck.name
+            details['highest_revenue'] = highest_revenue_truck['Total_Revenue']
+        
+        return StrategicInsights(
+            total_records=total_records,
+            unique_dates=unique_dates,
+            avg_daily_operations=total_records / unique_dates if unique_dates > 0 else 0,
+            total_revenue=total_revenue,
+            unique_trucks=unique_trucks,
+            avg_revenue_per_truck=total_revenue / unique_trucks if unique_trucks > 0 else 0,
+            **details
+        )
+    
+    @period_filtered
+    def prepare_raw_data_for_dashboard(self, raw_data_format='rows'):
+        """Prepare raw data in the format expected by the dashboard.
+        
+        raw_data_format='rows' gives one object per weigh record; 'columnar' gives
+        one array per field (see encode_raw_data_columnar).
+        """
+        raw_frame = self.raw_data_frame()
+        if raw_data_format == 'columnar':
+            return self.encode_raw_data_columnar(raw_frame)
+        if raw_data_format != 'rows':
+            raise ValueError(f"Unknown raw_data_format: {raw_data_format}")
+        return raw_frame.to_dict('records')
+    
+    @profiled(rows='df_clean')
+    def raw_data_frame(self):
+        """Dashboard rawData fields as a DataFrame, one row per weigh record."""
+        df = self.df_clean
+        cols = self.thai_columns
+        
+        dates = df[cols['date']]
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            dates = dates.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('NaT')
+        
+        # Extract the redemption value from Column L
+        redemption_value = df['redemption_value'] if 'redemption_value' in df.columns else 0
+        
+        raw_frame = pd.DataFrame({
+            "date": dates.astype(str),
+            "logNumber": df[cols['log_number']].astype(str),
+            "license": df[cols['license_plate']].astype(str),
+            "timeIn": df[cols['time_in']].astype(str),
+            "timeOut": df[cols['time_out']].astype(str),
+            "totalWeight": df[cols['total_weight']].astype(float),
+            "maxRedemption": df[cols['max_redemption']].astype(float),
+            "emptyWeight": df[cols['empty_weight']].astype(float),
+            "garbageWeight": df[cols['garbage_weight']].astype(float),
+            "redeemable": df[cols['redeemable_weight']].astype(float),
+            "pricePerTon": df[cols['price_per_ton']].astype(float),
+            "totalRedemptionValue": redemption_value,
+            "additionalData": df[cols['additional_data']].astype(str)
+        }, index=df.index)
+        raw_frame['totalRedemptionValue'] = raw_frame['totalRedemptionValue'].astype(float)
+        
+        return raw_frame
+    
+    # rawData fields stored as {"dict": [...], "codes": [...]} in the columnar layout
+    dictionary_fields = ['date', 'license']
+    
+    @profiled(rows=0)
+    def encode_raw_data_columnar(self, raw_frame):
+        """Encode rawData as one array per field instead of one object per record.
+        
+        Dates and license plates are dictionary-encoded. additionalData is split at its
+        last " - " into a dictionary-encoded client/waste-type prefix and the per-row
+        value suffix, so prefix + suffix reproduces the original string exactly.
+        Decoded by html_dashboards/components/columnar-data.js.
+        """
+        def dictionary(values):
+            codes, uniques = pd.factorize(values, sort=False)
+            return {"dict": uniques.tolist(), "codes": codes.tolist()}
+        
+        columns = {}
+        for field in raw_frame.columns:
+            values = raw_frame[field]
+            if field in self.dictionary_fields:
+                columns[field] = dictionary(values)
+            elif field == 'additionalData':
+                split = values.str.rpartition(' - ')
+                columns[field] = {
+                    "prefix": dictionary(split[0] + split[1]),
+                    "suffix": split[2].tolist()
+                }
+            else:
+                columns[field] = values.tolist()
         
         return {
-            'unique_clients': unique_clients if client_data else 0,
-            'unique_waste_types': unique_waste_types if client_data else 0,
-            'total_revenue': total_revenue,
-            'avg_revenue_per_truck': avg_revenue_per_truck,
-            'avg_daily_operations': avg_daily_operations,
-            'highest_revenue_truck': highest_revenue_truck.name if not truck_stats.empty else None
+            "format": "columnar",
+            "length": len(raw_frame),
+            "columns": columns
         }
     
-    def prepare_raw_data_for_dashboard(self):
-        """Prepare raw data in the format expected by the dashboard."""
-        raw_data = []
-        
-        for _, row in self.df_clean.iterrows():
-            # Extract the redemption value from Column L
-            redemption_value = row.get('redemption_value', 0)
-            
-            raw_record = {
-                "date": str(row[self.thai_columns['date']]),
-                "logNumber": str(row[self.thai_columns['log_number']]),
-                "license": str(row[self.thai_columns['license_plate']]),
-                "timeIn": str(row[self.thai_columns['time_in']]),
-                "timeOut": str(row[self.thai_columns['time_out']]),
-                "totalWeight": float(row[self.thai_columns['total_weight']]),
-                "maxRedemption": float(row[self.thai_columns['max_redemption']]),
-                "emptyWeight": float(row[self.thai_columns['empty_weight']]),
-                "garbageWeight": float(row[self.thai_columns['garbage_weight']]),
-                "redeemable": float(row[self.thai_columns['redeemable_weight']]),
-                "pricePerTon": float(row[self.thai_columns['price_per_ton']]),
-                "totalRedemptionValue": float(redemption_value),
-                "additionalData": str(row[self.thai_columns['additional_data']])
-            }
-            raw_data.append(raw_record)
-        
-        return raw_data
-    
-    def generate_report(self):
+    @profiled(rows='df_clean')
+    def generate_report(self, raw_data_format='rows'):
         """Generate a comprehensive analysis report."""
-        print("\n" + "=" * 60)
-        print("COMPREHENSIVE ANALYSIS REPORT")
-        print("=" * 60)
-        print("Thai Truck Weigh Station Log Data - 13 Columns (A-M)")
-        print("Thai Buddhist Calendar Year 2568")
-        print("=" * 60)
-        
-        # Column structure analysis
-        self.column_structure_analysis()
-        
-        # Basic statistics
-        self.basic_statistics()
-        
-        # Detailed analysis
-        daily_stats = self.daily_analysis()
-        truck_stats = self.truck_analysis()
-        hour_dist = self.time_pattern_analysis()
-        
-        # New fleet optimization analyses
-        fleet_opt = self.fleet_optimization_analysis()
-        capacity_util = self.capacity_utilization_analysis()
-        pricing_strategy = self.pricing_strategy_analysis()
-        
-        # Advanced business intelligence analyses
-        client_pricing_analysis = self.client_pricing_analysis()
-        operational_efficiency_analysis = self.operational_efficiency_analysis()
-        waste_management_analysis = self.waste_management_analysis()
-        strategic_business_intelligence = self.strategic_business_intelligence()
+        # Every analysis is computed first; the console report is rendered from the results
+        report = self.analyze()
+        if self.progress:
+            render(report, self.progress)
         
         # Export results
         self.export_analysis('thai_truck_weigh_analysis_simple.xlsx')
         
         # Export JSON data for dashboard
-        self.export_json_for_dashboard('dashboard_data.json')
-        
-        print("\n" + "=" * 60)
-        print("ANALYSIS COMPLETE!")
-        print("=" * 60)
-        print("Files generated:")
-        print("  - thai_truck_weigh_analysis_simple.xlsx (Excel with all data and analysis)")
-        print("  - dashboard_data.json (JSON data for dashboard)")
-        print("\nKey insights:")
-        print("  - Column A: Date tracking (Thai Buddhist calendar)")
-        print("  - Columns B-L: Truck weigh station operational data")
-        print("  - Column M: Log count per date")
-        print("  - Green summary rows provide daily totals")
-        print("  - Track garbage collection and redemption patterns")
-        print("  - Compare truck performance and client pricing")
+        self.export_json_for_dashboard('dashboard_data.json', raw_data_format)
+        self.reuse_report()
+        
+        self._log("\n" + "=" * 60)
+        self._log("ANALYSIS COMPLETE!")
+        self._log("=" * 60)
+        self._log("Files generated:")
+        self._log("  - thai_truck_weigh_analysis_simple.xlsx (Excel with all data and analysis)")
+        self._log("  - dashboard_data.json (JSON data for dashboard)")
+        self._log("  - dashboard_raw_data.json (raw rows, fetched by the dashboard on demand)")
+        self._log("\nKey insights:")
+        self._log("  - Column A: Date tracking (Thai Buddhist calendar)")
+        self._log("  - Columns B-L: Truck weigh station operational data")
+        self._log("  - Column M: Log count per date")
+        self._log("  - Green summary rows provide daily totals")
+        self._log("  - Track garbage collection and redemption patterns")
+        self._log("  - Compare truck performance and client pricing")
 
-def main():
-    """Main function to run the analysis."""
+def main(state_path=None, workbooks=None, profile=None, compact_dtypes=False):
+    """Main function to run the analysis.
+    
+    With state_path, only rows appended to the workbook since the last run are folded in.
+    With workbooks (a directory or glob), every matching workbook is analyzed together.
+    With profile, per-stage spans are written to <profile>.json and <profile>.folded.
+    With compact_dtypes, cleaned rows are kept in compact dtypes.
+    """
     print("Simple Thai Truck Weigh Station Log Data Analyzer (13 Columns A-M)")
     print("Thai Buddhist Calendar Year 2568")
     print("=" * 50)
     
+    profiler = Profiler() if profile else None
+    
     # Try to load the new real data file
     try:
-        analyzer = SimpleThaiTruckAnalyzer('thai_truck_weigh_logs_real_2568.xlsx')
+        if workbooks:
+            analyzer = SimpleThaiTruckAnalyzer.from_workbooks(workbooks, profiler=profiler,
+                                                              compact_dtypes=compact_dtypes)
+        elif state_path:
+            analyzer = SimpleThaiTruckAnalyzer.update_from_workbook('thai_truck_weigh_logs_real_2568.xlsx', state_path,
+                                                                    profiler=profiler, compact_dtypes=compact_dtypes)
+        else:
+            analyzer = SimpleThaiTruckAnalyzer('thai_truck_weigh_logs_real_2568.xlsx', profiler=profiler,
+                                               compact_dtypes=compact_dtypes)
         analyzer.generate_report()
+        if profiler:
+            print(f"Profile written to {', '.join(profiler.write(profile))}")
     except Exception as e:
         print(f"Error: {e}")
         print("Please ensure you have the 'thai_truck_weigh_logs_real_2568.xlsx' file or provide a different file path.")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Thai truck weigh station log analyzer")
+    parser.add_argument('--incremental', metavar='STATE_FILE',
+                        help="fold only newly appended rows into the partial aggregates saved in STATE_FILE")
+    parser.add_argument('--workbooks', metavar='DIR_OR_GLOB',
+                        help="analyze every weigh log workbook in a directory or matching a glob, in parallel")
+    parser.add_argument('--profile', metavar='PREFIX',
+                        help="record per-stage timings and memory to PREFIX.json and PREFIX.folded (flamegraph)")
+    parser.add_argument('--compact-dtypes', action='store_true',
+                        help="keep cleaned rows in categorical/float32/int32 dtypes and report the memory saved")
+    args = parser.parse_args()
+    main(args.incremental, args.workbooks, args.profile, args.compact_dtypes)
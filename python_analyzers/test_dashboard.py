@@ -27,8 +27,11 @@ def test_dashboard_data():
         print(f"   Date Range: {metadata.get('dateRange', 'N/A')}")
         print(f"   Analysis Date: {metadata.get('analysisDate', 'N/A')}")
         
-        # Test raw data
+        # Test raw data (written to a separate file named by rawDataUrl)
         raw_data = data.get('rawData', [])
+        if 'rawDataUrl' in data:
+            with open(data['rawDataUrl'], 'r', encoding='utf-8') as f:
+                raw_data = json.load(f)['rawData']
         print(f"📋 Raw Data: {len(raw_data)} records")
         
         if raw_data:
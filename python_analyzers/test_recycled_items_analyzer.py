@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Tests for RecycledItemsAnalyzer internals.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from anomaly_detection import StreamingAnomalyDetector
+from console_report import render_recycled_summary
+from forecasting import RecursiveForecaster
+from model_cache import ModelCache
+from model_pool import run_with_budget
+from profiling import Profiler
+from recycled_items_analyzer import RecycledItemsAnalyzer
+
+
+def make_analyzer():
+    analyzer = RecycledItemsAnalyzer()
+    analyzer.load_sample_data()
+    return analyzer
+
+
+def test_frames_are_built_once_and_typed():
+    analyzer = make_analyzer()
+    sales_df = analyzer._sales_df()
+    purchase_df = analyzer._purchase_df()
+
+    assert analyzer._sales_df() is sales_df
+    assert analyzer._purchase_df() is purchase_df
+    assert pd.api.types.is_datetime64_any_dtype(sales_df['date'])
+    assert isinstance(sales_df['customer'].dtype, pd.CategoricalDtype)
+    assert isinstance(purchase_df['supplier'].dtype, pd.CategoricalDtype)
+
+
+def test_frames_invalidated_when_data_changes():
+    analyzer = make_analyzer()
+    sales_df = analyzer._sales_df()
+
+    analyzer.sales_data = analyzer.sales_data[:3]
+    assert analyzer._sales_df() is not sales_df
+    assert len(analyzer._sales_df()) == 3
+
+    purchase_df = analyzer._purchase_df()
+    analyzer.purchase_data.pop()
+    analyzer.invalidate_frames()
+    assert analyzer._purchase_df() is not purchase_df
+    assert analyzer.analyze_purchase_data()['total_purchases'] == 4
+
+
+@pytest.mark.parametrize('suffix', ['parquet', 'arrow'])
+def test_columnar_ledgers_round_trip(tmp_path, suffix):
+    pytest.importorskip('pyarrow')
+    analyzer = make_analyzer()
+    analyzer.save_sales(tmp_path / f'sales.{suffix}')
+    analyzer.save_purchases(tmp_path / f'purchases.{suffix}')
+
+    loaded = RecycledItemsAnalyzer()
+    loaded.load_sales(tmp_path / f'sales.{suffix}')
+    loaded.load_purchases(tmp_path / f'purchases.{suffix}')
+    pd.testing.assert_frame_equal(loaded._sales_df(), analyzer._sales_df())
+    pd.testing.assert_frame_equal(loaded._purchase_df(), analyzer._purchase_df())
+    for method in ['analyze_sales_data', 'analyze_purchase_data', 'generate_cash_flow_data', 'generate_daily_heatmap_data']:
+        assert getattr(loaded, method)() == getattr(analyzer, method)()
+
+    projected = RecycledItemsAnalyzer()
+    projected.load_sales(tmp_path / f'sales.{suffix}', columns=['date', 'customer', 'totalRevenue'])
+    assert list(projected._sales_df().columns) == ['date', 'customer', 'totalRevenue']
+    assert projected.analyze_sales_data()['customer_revenue'] == analyzer.analyze_sales_data()['customer_revenue']
+
+
+def test_dashboard_export_evaluates_each_node_once():
+    analyzer = make_analyzer()
+    analyzer.generate_dashboard_data()
+
+    assert set(analyzer.graph.evaluations) == set(analyzer.graph.timings)
+    assert all(count == 1 for count in analyzer.graph.evaluations.values())
+    assert 'predictive_analytics' in analyzer.graph.timing_report()
+
+    analyzer.sales_data = analyzer.sales_data[:10]
+    analyzer.calculate_profit_margin()
+    assert analyzer.graph.evaluations['sales_analysis'] == 2
+    assert analyzer.graph.evaluations['purchase_analysis'] == 2
+
+
+def test_item_metrics_match_row_wise_sums():
+    analyzer = make_analyzer()
+    profit_margin_data = analyzer.generate_profit_margin_data()
+    item_totals = analyzer.analyze_sales_data()['item_totals']
+
+    assert list(profit_margin_data) == analyzer.items.items
+    for item in analyzer.items:
+        revenue = sum(sale.get(item, 0) * analyzer.get_item_price(item) for sale in analyzer.sales_data)
+        assert abs(profit_margin_data[item]['revenue'] - revenue) < 1e-6
+        assert abs(item_totals[item] - sum(sale.get(item, 0) for sale in analyzer.sales_data)) < 1e-9
+
+
+def test_counterparty_analyses_match_per_customer_masks():
+    analyzer = make_analyzer()
+    df = analyzer._sales_df()
+    behavior = analyzer.analyze_customer_behavior()
+
+    for customer in df['customer'].unique():
+        rows = df[df['customer'] == customer]
+        expected = sorted(((item, rows[item].sum()) for item in analyzer.items), key=lambda x: x[1], reverse=True)[:3]
+        assert behavior['customer_preferences'][customer] == expected
+        assert behavior['customer_frequency'][customer] == len(rows)
+
+    suppliers = analyzer.analyze_supplier_performance()
+    assert suppliers['supplier_reliability']['Supplier A'] == 100
+    assert suppliers['supplier_quality']['Local Collection'] == 3 * 7.7
+
+
+def test_model_zoo_fits_concurrently_with_timings():
+    serial = RecycledItemsAnalyzer(model_workers=1)
+    serial.load_sample_data()
+    pooled = RecycledItemsAnalyzer(model_executor='process')
+    pooled.load_sample_data()
+    expected = serial.generate_predictive_analytics()
+    result = pooled.generate_predictive_analytics()
+
+    assert result['sales_forecast'] == expected['sales_forecast']
+    assert result['dropped_models'] == []
+    for name, metrics in result['model_performance'].items():
+        assert metrics['r2_score'] == expected['model_performance'][name]['r2_score']
+        assert metrics['fit_seconds'] > 0 and metrics['predict_seconds'] > 0
+
+
+def test_time_budget_drops_stragglers():
+    tasks = {'fast': (sum, ([1, 2],)), 'slow': (time.sleep, (2,)), 'failing': (int, ('x',))}
+    start = time.perf_counter()
+    results, errors, dropped = run_with_budget(tasks, workers=3, time_budget=0.2)
+
+    assert time.perf_counter() - start < 1.5
+    assert results == {'fast': 3}
+    assert isinstance(errors['failing'], ValueError)
+    assert dropped == ['slow']
+
+
+def test_dropped_process_tasks_do_not_hold_up_exit():
+    code = ("import time; from model_pool import run_with_budget; "
+            "print(run_with_budget({'fast': (sum, ([1, 2],)), 'slow': (time.sleep, (30,))}, "
+            "executor='process', workers=2, time_budget=0.5)[2])")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+
+    assert result.stdout.strip() == "['slow']"
+    assert time.perf_counter() - start < 10
+
+
+def test_headless_analyzer_reports_only_through_progress(capsys):
+    messages = []
+    analyzer = RecycledItemsAnalyzer(model_time_budget=1e-4, progress=messages.append)
+    analyzer.load_sample_data()
+    results = analyzer.generate_dashboard_data()
+
+    assert capsys.readouterr().out == ''
+    assert any(message.startswith('Dropped ') for message in messages)
+    lines = []
+    render_recycled_summary(results, lines.append)
+    assert f"   - Total Transactions: {len(analyzer.sales_data)}" in lines
+
+
+def test_model_cache_skips_training_on_unchanged_data(tmp_path):
+    first = RecycledItemsAnalyzer(model_cache=str(tmp_path))
+    first.load_sample_data()
+    expected = first.generate_predictive_analytics()
+
+    second = RecycledItemsAnalyzer(model_cache=str(tmp_path))
+    second.load_sample_data()
+    second._train_multiple_models = None  # a cache hit must not retrain
+    assert second.generate_predictive_analytics() == expected
+    assert second.model_cache.hits == 1
+
+    second.invalidate_model_cache()
+    assert second.model_cache.entries() == []
+
+
+def test_model_cache_evicts_least_recently_used(tmp_path):
+    cache = ModelCache(str(tmp_path), max_entries=2)
+    for key in ['a', 'b']:
+        cache.put(key, {'models': key})
+        time.sleep(0.01)
+    cache.get('a')
+    cache.put('c', {'models': 'c'})
+
+    assert sorted(key for key, _, _ in cache.entries()) == ['a', 'c']
+    assert cache.get('b') is None
+
+
+def test_sklearn_is_not_imported_at_startup():
+    code = "import sys, recycled_items_analyzer; print('sklearn' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.stdout.strip() == 'False'
+
+
+def test_recursive_forecast_rolls_features_for_many_series():
+    analyzer = make_analyzer()
+    df = analyzer._sales_df().sort_values('date')
+    feature_columns = ['day_of_week', 'revenue_lag1', 'revenue_lag2', 'revenue_ma3', 'revenue_squared']
+    X = np.column_stack([df['date'].dt.dayofweek, df['totalRevenue'].shift(1), df['totalRevenue'].shift(2),
+                         df['totalRevenue'].rolling(3).mean(), df['totalRevenue'] ** 2])[3:]
+    model = LinearRegression().fit(X, df['totalRevenue'].to_numpy()[3:])
+    forecaster = RecursiveForecaster(model, feature_columns)
+
+    history = df['totalRevenue'].to_numpy()
+    histories = np.vstack([history, history * 0.5, history[::-1]])
+    sweep = forecaster.forecast(histories, df['date'].max(), horizon=10)
+    for row, series in zip(sweep, histories):
+        assert np.allclose(row, forecaster.forecast(series, df['date'].max(), horizon=10)[0])
+
+    # Day 2 sees day 1's prediction as its lag and in its moving average
+    day2 = [(df['date'].max() + pd.Timedelta(days=2)).dayofweek, sweep[0, 0], history[-1],
+            (history[-2] + history[-1] + sweep[0, 0]) / 3, sweep[0, 0] ** 2]
+    assert np.isclose(sweep[0, 1], model.predict(np.array([day2]))[0])
+
+
+def test_batched_trends_match_per_series_regressions():
+    analyzer = make_analyzer()
+    forecasts = analyzer.generate_predictive_analytics()['item_forecasts']
+    df = analyzer._sales_df()
+
+    for item in analyzer.items:
+        y = df[item].fillna(0).to_numpy(dtype=float)
+        X = np.arange(len(y)).reshape(-1, 1)
+        model = LinearRegression().fit(X, y)
+        expected = model.predict(np.arange(len(y), len(y) + 90).reshape(-1, 1))
+        assert np.allclose(forecasts[item]['next_7_days'], expected[:7])
+        assert np.isclose(forecasts[item]['projection_90_days'], expected[-1])
+        assert np.isclose(forecasts[item]['confidence'], model.score(X, y))
+
+    # Ragged per-customer series are fitted against sale dates in one grouped pass
+    customers = analyzer._forecast_by_customer()
+    for customer, rows in df.groupby('customer', observed=True):
+        if rows['date'].nunique() < 2:
+            assert customer not in customers
+            continue
+        X = (rows['date'] - df['date'].min()).dt.days.to_numpy().reshape(-1, 1)
+        model = LinearRegression().fit(X, rows['totalRevenue'])
+        assert np.isclose(customers[customer]['trend_strength'], abs(model.coef_[0]))
+        assert np.isclose(customers[customer]['next_7_days'][0], model.predict(X.max() + np.array([[1]]))[0])
+
+    # A sale without a customer is left out of every customer's trend
+    analyzer.sales_data = analyzer.sales_data + [{**analyzer.sales_data[-1], 'customer': None}]
+    assert analyzer._forecast_by_customer() == customers
+
+
+def test_streaming_and_backfill_anomalies_agree():
+    rng = np.random.default_rng(3)
+    values = rng.normal(8000, 500, 2000)
+    values[rng.integers(50, 2000, 25)] *= 2.5
+    values[1000:] += 3000  # a level shift should be flagged briefly, not forever
+    values[rng.integers(0, 2000, 10)] = np.nan
+
+    backfilled = StreamingAnomalyDetector()
+    events = backfilled.backfill(values)
+    streamed = StreamingAnomalyDetector()
+    streamed_events = [event for value in values if (event := streamed.update(value)) is not None]
+
+    assert 25 <= len(events) < 100
+    assert [event['index'] for event in events] == [event['index'] for event in streamed_events]
+    for event, other in zip(events, streamed_events):
+        np.testing.assert_allclose(event['expected_range'], other['expected_range'])
+        np.testing.assert_allclose(event['robust_range'], other['robust_range'])
+        assert event['severity'] == other['severity']
+    assert np.isclose(backfilled.mean, streamed.mean) and np.isclose(backfilled.m2, streamed.m2)
+    assert list(backfilled.recent) == list(streamed.recent)
+    # Earlier events never change as history grows
+    assert StreamingAnomalyDetector().backfill(values[:1500]) == [e for e in events if e['index'] < 1500]
+
+
+def test_profiler_attributes_model_training_to_the_forecast():
+    profiler = Profiler(trace_memory=False)
+    analyzer = RecycledItemsAnalyzer(profiler=profiler)
+    analyzer.load_sample_data()
+    analyzer.generate_predictive_analytics()
+
+    predictive = profiler.spans[-1]
+    children = {span.name: span for span in predictive.children}
+    assert predictive.name == 'predictive_analytics' and predictive.rows == len(analyzer.sales_data)
+    # Trained on the split of rows left after the lag and moving-average features
+    assert 0 < children['_train_multiple_models'].rows < len(analyzer.sales_data)
+    assert children['_train_multiple_models'].peak_bytes is None
+    assert any(line.startswith('predictive_analytics;_train_multiple_models ')
+               for line in profiler.collapsed_stacks())
+
+
+def test_compact_dtypes_match_default_results():
+    default = make_analyzer()
+    compact = RecycledItemsAnalyzer(progress=None, compact_dtypes=True)
+    compact.load_sample_data()
+
+    sales, purchases = compact._sales_df(), compact._purchase_df()
+    assert isinstance(purchases['registration'].dtype, pd.CategoricalDtype)
+    assert sales['iron'].dtype == np.float32 and sales['totalRevenue'].dtype != np.float32
+    for name in ('sales', 'purchases'):
+        assert 0 < compact.memory_usage[name]['after_bytes'] < compact.memory_usage[name]['before_bytes']
+
+    for node in ('sales_analysis', 'purchase_analysis', 'financial_analysis', 'environmental_impact'):
+        expected, actual = default.graph.evaluate(node), compact.graph.evaluate(node)
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, dict) and all(isinstance(v, (int, float)) for v in value.values()):
+                assert actual[key] == pytest.approx(value, rel=1e-6)
+            elif isinstance(value, (int, float, np.number)):
+                assert actual[key] == pytest.approx(value, rel=1e-6)
+
+
+def test_period_queries_slice_each_ledger():
+    analyzer = make_analyzer()
+    start, end = '2024-01-16', '2024-01-24'
+    in_period = [sale for sale in analyzer.sales_data if start <= sale['date'] <= end]
+
+    sales = analyzer.analyze_sales_data(start=start, end=end)
+    assert sales['total_transactions'] == len(in_period)
+    assert sales['total_revenue'] == sum(sale['totalRevenue'] for sale in in_period)
+    # Counterparties without a sale in the period are left out, not counted as 0
+    assert sales['customer_transactions'] == pd.Series([sale['customer'] for sale in in_period]).value_counts().to_dict()
+    assert set(sales['customer_transactions']) == set(sales['customer_revenue'])
+    factory_a = analyzer.analyze_sales_data(end=end, customer='Factory A')
+    assert factory_a['customer_revenue'] == {'Factory A': sum(
+        sale['totalRevenue'] for sale in analyzer.sales_data if sale['date'] <= end and sale['customer'] == 'Factory A')}
+
+    # Purchase filters leave the sales ledger limited to the period only
+    view = analyzer.period(start=start, truck='4348')
+    assert [purchase['registration'] for purchase in view.purchase_data] == ['4348']
+    assert len(view.sales_data) == sum(sale['date'] >= start for sale in analyzer.sales_data)
+    supplier_a = analyzer.analyze_supplier_performance(supplier='Supplier A', end='2024-01-15')
+    assert supplier_a['supplier_cost'] == {'Supplier A': 8000.0}
+    assert analyzer.analyze_supplier_performance(supplier='Supplier A', start='2024-01-16') == {}
+    assert analyzer.analyze_sales_data()['total_transactions'] == len(analyzer.sales_data)
+    with pytest.raises(ValueError):
+        analyzer.period(station='north')
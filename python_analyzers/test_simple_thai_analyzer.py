@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Tests for SimpleThaiTruckAnalyzer internals.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import create_real_data
+import json_export
+from console_report import render
+from create_real_data import COLUMNS, generate_weigh_logs, write_station_logs, write_weigh_logs
+from json_export import write_json
+from ledger_store import convert_weigh_workbook
+from profiling import Profiler
+from simple_thai_analyzer import SimpleThaiTruckAnalyzer
+from weigh_aggregates import WeighLogAggregates
+from weigh_results import TruckAnalysis, WeighReport
+from workbook_cache import load_weigh_workbook, sidecar_path
+from workbook_ingest import ingest_workbooks
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thai_truck_weigh_logs_real_2568.xlsx')
+
+
+def make_analyzer(df=None):
+    if df is None:
+        df = pd.read_excel(DATA_FILE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return SimpleThaiTruckAnalyzer(df=df)
+
+
+def quietly(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def test_parse_stage_splits_column_l_and_times():
+    df = pd.read_excel(DATA_FILE)
+    l_col, time_in_col, time_out_col = df.columns[11], df.columns[3], df.columns[4]
+    df.loc[0, l_col] = 'CLIENT-7 - metal - 1,250.50 THB'
+    df.loc[0, time_in_col], df.loc[0, time_out_col] = '23.58.00', '24.08.10'
+    analyzer = make_analyzer(df)
+    first = analyzer.df_clean.iloc[0]
+
+    assert first['client'] == 'CLIENT-7'
+    assert first['waste_type'] == 'metal'
+    assert first['client_tagged']
+    assert first['redemption_value'] == 1250.50
+    assert first['time_in_seconds'] == 23 * 3600 + 58 * 60
+    assert first['time_out_seconds'] == 8 * 60 + 10
+    assert first['processing_minutes'] == 10
+
+
+def test_client_and_waste_analyses_use_parsed_columns():
+    analyzer = make_analyzer()
+    waste = quietly(analyzer.waste_management_analysis)['waste_types']
+
+    assert sum(entry['count'] for entry in waste.values()) == len(analyzer.df_clean)
+    assert quietly(analyzer.client_pricing_analysis).empty
+    assert 'client' not in quietly(analyzer.prepare_raw_data_for_dashboard)[0]
+
+
+def test_columnar_raw_data_round_trips_to_rows():
+    analyzer = make_analyzer()
+    rows = analyzer.prepare_raw_data_for_dashboard()
+    encoded = analyzer.prepare_raw_data_for_dashboard('columnar')
+
+    def decode(column):
+        if isinstance(column, list):
+            return column
+        if 'dict' in column:
+            return [column['dict'][code] for code in column['codes']]
+        return [prefix + suffix for prefix, suffix in zip(decode(column['prefix']), column['suffix'])]
+
+    columns = {field: decode(column) for field, column in encoded['columns'].items()}
+    decoded = [{field: columns[field][i] for field in columns} for i in range(encoded['length'])]
+    assert decoded == rows
+    assert len(encoded['columns']['license']['dict']) == analyzer.df_clean[analyzer.thai_columns['license_plate']].nunique()
+
+
+def test_json_export_matches_json_dump_for_every_destination(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_export, 'CHUNK_ROWS', 64)  # several rawData slices
+    analyzer = make_analyzer()
+    raw = analyzer.raw_data_frame()
+    hours = quietly(analyzer.time_pattern_analysis)
+    data = {'rawData': raw, 'hourly': hours.to_dict(), 'peak': np.int64(hours.idxmax()),
+            'daily': {pd.Timestamp('2025-07-01'): np.float64(1.5)}, 'empty': []}
+    expected = {'rawData': raw.to_dict('records'), 'hourly': hours.to_dict(), 'peak': int(hours.idxmax()),
+                'daily': {'2025-07-01 00:00:00': 1.5}, 'empty': []}
+
+    paths = [str(tmp_path / 'dashboard_data.json'), str(tmp_path / 'copy.json'), str(tmp_path / 'missing' / 'copy.json')]
+    for compact, options in [(False, {'indent': 2}), (True, {'separators': (',', ':')})]:
+        failed = write_json(data, paths, compact=compact)
+        assert list(failed) == [paths[2]]
+        with open(paths[0], encoding='utf-8') as f:
+            assert f.read() == json.dumps(expected, ensure_ascii=False, **options)
+        with open(paths[0], 'rb') as f, open(paths[1], 'rb') as g:
+            assert f.read() == g.read()
+
+
+def test_incremental_append_matches_full_recompute(tmp_path):
+    df = pd.read_excel(DATA_FILE)
+    full = make_analyzer(df)
+    # Split mid-way through a day so its partials must be re-folded with the earlier rows
+    incremental = make_analyzer(df.iloc[:100])
+    state_path = tmp_path / 'weigh_state.pkl'
+    quietly(incremental.save_incremental_state, state_path)
+    incremental = SimpleThaiTruckAnalyzer.from_incremental_state(state_path)
+    quietly(incremental.append_rows, df.iloc[100:250])
+    quietly(incremental.append_rows, df.iloc[250:])
+
+    pd.testing.assert_frame_equal(incremental.df_clean, full.df_clean)
+    for table in incremental.aggregates.tables:
+        expected = getattr(full.aggregates, table)
+        actual = getattr(incremental.aggregates, table)
+        assert actual.equals(expected) and actual.index.equals(expected.index)
+    for method in ['daily_analysis', 'truck_analysis', 'capacity_utilization_analysis', 'pricing_strategy_analysis']:
+        pd.testing.assert_frame_equal(quietly(getattr(incremental, method)), quietly(getattr(full, method)), check_exact=True)
+    pd.testing.assert_series_equal(quietly(incremental.time_pattern_analysis), quietly(full.time_pattern_analysis))
+    assert incremental.aggregates.price_summary() == full.aggregates.price_summary()
+    assert quietly(incremental.anomaly_analysis) == quietly(full.anomaly_analysis)
+    for method in ['waste_management_analysis', 'operational_efficiency_analysis', 'strategic_business_intelligence']:
+        assert quietly(getattr(incremental, method)) == quietly(getattr(full, method))
+
+
+def test_nightly_update_reads_and_writes_only_new_rows(tmp_path):
+    df = generate_weigh_logs(days=12, seed=3)
+    new_rows = generate_weigh_logs(days=1, seed=4, start_date='2025-07-12')
+    prefix, workbook = str(tmp_path / 'prefix.xlsx'), str(tmp_path / 'weigh_logs.xlsx')
+    write_weigh_logs(df, prefix)
+    write_weigh_logs(pd.concat([df, new_rows], ignore_index=True), workbook)
+    state_path = str(tmp_path / 'state.pkl')
+    rows_dir = SimpleThaiTruckAnalyzer.rows_directory(state_path)
+    SimpleThaiTruckAnalyzer.update_from_workbook(prefix, state_path, progress=None)
+    saved = {name: os.stat(os.path.join(rows_dir, name)).st_mtime_ns for name in os.listdir(rows_dir)}
+
+    messages = []
+    updated = SimpleThaiTruckAnalyzer.update_from_workbook(workbook, state_path, progress=messages.append)
+    # The last day of the prefix continues in the new rows, so its chunk is read but not rewritten
+    assert messages[0] == f"Incremental update: {(new_rows[COLUMNS[1]] != 'รวม').sum()} new rows since last run"
+    assert updated._df is None and updated._df_clean is None
+    assert len(os.listdir(rows_dir)) == len(saved) + 1
+    assert all(os.stat(os.path.join(rows_dir, name)).st_mtime_ns == mtime for name, mtime in saved.items())
+
+    full = make_analyzer(load_weigh_workbook(workbook, use_cache=False)[0])
+    pd.testing.assert_frame_equal(updated.df_clean, full.df_clean)
+    for table in full.aggregates.tables:
+        assert getattr(updated.aggregates, table).equals(getattr(full.aggregates, table))
+
+    # A changed row that was already processed means a full run, which replaces the chunks
+    changed = df.copy()
+    changed.loc[3, COLUMNS[5]] = 99.0
+    write_weigh_logs(pd.concat([changed, new_rows], ignore_index=True), workbook)
+    messages.clear()
+    rerun = SimpleThaiTruckAnalyzer.update_from_workbook(workbook, state_path, progress=messages.append)
+    assert "Previously processed rows changed, running full analysis" in messages
+    assert rerun.df_clean[COLUMNS[5]].iloc[3] == 99.0
+    assert len(os.listdir(rows_dir)) == 1
+
+
+def test_analyses_are_computed_once_per_cleaned_frame():
+    df = pd.read_excel(DATA_FILE)
+    analyzer = make_analyzer(df.iloc[:200])
+    truck_stats = quietly(analyzer.truck_analysis)
+    quietly(analyzer.fleet_optimization_analysis)
+    quietly(analyzer.strategic_business_intelligence)
+    assert quietly(analyzer.truck_analysis) is truck_stats
+    assert analyzer.graph.evaluations['truck_analysis'] == 1
+    assert quietly(analyzer.reuse_report)['truck_analysis'] == {'evaluations': 1, 'hits': 3}
+
+    # Appending rows replaces df_clean, so the next call recomputes over every row
+    quietly(analyzer.append_rows, df.iloc[200:])
+    pd.testing.assert_frame_equal(quietly(analyzer.truck_analysis), quietly(make_analyzer(df).truck_analysis))
+    assert analyzer.graph.evaluations['truck_analysis'] == 2
+
+
+def test_headless_results_render_the_console_report(capsys):
+    df = pd.read_excel(DATA_FILE)
+    headless = SimpleThaiTruckAnalyzer(df=df, progress=None)
+    report = headless.analyze()
+    assert capsys.readouterr().out == ''
+    assert isinstance(report.truck_analysis, TruckAnalysis)
+    assert report.waste_management_analysis.as_dict() == quietly(make_analyzer(df).waste_management_analysis)
+
+    # Rendering the results reproduces what the named analyses print
+    lines = []
+    for section in report.sections():
+        render(section, lines.append)
+    printed = make_analyzer(df)
+    for name in WeighReport.analyses():
+        getattr(printed, name)()
+    assert capsys.readouterr().out == ''.join(line + '\n' for line in lines)
+
+
+def test_dashboard_export_precomputes_what_the_page_scanned_rawdata_for(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    analyzer = make_analyzer()
+    quietly(analyzer.export_json_for_dashboard)
+    with open('dashboard_data.json', encoding='utf-8') as f:
+        data = json.load(f)
+    with open(data['rawDataUrl'], encoding='utf-8') as f:
+        rows = json.load(f)['rawData']
+
+    assert 'rawData' not in data
+    assert rows == analyzer.prepare_raw_data_for_dashboard()
+    kpis = data['kpis']
+    assert kpis['totalRecords'] == len(rows)
+    assert kpis['uniqueTrucks'] == len({row['license'] for row in rows})
+    assert kpis['uniqueDates'] == len({row['date'].split(' ')[0] for row in rows})
+    assert kpis['highValueOperations'] == sum(row['pricePerTon'] > 1500 for row in rows)
+    assert kpis['avgGarbageWeight'] == pytest.approx(np.mean([row['garbageWeight'] for row in rows]))
+    assert sum(data['charts']['daily']['operations']) == sum(data['charts']['redemptionDistribution']['counts']) == len(rows)
+    assert sum(tier['operations'] for tier in data['pricingTiers']) == len(rows)
+    matching = sum(abs(row['redeemable'] * row['pricePerTon'] / 1000 - row['totalRedemptionValue']) < 0.01 for row in rows)
+    assert data['validation']['matchingRecords'] == matching
+
+
+def test_raw_data_url_resolves_from_the_dashboard_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'out').mkdir()
+    analyzer = make_analyzer()
+    quietly(analyzer.export_json_for_dashboard, os.path.join('out', 'dashboard_data.json'))
+    with open(tmp_path / 'out' / 'dashboard_data.json', encoding='utf-8') as f:
+        data = json.load(f)
+
+    assert data['rawDataUrl'] == 'dashboard_raw_data.json'
+    with open(tmp_path / 'out' / data['rawDataUrl'], encoding='utf-8') as f:
+        assert len(json.load(f)['rawData']) == len(analyzer.df_clean)
+    assert not (tmp_path / 'dashboard_raw_data.json').exists()
+
+
+def test_aggregates_match_row_wise_statistics():
+    analyzer = make_analyzer()
+    df, cols = analyzer.df_clean, analyzer.thai_columns
+    prices = analyzer.aggregates.price_summary()
+
+    assert abs(prices['mean'] - df[cols['price_per_ton']].mean()) < 1e-9
+    assert abs(prices['std'] - df[cols['price_per_ton']].std()) < 1e-9
+    for q, value in prices['quantiles'].items():
+        assert value == df[cols['price_per_ton']].quantile(q)
+    daily = df.groupby(cols['date'])[cols['total_weight']].agg(['count', 'sum']).round(2)
+    assert (analyzer.aggregates.daily_stats()[['Records', 'Total_Weight_Sum']].to_numpy() == daily.to_numpy()).all()
+
+
+def test_columnar_weigh_log_loads_like_the_workbook(tmp_path):
+    pytest.importorskip('pyarrow')
+    workbook = make_analyzer()
+    for suffix in ['parquet', 'arrow']:
+        path = str(tmp_path / f'weigh_log.{suffix}')
+        convert_weigh_workbook(DATA_FILE, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            columnar = SimpleThaiTruckAnalyzer(path)
+
+        pd.testing.assert_frame_equal(columnar.df, workbook.df)
+        pd.testing.assert_frame_equal(columnar.df_clean, workbook.df_clean)
+
+
+def test_workbook_sidecar_cache_tracks_workbook_content(tmp_path):
+    pytest.importorskip('pyarrow')
+    import openpyxl
+
+    path = str(tmp_path / 'weigh_logs.xlsx')
+    shutil.copy(DATA_FILE, path)
+    expected = pd.read_excel(path)
+    expected = expected[expected[expected.columns[1]] != 'รวม'].reset_index(drop=True)
+
+    df, cached = load_weigh_workbook(path)
+    assert not cached and os.path.exists(sidecar_path(path))
+    pd.testing.assert_frame_equal(df, expected)
+    df, cached = load_weigh_workbook(path)
+    assert cached
+    pd.testing.assert_frame_equal(df, expected)
+
+    # Touching the workbook re-hashes it but keeps the sidecar
+    os.utime(path, (0, 0))
+    assert load_weigh_workbook(path)[1]
+
+    workbook = openpyxl.load_workbook(path)
+    workbook.active.append(list(expected.iloc[0]))
+    workbook.save(path)
+    df, cached = load_weigh_workbook(path)
+    assert not cached and len(df) == len(expected) + 1
+
+
+def test_workbook_with_a_numeric_plate_loads_with_or_without_its_sidecar(tmp_path):
+    pytest.importorskip('pyarrow')
+    import openpyxl
+
+    path = str(tmp_path / 'weigh_logs.xlsx')
+    workbook = openpyxl.load_workbook(DATA_FILE)
+    sheet = workbook.active
+    plate_col = [cell.value for cell in sheet[1]].index('เลขทะเบียนรถ') + 1
+    sheet.cell(row=2, column=plate_col, value=12345)
+    workbook.save(path)
+
+    for cached in [False, True]:
+        df, from_cache = load_weigh_workbook(path)
+        assert from_cache == cached
+        assert df['เลขทะเบียนรถ'].iloc[0] == '12345'
+    assert sorted(os.listdir(tmp_path)) == ['weigh_logs.xlsx', 'weigh_logs.xlsx.arrow']
+    # Readable by whoever can read the workbook, not only by the user who wrote it
+    assert os.stat(sidecar_path(path)).st_mode & 0o777 == os.stat(path).st_mode & 0o777
+
+    analyzer = quietly(SimpleThaiTruckAnalyzer, path)
+    assert '12345' in analyzer.aggregates.truck_stats().index
+
+
+def test_workbooks_from_many_stations_ingest_into_one_analyzer(tmp_path):
+    for station in ['north', 'south']:
+        (tmp_path / station).mkdir()
+        for month in ['2568-07', '2568-08']:
+            shutil.copy(DATA_FILE, tmp_path / station / f'{month}.xlsx')
+
+    analyzer = quietly(SimpleThaiTruckAnalyzer.from_workbooks, str(tmp_path), workers=2)
+    single = make_analyzer()
+
+    assert len(analyzer.ingest_timings) == 4
+    assert isinstance(analyzer.df_clean['station'].dtype, pd.CategoricalDtype)
+    assert isinstance(analyzer.df_clean['source_file'].dtype, pd.CategoricalDtype)
+    counts = analyzer.df_clean.groupby(['station', 'source_file'], observed=True).size()
+    assert counts.to_dict() == {(station, f'{month}.xlsx'): len(single.df_clean)
+                                for station in ['north', 'south'] for month in ['2568-07', '2568-08']}
+    daily = quietly(analyzer.daily_analysis)
+    assert (daily['Records'] == 4 * quietly(single.daily_analysis)['Records']).all()
+
+
+def test_ingesting_twice_skips_the_sidecars_of_macro_workbooks(tmp_path):
+    path = tmp_path / 'north_2568-07.xlsm'
+    shutil.copy(DATA_FILE, path)
+
+    first, _ = ingest_workbooks(str(tmp_path), executor='thread', progress=None)
+    assert os.path.exists(sidecar_path(path))
+    again, timings = ingest_workbooks(str(tmp_path), executor='thread', progress=None)
+    assert list(timings) == [str(path)] and timings[str(path)]['cached']
+    pd.testing.assert_frame_equal(again, first)
+
+
+def test_generated_logs_are_seeded_and_load_like_workbooks(tmp_path):
+    generated = generate_weigh_logs(days=5, stations=2, clients=3, rows_per_day=(20, 30), seed=11)
+    pd.testing.assert_frame_equal(generated, generate_weigh_logs(days=5, stations=2, clients=3, rows_per_day=(20, 30), seed=11))
+    log_number = generated[COLUMNS[1]]
+
+    # One รวม row after each station-day, totalling that day's weights and log count
+    summaries = generated[log_number == 'รวม']
+    assert len(summaries) == 10 and log_number.iloc[-1] == 'รวม'
+    day = (log_number == 'รวม').cumsum().shift(fill_value=0)
+    rows = generated[log_number != 'รวม'].groupby(day[log_number != 'รวม'])
+    assert summaries[COLUMNS[12]].tolist() == rows.size().tolist()
+    assert np.allclose(summaries[COLUMNS[5]], rows[COLUMNS[5]].sum().round(2))
+
+    paths = write_station_logs(generated, str(tmp_path), 'log.xlsx')
+    analyzer = quietly(SimpleThaiTruckAnalyzer.from_workbooks, str(tmp_path), workers=1)
+    in_memory = make_analyzer(generated.drop(columns='station'))
+    assert len(paths) == 2
+    pd.testing.assert_frame_equal(quietly(analyzer.truck_analysis), quietly(in_memory.truck_analysis))
+    assert len(quietly(analyzer.client_pricing_analysis)) == 2
+
+
+def test_generator_cli_handles_ranges_without_the_image_days(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    empty = generate_weigh_logs(days=3, rows_per_day=0, summary_rows=False)
+    assert empty.empty and empty.columns.tolist() == COLUMNS
+
+    # The image rows are only added when the generated days include 1-2 Jul 68
+    for argv, rows in [(['--start-date', '2025-08-01', '--days', '1', '--rows-per-day', '4'], 5),
+                       (['--rows-per-day', '0', '--no-image-rows'], 0)]:
+        monkeypatch.setattr(sys, 'argv', ['create_real_data.py', '--output', 'log.csv', *argv])
+        quietly(create_real_data.main)
+        assert len(pd.read_csv('log.csv')) == rows
+    monkeypatch.setattr(sys, 'argv', ['create_real_data.py', '--rows-per-day', '5-2'])
+    with pytest.raises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+        create_real_data.main()
+
+
+def test_profiler_records_nested_stage_spans(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = pd.read_excel(DATA_FILE)
+    profiler = Profiler()
+    analyzer = SimpleThaiTruckAnalyzer(df=df, progress=None, profiler=profiler)
+    analyzer.export_json_for_dashboard()
+
+    setup, export = profiler.spans
+    assert [span.name for span in setup.children] == ['clean_rows', 'build_anomaly_detectors']
+    assert setup.rows == len(df) and export.rows == len(analyzer.df_clean)
+    assert 'truck_analysis' in [span.name for span in export.children]
+    for span in [setup, export, *export.children]:
+        assert span.wall_seconds >= sum(child.wall_seconds for child in span.children)
+        assert span.cpu_seconds >= 0 and span.peak_bytes >= 0
+
+    lines = profiler.collapsed_stacks()
+    assert 'setup_data;clean_rows;parse_times' in [line.rsplit(' ', 1)[0] for line in lines]
+    assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+    json_path, folded_path = profiler.write(str(tmp_path / 'profile'))
+    with open(json_path, encoding='utf-8') as f:
+        assert json.load(f)['spans'][1]['children'][0]['name'] == export.children[0].name
+
+    # Without a profiler nothing is recorded and results are unchanged
+    plain = SimpleThaiTruckAnalyzer(df=df, progress=None)
+    assert plain.profiler is None and plain.graph.profiler is None
+    pd.testing.assert_frame_equal(plain.analysis('truck_analysis').truck_stats,
+                                  analyzer.analysis('truck_analysis').truck_stats)
+
+
+def test_compact_dtypes_match_default_results():
+    df = generate_weigh_logs(days=20, trucks=12, clients=3, seed=5)
+    analyzers = {}
+    for compact in (False, True):
+        analyzer = SimpleThaiTruckAnalyzer(df=df.iloc[:-40], progress=None, compact_dtypes=compact)
+        analyzer.append_rows(df.iloc[-40:])
+        analyzers[compact] = analyzer
+    default, compact = analyzers[False], analyzers[True]
+
+    cols, clean = compact.thai_columns, compact.df_clean
+    assert isinstance(clean[cols['license_plate']].dtype, pd.CategoricalDtype)
+    assert clean[cols['total_weight']].dtype == np.float32
+    assert clean['time_in_seconds'].dtype == 'Int32' and clean[cols['log_count']].dtype == 'Int32'
+    usage = compact.memory_usage['df_clean']
+    assert 0 < usage['after_bytes'] < usage['before_bytes']
+    assert default.memory_usage == {}
+
+    # Statistics rounded to 2 decimals may differ in their last digit
+    for name, table in [('daily_analysis', 'daily_stats'), ('truck_analysis', 'truck_stats'),
+                        ('client_pricing_analysis', 'client_pricing')]:
+        pd.testing.assert_frame_equal(getattr(compact.analysis(name), table), getattr(default.analysis(name), table),
+                                      check_dtype=False, rtol=1e-5, atol=0.01)
+    expected, actual = default.analysis('basic_statistics'), compact.analysis('basic_statistics')
+    assert actual.license_plates == expected.license_plates
+    assert actual.avg_total_weight == pytest.approx(expected.avg_total_weight, rel=1e-6)
+    assert actual.total_redemption_value == expected.total_redemption_value
+    assert compact.analysis('operational_efficiency_analysis') == default.analysis('operational_efficiency_analysis')
+    anomalies = {name: analyzer.analysis('anomaly_analysis').series for name, analyzer in analyzers.items()}
+    assert [s['anomalyCount'] for s in anomalies[True].values()] == [s['anomalyCount'] for s in anomalies[False].values()]
+
+
+def test_period_queries_match_masked_rows():
+    # Two stations are concatenated, so the cleaned rows are not in date order
+    df = generate_weigh_logs(days=20, stations=2, trucks=10, clients=3, seed=4)
+    analyzer = make_analyzer(df)
+    cols, clean = analyzer.thai_columns, analyzer.df_clean
+    dates, plate = clean[cols['date']], clean[cols['license_plate']].iloc[0]
+    start, end = dates.min() + pd.Timedelta(days=4), dates.min() + pd.Timedelta(days=8)
+
+    in_period = (dates >= start) & (dates <= end)
+    for filters, mask in [({}, in_period),
+                          ({'station': 'station-02'}, in_period & (clean['station'] == 'station-02')),
+                          ({'truck': plate, 'station': 'station-01'},
+                           in_period & (clean[cols['license_plate']] == plate) & (clean['station'] == 'station-01'))]:
+        expected = WeighLogAggregates.from_frame(clean[mask], cols).truck_stats()
+        truck_stats = quietly(analyzer.truck_analysis, start=start, end=end, **filters)
+        pd.testing.assert_frame_equal(truck_stats, expected)
+        view = analyzer.period(start, end, **filters)
+        assert sorted(view.df_clean.index) == sorted(clean.index[mask])
+        assert analyzer.analysis('basic_statistics', start=start, end=end, **filters).total_records == mask.sum()
+
+    # Views are cached per query; full-history results are untouched
+    assert analyzer.period(start.strftime('%Y-%m-%d'), end, station='station-02') is analyzer.period(start, end, station='station-02')
+    assert analyzer.analysis('basic_statistics').total_records == len(clean)
+    assert len(analyzer.period(truck='no-such-truck').df_clean) == 0
+    assert len(analyzer.period(end=dates.min()).df_clean) == (dates == dates.min()).sum()
+    with pytest.raises(ValueError):
+        analyzer.period(customer='CLIENT-1')
+    with pytest.raises(ValueError):
+        make_analyzer(generate_weigh_logs(days=2, seed=1)).period(station='station-01')
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Closed-form least-squares trend lines for batches of series.
+Fits y = intercept + slope * x for every series at once from centred sums, instead of
+one estimator object per series: a matrix of equal-length series is one matrix
+product, and ragged series (e.g. one per customer) are grouped sums via np.bincount.
+"""
+
+import numpy as np
+
+
+class TrendFit:
+    """Slopes, intercepts and R² for a batch of fitted trend lines."""
+
+    def __init__(self, slope, intercept, r_squared, x_last):
+        self.slope = slope
+        self.intercept = intercept
+        self.r_squared = r_squared
+        self.x_last = x_last
+
+    def __len__(self):
+        return len(self.slope)
+
+    def project(self, steps, spacing=1):
+        """(n_series, steps) values at x_last + spacing, x_last + 2 * spacing, ..."""
+        x = self.x_last[:, None] + spacing * np.arange(1, steps + 1)
+        return self.intercept[:, None] + self.slope[:, None] * x
+
+
+def _r_squared(ss_res, ss_tot):
+    """1 - SS_res / SS_tot; a constant series scores 1 if fitted exactly, else 0."""
+    ss_res = np.maximum(ss_res, 0)
+    return np.where(ss_tot > 0, 1 - ss_res / np.where(ss_tot > 0, ss_tot, 1), np.where(ss_res > 0, 0.0, 1.0))
+
+
+def fit_trends(Y, x=None):
+    """Fit every column of Y (n_observations, n_series) against x (default 0..n-1)."""
+    Y = np.asarray(Y, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    n = Y.shape[0]
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    xc = x - x.mean()
+    y_mean = Y.mean(axis=0)
+    Yc = Y - y_mean
+    sxx = xc @ xc
+    slope = (xc @ Yc) / sxx if sxx > 0 else np.zeros(Y.shape[1])
+    residuals = Yc - np.outer(xc, slope)
+
+    return TrendFit(
+        slope=slope,
+        intercept=y_mean - slope * x.mean(),
+        r_squared=_r_squared((residuals ** 2).sum(axis=0), (Yc ** 2).sum(axis=0)),
+        x_last=np.full(Y.shape[1], x[-1] if n else 0.0)
+    )
+
+
+def fit_grouped_trends(x, y, codes, n_groups):
+    """Fit one line per group for ragged series given as flat (x, y, group code) arrays.
+
+    Groups with fewer than two distinct x values get slope 0 through their mean.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    codes = np.asarray(codes)
+
+    def group_sum(values):
+        return np.bincount(codes, weights=values, minlength=n_groups)
+
+    counts = np.bincount(codes, minlength=n_groups)
+    safe_counts = np.maximum(counts, 1)
+    x_mean = group_sum(x) / safe_counts
+    y_mean = group_sum(y) / safe_counts
+    xc = x - x_mean[codes]
+    yc = y - y_mean[codes]
+
+    sxx = group_sum(xc * xc)
+    sxy = group_sum(xc * yc)
+    slope = np.divide(sxy, sxx, out=np.zeros(n_groups), where=sxx > 0)
+    ss_res = group_sum((yc - slope[codes] * xc) ** 2)
+
+    x_last = np.full(n_groups, -np.inf)
+    np.maximum.at(x_last, codes, x)
+
+    return TrendFit(
+        slope=slope,
+        intercept=y_mean - slope * x_mean,
+        r_squared=_r_squared(ss_res, group_sum(yc * yc)),
+        x_last=x_last
+    )
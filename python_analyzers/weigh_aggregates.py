@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Mergeable partial aggregates for Thai truck weigh station logs.
+Weigh records are folded into partial tables keyed by (date, truck): counts, sums, sums of
+squares and min/max per measure, plus exact value-count sketches for price per ton,
+co-moments of garbage weight and price, and per-waste-type counts and values. A new day of
+logs only adds its own keys, and the daily, truck, hourly, client, pricing, waste,
+operational and portfolio statistics are derived from the partial tables rather than
+from every row.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class WeighLogAggregates:
+    """Partial aggregates of a cleaned weigh log, keyed by (date, truck)."""
+
+    # Measures summarised per key (thai_columns keys), plus parsed columns when present
+    measures = ['total_weight', 'garbage_weight', 'redeemable_weight', 'price_per_ton', 'log_count']
+    parsed_measures = ['redemption_value', 'processing_minutes']
+    max_capacity = 15  # tons
+    underutilized_weight = 12  # tons
+    tables = ['keyed', 'hours', 'prices', 'clients', 'pairs', 'waste']
+
+    def __init__(self, thai_columns, keyed, hours, prices, clients, pairs, waste):
+        self.thai_columns = thai_columns
+        self.keyed = keyed
+        self.hours = hours
+        self.prices = prices
+        self.clients = clients
+        self.pairs = pairs
+        self.waste = waste
+
+    @classmethod
+    def from_frame(cls, df, thai_columns):
+        """Build partials from a cleaned frame (SimpleThaiTruckAnalyzer.df_clean)."""
+        date_col = thai_columns['date']
+        truck_col = thai_columns['license_plate']
+        price_col = thai_columns['price_per_ton']
+        # Compact frames (see compact_dtypes) hold plates as categories and measures as
+        # float32 or nullable ints; partials are keyed and summed in the default dtypes
+        trucks = df[truck_col]
+        if isinstance(trucks.dtype, pd.CategoricalDtype):
+            trucks = trucks.astype(object)
+        keys = [df[date_col], trucks]
+
+        values = pd.DataFrame({m: df[thai_columns[m]] for m in cls.measures}, index=df.index)
+        for col in cls.parsed_measures:
+            if col in df.columns:
+                values[col] = df[col]
+        narrow = [col for col in values.columns if values[col].dtype not in (np.float64, np.int64)]
+        if narrow:
+            values = values.astype({col: 'float64' for col in narrow})
+        price_values = values['price_per_ton'].rename(price_col)
+        squares = values.pow(2)
+
+        weight = values['total_weight']
+        flags = pd.DataFrame({
+            'at_capacity': weight >= cls.max_capacity,
+            'underutilized': weight < cls.underutilized_weight
+        }, index=df.index)
+
+        grouped = values.groupby(keys, dropna=False)
+        keyed = pd.concat([
+            grouped.size().rename('rows'),
+            grouped.count().add_suffix('_n'),
+            grouped.sum().add_suffix('_sum'),
+            squares.groupby(keys, dropna=False).sum().add_suffix('_sumsq'),
+            grouped.min().add_suffix('_min'),
+            grouped.max().add_suffix('_max'),
+            flags.groupby(keys, dropna=False).sum()
+        ], axis=1)
+
+        # Hour-of-day counts; only well-formed clock times have an hour bucket
+        timed = df['time_in_hour'].notna()
+        hours = df.loc[timed].groupby(
+            [df.loc[timed, date_col], trucks[timed], df.loc[timed, 'time_in_hour'].astype('int64').rename('hour')],
+            dropna=False
+        ).size()
+
+        # Exact price sketch: value counts of each distinct price, with the revenue at that price
+        priced = price_values.notna()
+        revenue = values.loc[priced, 'redemption_value'] if 'redemption_value' in values.columns else pd.Series(np.nan, index=df.index[priced])
+        price_keys = [df.loc[priced, date_col], trucks[priced], price_values[priced]]
+        price_groups = revenue.groupby(price_keys, dropna=False)
+        prices = pd.concat([
+            price_groups.size().rename('rows'),
+            price_groups.count().rename('revenue_n'),
+            price_groups.sum().rename('revenue_sum')
+        ], axis=1)
+
+        # Per-client price sketch over CLIENT- tagged rows
+        tagged = df['client_tagged'] & (df['l_parts'] >= 3)
+        client_keys = [df.loc[tagged, date_col], trucks[tagged],
+                       df.loc[tagged, 'client'].astype(object), price_values[tagged]]
+        clients = price_values[tagged].groupby(client_keys, dropna=False).size()
+
+        # Per-key means and co-moments of garbage weight and price, over rows with both
+        paired = values['garbage_weight'].notna() & values['price_per_ton'].notna()
+        pair_values = values.loc[paired, ['garbage_weight', 'price_per_ton']]
+        pair_keys = [df.loc[paired, date_col], trucks[paired]]
+        pair_groups = pair_values.groupby(pair_keys, dropna=False)
+        dx, dy = (pair_values - pair_groups.transform('mean')).T.to_numpy()
+        moments = pd.DataFrame({'garbage_weight_m2': dx * dx, 'price_per_ton_m2': dy * dy, 'comoment': dx * dy},
+                               index=pair_values.index)
+        pairs = pd.concat([
+            pair_groups.size().rename('n'),
+            pair_groups.mean().add_suffix('_mean'),
+            moments.groupby(pair_keys, dropna=False).sum()
+        ], axis=1)
+
+        # Rows and redemption value per waste type, with the first row of each and its CLIENT- tagged rows
+        typed = df['l_parts'] >= 2
+        waste_values = values.loc[typed, 'redemption_value'] if 'redemption_value' in values.columns else pd.Series(0.0, index=df.index[typed])
+        waste_keys = [df.loc[typed, date_col], trucks[typed], df.loc[typed, 'waste_type'].astype(object)]
+        waste_rows = pd.DataFrame({'value': waste_values, 'row': df.index[typed], 'tagged': tagged[typed]},
+                                  index=df.index[typed])
+        waste = waste_rows.groupby(waste_keys, dropna=False).agg(
+            rows=('value', 'size'), value_n=('value', 'count'), value_sum=('value', 'sum'),
+            first_row=('row', 'min'), tagged_rows=('tagged', 'sum')
+        )
+
+        return cls(thai_columns, keyed, hours, prices, clients, pairs, waste)
+
+    @property
+    def dates(self):
+        """Dates covered by the partials (may include NaT)."""
+        return self.keyed.index.get_level_values(0).unique()
+
+    def merge(self, other):
+        """Fold in partials for newer rows; other replaces any partials for the dates it covers."""
+        replaced = other.dates
+        merged = {}
+        for name in self.tables:
+            current = getattr(self, name)
+            kept = current[~current.index.get_level_values(0).isin(replaced)]
+            merged[name] = pd.concat([kept, getattr(other, name)]).sort_index()
+        return WeighLogAggregates(self.thai_columns, **merged)
+
+    def _measure_stats(self, level):
+        """Fold keyed partials over one key level into the daily/truck summary columns."""
+        grouped = self.keyed.groupby(level=level)
+        sums = grouped.sum()
+
+        stats = pd.DataFrame({
+            'Records': sums['total_weight_n'],
+            'Total_Weight_Sum': sums['total_weight_sum'],
+            'Avg_Weight': sums['total_weight_sum'] / sums['total_weight_n'],
+            'Total_Garbage': sums['garbage_weight_sum'],
+            'Total_Redeemable': sums['redeemable_weight_sum'],
+            'Avg_Price_Per_Ton': sums['price_per_ton_sum'] / sums['price_per_ton_n'],
+            'Total_Logs': sums['log_count_sum']
+        })
+        return stats, sums, grouped
+
+    def daily_stats(self):
+        """Per-date records, weight totals/means, average price and log counts."""
+        stats, _, _ = self._measure_stats(0)
+        return stats.round(2)
+
+    def truck_stats(self):
+        """Per-truck summary columns plus Total_Revenue."""
+        stats, sums, _ = self._measure_stats(1)
+        stats = stats.round(2)
+        if 'redemption_value_sum' in sums.columns:
+            stats['Total_Revenue'] = sums['redemption_value_sum'].round(2)
+        else:
+            stats['Total_Revenue'] = (stats['Total_Redeemable'] * stats['Avg_Price_Per_Ton'] / 1000).round(2)
+        return stats
+
+    def capacity_by_truck(self):
+        """Per-truck operations and mean/max/min total weight."""
+        _, sums, grouped = self._measure_stats(1)
+        capacity = pd.DataFrame({
+            'Operations': sums['total_weight_n'],
+            'Avg_Weight': sums['total_weight_sum'] / sums['total_weight_n'],
+            'Max_Weight': grouped['total_weight_max'].max(),
+            'Min_Weight': grouped['total_weight_min'].min()
+        }).round(2)
+        capacity['Capacity_Utilization_%'] = (capacity['Avg_Weight'] / self.max_capacity * 100).round(1)
+        return capacity
+
+    def capacity_summary(self):
+        """Fleet-wide average weight and capacity hit/underutilised counts."""
+        totals = self.keyed[['total_weight_sum', 'total_weight_n', 'at_capacity', 'underutilized']].sum()
+        return {
+            'average_weight': totals['total_weight_sum'] / totals['total_weight_n'],
+            'max_capacity_hits': int(totals['at_capacity']),
+            'underutilized': int(totals['underutilized'])
+        }
+
+    def measure_summary(self, measure):
+        """Count, sum, mean, min and max of one measure (a measures or parsed_measures name)."""
+        n = self.keyed[f'{measure}_n'].sum()
+        total = self.keyed[f'{measure}_sum'].sum()
+        return {
+            'n': int(n),
+            'sum': total,
+            'mean': total / n if n else np.nan,
+            'min': self.keyed[f'{measure}_min'].min(),
+            'max': self.keyed[f'{measure}_max'].max()
+        }
+
+    def weight_price_correlation(self):
+        """Pearson correlation of garbage weight and price per ton over rows with both."""
+        pairs = self.pairs
+        n = pairs['n'].sum()
+        if n < 2:
+            return np.nan
+        # Per-key co-moments are combined around the overall means (Chan et al.)
+        mean_x = (pairs['n'] * pairs['garbage_weight_mean']).sum() / n
+        mean_y = (pairs['n'] * pairs['price_per_ton_mean']).sum() / n
+        dx = pairs['garbage_weight_mean'] - mean_x
+        dy = pairs['price_per_ton_mean'] - mean_y
+        m2_x = pairs['garbage_weight_m2'].sum() + (pairs['n'] * dx * dx).sum()
+        m2_y = pairs['price_per_ton_m2'].sum() + (pairs['n'] * dy * dy).sum()
+        comoment = pairs['comoment'].sum() + (pairs['n'] * dx * dy).sum()
+        if m2_x <= 0 or m2_y <= 0:
+            return np.nan
+        return float(np.clip(comoment / np.sqrt(m2_x * m2_y), -1, 1))
+
+    def waste_types(self):
+        """Rows and total redemption value per waste type, in order of each type's first row.
+
+        A total is NaN when any of that type's rows has no redemption value.
+        """
+        grouped = self.waste.groupby(level=2)
+        sums = grouped[['rows', 'value_n', 'value_sum']].sum()
+        first_row = grouped['first_row'].min().sort_values(kind='stable')
+        waste_types = pd.DataFrame({
+            'count': sums['rows'],
+            'total_value': sums['value_sum'].where(sums['value_n'] == sums['rows'])
+        })
+        return waste_types.loc[first_row.index]
+
+    def portfolio_summary(self):
+        """Record, date and truck counts, total redemption value, and the CLIENT- tagged portfolio."""
+        index = self.keyed.index
+        tagged = self.waste.loc[self.waste['tagged_rows'] > 0]
+        return {
+            'records': int(self.keyed['rows'].sum()),
+            'dates': index.get_level_values(0).nunique(),
+            'trucks': index.get_level_values(1).nunique(),
+            'revenue': self.keyed['redemption_value_sum'].sum() if 'redemption_value_sum' in self.keyed.columns else 0,
+            'tagged_records': int(self.clients.sum()),
+            'clients': self.clients.index.get_level_values(2).nunique(),
+            'waste_types': tagged.index.get_level_values(2).nunique()
+        }
+
+    def hour_distribution(self):
+        """Operations per hour of day, sorted by hour."""
+        return self.hours.groupby(level='hour').sum().rename('count')
+
+    def price_counts(self):
+        """Exact price histogram: operations per distinct price, sorted by price."""
+        return self.prices['rows'].groupby(level=2).sum()
+
+    def price_summary(self, quantiles=(0.25, 0.5, 0.75)):
+        """Mean, range, sample standard deviation and linear-interpolated quantiles of price."""
+        counts = self.price_counts()
+        prices = counts.index.to_numpy(dtype=float)
+        weights = counts.to_numpy(dtype=float)
+        n = weights.sum()
+        if n == 0:
+            return {'mean': np.nan, 'range': np.nan, 'std': np.nan,
+                    'quantiles': {q: np.nan for q in quantiles}}
+
+        mean = (prices * weights).sum() / n
+        std = np.sqrt((weights * (prices - mean) ** 2).sum() / (n - 1)) if n > 1 else np.nan
+
+        # Sorted position k lives in the first bucket whose cumulative count exceeds k
+        cumulative = np.cumsum(counts.to_numpy())
+        def value_at(position):
+            return prices[np.searchsorted(cumulative, position, side='right')]
+
+        quantile_values = {}
+        for q in quantiles:
+            position = q * (n - 1)
+            lower = int(np.floor(position))
+            fraction = position - lower
+            low, high = value_at(lower), value_at(min(lower + 1, int(n) - 1))
+            quantile_values[q] = low + (high - low) * fraction
+
+        return {
+            'mean': mean,
+            'range': prices[-1] - prices[0],
+            'std': std,
+            'quantiles': quantile_values
+        }
+
+    def revenue_by_price(self):
+        """Operations with revenue, total revenue and revenue per operation at each price."""
+        sums = self.prices[['revenue_n', 'revenue_sum']].groupby(level=2).sum()
+        revenue = pd.DataFrame({
+            'Operations': sums['revenue_n'],
+            'Total_Revenue': sums['revenue_sum']
+        }).round(2)
+        revenue['Avg_Revenue_per_Op'] = (revenue['Total_Revenue'] / revenue['Operations']).round(2)
+        return revenue
+
+    def client_pricing(self):
+        """Per-client average/min/max price and operation count over CLIENT- tagged rows."""
+        sketch = self.clients.rename('rows').reset_index()
+        price_col = self.thai_columns['price_per_ton']
+        priced = sketch[price_col].notna()
+        sketch['priced_rows'] = sketch['rows'].where(priced, 0)
+        sketch['price_total'] = (sketch[price_col] * sketch['rows']).where(priced, 0)
+
+        grouped = sketch.groupby('client')
+        pricing = pd.DataFrame({
+            'Avg_Price_Per_Ton': grouped['price_total'].sum() / grouped['priced_rows'].sum(),
+            'Min_Price': grouped[price_col].min(),
+            'Max_Price': grouped[price_col].max(),
+            'Operations': grouped['priced_rows'].sum()
+        }).round(2)
+        return pricing
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Typed results of the Thai truck weigh station analyses.
+SimpleThaiTruckAnalyzer computes these without printing or writing anything. The Excel
+and JSON exports read them directly, and console_report renders the console report
+from them.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Optional
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ColumnProfile:
+    """Type and fill of one A-M column of the raw log."""
+    letter: str
+    name: str
+    dtype: str
+    non_null: int
+    unique: int
+    # First non-null values, kept for the first five columns only
+    samples: Optional[list] = None
+
+
+@dataclass(frozen=True)
+class ColumnStructure:
+    columns: list
+
+    def to_frame(self):
+        """The Column_Analysis export sheet."""
+        return pd.DataFrame({
+            'Column': [c.letter for c in self.columns],
+            'Column_Name': [c.name for c in self.columns],
+            'Data_Type': [c.dtype for c in self.columns],
+            'Non_Null_Count': [c.non_null for c in self.columns],
+            'Unique_Values': [c.unique for c in self.columns]
+        })
+
+
+@dataclass(frozen=True)
+class BasicStatistics:
+    total_records: int
+    date_min: object
+    date_max: object
+    unique_trucks: int
+    license_plates: list  # first ten distinct plates
+    avg_total_weight: float
+    avg_garbage_weight: float
+    avg_redeemable_weight: float
+    total_redemption_value: float
+    avg_redemption_value: float
+    # False when Column L values were missing and redeemable weight x price was used
+    redemption_from_column_l: bool
+    avg_price_per_ton: float
+    unique_clients: Optional[int] = None
+    waste_types: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class DailyAnalysis:
+    daily_stats: pd.DataFrame
+
+
+@dataclass(frozen=True)
+class TruckAnalysis:
+    truck_stats: pd.DataFrame
+
+
+@dataclass(frozen=True)
+class TimePattern:
+    hour_distribution: pd.Series
+
+
+@dataclass(frozen=True)
+class FleetOptimization:
+    fleet_performance: pd.DataFrame
+    top_revenue: pd.Series
+    top_operations: pd.Series
+    top_weight: pd.Series
+    # Truck counts per revenue tier: elite, high, good, needs_attention
+    tiers: dict
+
+
+@dataclass(frozen=True)
+class CapacityUtilization:
+    capacity_by_truck: pd.DataFrame
+    max_capacity: float
+    # None when the log has no total weight column
+    average_weight: Optional[float] = None
+    max_capacity_hits: int = 0
+    underutilized: int = 0
+
+    @property
+    def utilization_percent(self):
+        return self.average_weight / self.max_capacity * 100
+
+
+@dataclass(frozen=True)
+class PricingStrategy:
+    # None when the log has no price per ton column
+    prices: Optional[dict]
+    # None when Column L redemption values were not parsed
+    revenue_by_price: Optional[pd.DataFrame] = None
+
+
+@dataclass(frozen=True)
+class ClientPricing:
+    client_pricing: pd.DataFrame
+
+    @property
+    def min_price(self):
+        return self.client_pricing['Min_Price'].min()
+
+    @property
+    def max_price(self):
+        return self.client_pricing['Max_Price'].max()
+
+    @property
+    def spread_percent(self):
+        return (self.max_price - self.min_price) / self.client_pricing['Avg_Price_Per_Ton'].mean() * 100
+
+    @property
+    def top_payer(self):
+        return self.client_pricing['Avg_Price_Per_Ton'].idxmax()
+
+    @property
+    def lowest_payer(self):
+        return self.client_pricing['Avg_Price_Per_Ton'].idxmin()
+
+
+@dataclass(frozen=True)
+class OperationalEfficiency:
+    avg_processing_time: float
+    # (min, max) processing minutes, None without any parsed times
+    processing_range: Optional[tuple] = None
+    peak_hour: object = None
+    peak_count: int = 0
+    low_hour: object = None
+    low_count: int = 0
+    active_hours: int = 0
+
+    def as_dict(self):
+        return {
+            'avg_processing_time': self.avg_processing_time,
+            'peak_hour': self.peak_hour,
+            'low_hour': self.low_hour,
+            'active_hours': self.active_hours
+        }
+
+
+@dataclass(frozen=True)
+class WasteManagement:
+    avg_garbage_weight: float
+    avg_redeemable_weight: float
+    redemption_rate: float
+    loss_rate: float
+    weight_value_correlation: float
+    # {waste type: {'count', 'total_value'}}
+    waste_types: dict
+
+    def as_dict(self):
+        return {
+            'redemption_rate': self.redemption_rate,
+            'loss_rate': self.loss_rate,
+            'weight_value_correlation': self.weight_value_correlation,
+            'waste_types': self.waste_types
+        }
+
+
+@dataclass(frozen=True)
+class StrategicInsights:
+    total_records: int
+    unique_dates: int
+    avg_daily_operations: float
+    total_revenue: float
+    unique_trucks: int
+    avg_revenue_per_truck: float
+    # None without CLIENT- tagged rows
+    unique_clients: Optional[int] = None
+    unique_waste_types: Optional[int] = None
+    highest_revenue_truck: object = None
+    highest_revenue: Optional[float] = None
+
+    def as_dict(self):
+        return {
+            'unique_clients': self.unique_clients or 0,
+            'unique_waste_types': self.unique_waste_types or 0,
+            'total_revenue': self.total_revenue,
+            'avg_revenue_per_truck': self.avg_revenue_per_truck,
+            'avg_daily_operations': self.avg_daily_operations,
+            'highest_revenue_truck': self.highest_revenue_truck
+        }
+
+
+@dataclass(frozen=True)
+class AnomalyAnalysis:
+    # {column: {'anomalyCount', 'anomalyRate', 'lowerBound', 'upperBound', 'anomalies'}}
+    series: dict
+    # {column: (lower, upper)} current expected range, unrounded
+    bounds: dict
+
+
+@dataclass(frozen=True)
+class WeighReport:
+    """Every analysis of one cleaned weigh log, in console report order."""
+    column_structure_analysis: ColumnStructure
+    basic_statistics: BasicStatistics
+    daily_analysis: DailyAnalysis
+    truck_analysis: TruckAnalysis
+    time_pattern_analysis: TimePattern
+    fleet_optimization_analysis: FleetOptimization
+    capacity_utilization_analysis: CapacityUtilization
+    pricing_strategy_analysis: PricingStrategy
+    client_pricing_analysis: ClientPricing
+    operational_efficiency_analysis: OperationalEfficiency
+    waste_management_analysis: WasteManagement
+    strategic_business_intelligence: StrategicInsights
+    anomaly_analysis: AnomalyAnalysis
+
+    @classmethod
+    def analyses(cls):
+        """Analysis names, which are also SimpleThaiTruckAnalyzer method names."""
+        return [f.name for f in fields(cls)]
+
+    def sections(self):
+        return [getattr(self, name) for name in self.analyses()]
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Ingestion cache for Excel weigh log workbooks.
+The first read streams the workbook with openpyxl in read-only mode and drops the
+daily "รวม" summary rows as it goes. The typed result is saved as an Arrow IPC sidecar
+next to the workbook (<workbook>.arrow), stamped with the workbook's path, size, mtime
+and SHA-256. Later reads memory-map the sidecar instead of parsing the workbook. A size
+or mtime change triggers a re-hash, and the workbook is only parsed again if its content
+changed. Mixed-type text columns (e.g. a numeric plate among text plates) are read
+as strings, as in a converted weigh log (see ledger_store.weigh_log_frame). Without
+pyarrow, or where the sidecar cannot be written, workbooks are parsed on every read.
+Incremental runs instead read only the rows after those already processed, checking the
+earlier rows against a digest (see read_weigh_log_tail).
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ledger_store import read_metadata, read_weigh_log, storage_format, weigh_log_frame, write_table
+
+# Bumped whenever parsing changes, so sidecars written by older code are rebuilt
+CACHE_VERSION = 1
+SIDECAR_SUFFIX = '.arrow'
+SUMMARY_LABEL = 'รวม'
+# Header names of the log number column that carries SUMMARY_LABEL (as in setup_data)
+LOG_NUMBER_HEADERS = ['เลขที่บันทึก', 'Log_Number']
+
+# Read once at import (os.umask can only be read by setting it); sidecars get the
+# permissions a plain open() would give them, not mkstemp's owner-only 0600
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_weigh_workbook(path):
+    """Stream the first sheet of a weigh log workbook, skipping summary rows.
+
+    Produces the same frame as pd.read_excel followed by dropping the summary rows,
+    except for the index, which is a fresh RangeIndex.
+    """
+    return _read_workbook(path)[0]
+
+
+def read_weigh_log_tail(path, skip):
+    """Rows of a weigh log after its first skip rows, with digests to check those rows.
+
+    Returns (frame, prefix_digest, digest): SHA-256 hex digests of the header plus the
+    first skip rows (None when the log has fewer rows) and of the header plus every row.
+    The frame's index starts at skip. xlsx has no random access, so workbooks are still
+    streamed from the start, but the first skip rows are only hashed, never turned into
+    a frame; summary rows are neither counted nor hashed. Columnar files (see
+    ledger_store) are read whole and their rows hashed with pandas.
+    """
+    if not storage_format(path):
+        return _read_workbook(path, skip, hashed=True)
+
+    df = read_weigh_log(path)
+    digest = hashlib.sha256(repr(list(df.columns)).encode())
+    head = min(skip, len(df))
+    digest.update(pd.util.hash_pandas_object(df.iloc[:head], index=False).to_numpy().tobytes())
+    prefix_digest = digest.hexdigest() if head == skip else None
+    digest.update(pd.util.hash_pandas_object(df.iloc[head:], index=False).to_numpy().tobytes())
+    return df.iloc[head:], prefix_digest, digest.hexdigest()
+
+
+# Cell values read_excel keeps in typed columns; any other value makes an object column
+TYPED_CELLS = (int, float, bool, datetime, type(None))
+
+
+def _read_workbook(path, skip=0, hashed=False):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        summary_col = next((i for i, name in enumerate(header)
+                            if any(key in str(name) for key in LOG_NUMBER_HEADERS)), None)
+        digest = hashlib.sha256(repr(header).encode()) if hashed else None
+        prefix_digest = digest.hexdigest() if hashed and not skip else None
+
+        records = []
+        # Columns where a skipped summary row was blank; read_excel would have made them float
+        blank_in_summary = set()
+        # Columns with untyped cells anywhere in the sheet, object columns of a full read
+        untyped = set()
+        seen = 0
+        for row in rows:
+            if summary_col is not None and row[summary_col] == SUMMARY_LABEL:
+                blank_in_summary.update(i for i, value in enumerate(row) if value is None)
+                continue
+            if hashed:
+                digest.update(repr(row).encode())
+            if skip:
+                untyped.update(i for i, value in enumerate(row) if not isinstance(value, TYPED_CELLS))
+            if seen < skip:
+                seen += 1
+                if hashed and seen == skip:
+                    prefix_digest = digest.hexdigest()
+                continue
+            records.append(row)
+    finally:
+        workbook.close()
+
+    df = pd.DataFrame.from_records(records, columns=header, coerce_float=True)
+    df.index = pd.RangeIndex(skip, skip + len(df))
+    for i, col in enumerate(df.columns):
+        if i in untyped:
+            # Stored as strings, as a full read's mixed-type column is (see weigh_log_frame)
+            values = df[col].astype(object)
+            df[col] = values.where(values.isna(), values.astype(str))
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        elif i in blank_in_summary and df[col].dtype.kind in 'iu':
+            df[col] = df[col].astype(float)
+    return df, prefix_digest, digest.hexdigest() if hashed else None
+
+
+def sidecar_path(path):
+    return str(path) + SIDECAR_SUFFIX
+
+
+def _source_stamp(path, digest=None):
+    stat = os.stat(path)
+    return {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest or file_digest(path)
+    }
+
+
+def load_weigh_workbook(path, use_cache=True):
+    """(frame, from_cache) for a weigh log workbook, via its columnar sidecar when valid."""
+    if not use_cache:
+        return weigh_log_frame(read_weigh_workbook(path)), False
+
+    sidecar = sidecar_path(path)
+    try:
+        cached = json.loads(read_metadata(sidecar).get('weigh_workbook', 'null'))
+    except ImportError:
+        return weigh_log_frame(read_weigh_workbook(path)), False
+    except (OSError, ValueError):
+        cached = None
+
+    stat = os.stat(path)
+    digest = None
+    if cached and cached.get('version') == CACHE_VERSION and cached.get('path') == os.path.abspath(path):
+        if (cached.get('size'), cached.get('mtime_ns')) == (stat.st_size, stat.st_mtime_ns):
+            return read_weigh_log(sidecar), True
+        digest = file_digest(path)
+        if digest == cached.get('sha256'):
+            # Touched or copied but unchanged: re-stamp the sidecar without re-parsing
+            df = read_weigh_log(sidecar)
+            _write_sidecar(df, sidecar, _source_stamp(path, digest))
+            return df, True
+
+    # Stored as it will be read back, so a cached read matches this one
+    df = weigh_log_frame(read_weigh_workbook(path))
+    _write_sidecar(df, sidecar, _source_stamp(path, digest))
+    return df, False
+
+
+def _write_sidecar(df, sidecar, stamp):
+    """Atomically replace the sidecar; failing to write it just means no cache."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(sidecar)), suffix=SIDECAR_SUFFIX)
+    except OSError:
+        return
+    os.close(fd)
+    try:
+        write_table(df, tmp_path, metadata={'weigh_workbook': json.dumps(stamp)})
+        os.chmod(tmp_path, 0o666 & ~UMASK)
+        os.replace(tmp_path, sidecar)
+    except Exception:
+        # A full disk, or a column pyarrow cannot type: the parsed frame is still good
+        return
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
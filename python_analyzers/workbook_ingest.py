@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Parallel ingestion of many weigh log workbooks (one per station per month).
+Each workbook is parsed in its own worker process (through the columnar sidecar cache
+of workbook_cache), so wall time approaches that of the slowest file rather than the
+sum. Frames are tagged with their station and source file and concatenated in path
+order, so the result does not depend on which worker finishes first.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import as_completed
+
+import pandas as pd
+
+from ledger_store import read_weigh_log, storage_format
+from model_pool import EXECUTORS
+from workbook_cache import load_weigh_workbook, sidecar_path
+
+WORKBOOK_PATTERNS = ['*.xlsx', '*.xlsm', '*.parquet', '*.arrow', '*.feather']
+
+
+def find_workbooks(source):
+    """Sorted weigh log files under a directory (recursively) or matching a glob."""
+    if os.path.isdir(source):
+        paths = [path for pattern in WORKBOOK_PATTERNS
+                 for path in glob.glob(os.path.join(source, '**', pattern), recursive=True)]
+    else:
+        paths = glob.glob(source, recursive=True)
+    # Skip Excel lock files and our own sidecars (<workbook>.arrow next to a matched workbook)
+    paths = set(paths)
+    sidecars = {sidecar_path(path) for path in paths}
+    return sorted(path for path in paths
+                  if not os.path.basename(path).startswith('~$') and path not in sidecars)
+
+
+def station_name(path, root=None):
+    """A workbook's station: its folder below root, else the file name up to the first '_'."""
+    folder = os.path.dirname(os.path.abspath(path))
+    if root is not None and os.path.isdir(root) and os.path.abspath(root) != folder:
+        return os.path.relpath(folder, os.path.abspath(root)).split(os.sep)[0]
+    return os.path.splitext(os.path.basename(path))[0].split('_')[0]
+
+
+def load_workbook_file(path, use_cache=True):
+    """Worker task: (frame, from_cache, seconds) for one workbook or columnar file."""
+    start = time.perf_counter()
+    if storage_format(path):
+        df, cached = read_weigh_log(path), False
+    else:
+        df, cached = load_weigh_workbook(path, use_cache)
+    return df, cached, time.perf_counter() - start
+
+
+def ingest_workbooks(source, workers=None, executor='process', use_cache=True, station=None, progress=print):
+    """Load every workbook under source concurrently into one tagged frame.
+
+    station maps a path to its station name (default: station_name). progress is
+    called with one line per finished file, or pass None for silence. Returns
+    (frame, timings) with timings as {path: {'station', 'rows', 'seconds', 'cached'}}.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown ingest executor: {executor}")
+    paths = find_workbooks(source)
+    if not paths:
+        raise FileNotFoundError(f"No weigh log workbooks found in {source}")
+    station = station or (lambda path: station_name(path, source))
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    frames, timings = {}, {}
+    with EXECUTORS[executor](max_workers=max(workers, 1)) as pool:
+        futures = {pool.submit(load_workbook_file, path, use_cache): path for path in paths}
+        for done, future in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            df, cached, seconds = future.result()
+            frames[path] = df
+            timings[path] = {'station': station(path), 'rows': len(df), 'seconds': seconds, 'cached': cached}
+            if progress:
+                progress(f"  [{done}/{len(paths)}] {os.path.basename(path)} ({timings[path]['station']}): "
+                         f"{len(df)} rows in {seconds:.2f}s{' (cached)' if cached else ''}")
+
+    frame = pd.concat(
+        [frames[path].assign(station=timings[path]['station'], source_file=os.path.basename(path))
+         for path in paths],
+        ignore_index=True
+    )
+    frame['station'] = frame['station'].astype('category')
+    frame['source_file'] = frame['source_file'].astype('category')
+
+    if progress:
+        slowest = max(timing['seconds'] for timing in timings.values())
+        total = sum(timing['seconds'] for timing in timings.values())
+        progress(f"  Ingested {len(paths)} files ({len(frame)} rows) in {time.perf_counter() - start:.2f}s "
+                 f"(slowest file {slowest:.2f}s, sum of files {total:.2f}s)")
+    return frame, timings